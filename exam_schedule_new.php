@@ -1,18 +1,38 @@
 <?php
-// Process form submission and run Python script
+// Process form submission: queue a schedule job and poll it (process/job_queue.py)
 $execution_result = null;
 $execution_error = null;
 $resultFilePath = 'process/schedule_result.json'; // Path relative to this PHP script
+$jobsDir = 'process/jobs'; // One <job_id>.json per queued schedule request
 
-if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['start_date']) && isset($_POST['end_date'])) {
+if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['publish_job'])) {
+    // Copy a finished job's schedule to the shared result file read by the student pages
+    $job_id = $_POST['publish_job'];
+    if (preg_match('/^[0-9a-f]{32}$/', $job_id)) {
+        $output = [];
+        $return_code = 0;
+        exec(sprintf('python process/job_queue.py publish %s', escapeshellarg($job_id)), $output, $return_code);
+        if ($return_code === 0) {
+            header("Location: " . $_SERVER['PHP_SELF'] . "?job=" . $job_id . "&published=1");
+            exit;
+        }
+        $execution_error = "Could not publish the schedule. Return code: $return_code";
+        if (!empty($output)) {
+            $execution_error .= "<br>Output: " . htmlspecialchars(implode("\n", $output));
+        }
+    } else {
+        $execution_error = "Invalid job ID.";
+    }
+} elseif ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['start_date']) && isset($_POST['end_date'])) {
     $start_date = trim($_POST['start_date']);
     $end_date = trim($_POST['end_date']);
     $holidays = isset($_POST['holidays']) ? trim($_POST['holidays']) : '';
     
     if (!empty($start_date) && !empty($end_date)) {
-        // Construct the command to run the Python script
+        // Queue the request; a background worker runs the pipeline, so this
+        // returns at once and the page polls the job's progress
         // Use escapeshellarg to make inputs safe for shell execution
-        $command = sprintf('python process/process_schedule.py %s %s %s',
+        $command = sprintf('python process/job_queue.py submit %s %s %s',
             escapeshellarg($start_date),
             escapeshellarg($end_date),
             escapeshellarg($holidays)
@@ -22,14 +42,14 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['start_date']) && isse
         $output = [];
         $return_code = 0;
         exec($command, $output, $return_code);
+        $submitted = $output ? json_decode(end($output), true) : null;
         
-        if ($return_code === 0) {
-            $execution_result = "Python script executed successfully.";
-            // Redirect to refresh the page and show results
-            header("Location: " . $_SERVER['PHP_SELF']);
+        if ($return_code === 0 && isset($submitted['job_id'])) {
+            // Redirect to the job's page, which refreshes until the schedule is ready
+            header("Location: " . $_SERVER['PHP_SELF'] . "?job=" . urlencode($submitted['job_id']));
             exit;
         } else {
-            $execution_error = "Error executing Python script. Return code: $return_code";
+            $execution_error = "Error queueing the schedule request. Return code: $return_code";
             if (!empty($output)) {
                 $execution_error .= "<br>Output: " . htmlspecialchars(implode("\n", $output));
             }
@@ -39,11 +59,35 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['start_date']) && isse
     }
 }
 
-// --- Load Schedule Result from File ---
+// --- Load Schedule Result (a queued job's, or the shared result file) ---
 $loaded_result = null;
 $load_error = null;
+$job = null;
+$job_in_progress = false;
+$job_stages = ['dates' => 'Exam dates', 'summary' => 'Course summary', 'enrollments' => 'Enrollments', 'conflicts' => 'Conflicts', 'solve' => 'Schedule'];
 
-if (file_exists($resultFilePath)) {
+if (isset($_GET['job'])) {
+    $job_id = $_GET['job'];
+    $jobFilePath = "{$jobsDir}/{$job_id}.json";
+    if (!preg_match('/^[0-9a-f]{32}$/', $job_id) || !is_readable($jobFilePath)) {
+        $load_error = "Error: Unknown schedule job.";
+    } else {
+        $json_content = file_get_contents($jobFilePath);
+        $job = json_decode($json_content, true);
+        if ($job === null) {
+            $load_error = "Error: Could not decode the job file: " . json_last_error_msg();
+        } elseif ($job['status'] === 'queued' || $job['status'] === 'running') {
+            $job_in_progress = true;
+            $load_error = "Info: The schedule is still being generated (job {$job_id}).";
+        } else {
+            $loaded_result = $job['result'];
+            $json_content = json_encode($loaded_result, JSON_PRETTY_PRINT);
+            if (isset($_GET['published'])) {
+                $execution_result = "Schedule published to the student timetable pages.";
+            }
+        }
+    }
+} elseif (file_exists($resultFilePath)) {
     if (is_readable($resultFilePath)) {
         $json_content = file_get_contents($resultFilePath);
         if ($json_content === false) {
@@ -68,6 +112,7 @@ if (file_exists($resultFilePath)) {
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Exam Scheduling - Classroom</title>
+    <?php if ($job_in_progress): ?><meta http-equiv="refresh" content="2"><?php endif; ?>
     <link rel="preconnect" href="https://fonts.gstatic.com/" crossorigin="" />
     <link
       rel="stylesheet"
@@ -195,6 +240,35 @@ if (file_exists($resultFilePath)) {
             <div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded relative mb-4" role="alert">
                 <span class="block sm:inline"><?php echo $execution_result; ?></span>
             </div>
+            <?php endif; ?>
+
+            <?php if ($job_in_progress): ?>
+            <div class="bg-blue-50 border border-blue-300 text-blue-800 px-4 py-3 rounded relative mb-4" role="status">
+                <strong class="font-bold"><?php echo $job['status'] === 'queued' ? 'Schedule request queued...' : 'Generating schedule...'; ?></strong>
+                <ul class="mt-2 text-sm">
+                    <?php
+                    $done_stages = [];
+                    foreach ($job['progress'] as $step) {
+                        $done_stages[$step['stage']] = $step['seconds'];
+                    }
+                    foreach ($job_stages as $stage => $label) {
+                        if (isset($done_stages[$stage])) {
+                            echo "<li>&#10003; " . htmlspecialchars($label) . " <span class=\"text-gray-500\">(" . number_format($done_stages[$stage], 1) . " s)</span></li>";
+                        } else {
+                            echo "<li class=\"text-gray-500\">&#8230; " . htmlspecialchars($label) . "</li>";
+                        }
+                    }
+                    ?>
+                </ul>
+                <p class="text-xs text-gray-500 mt-2">This page refreshes automatically until the schedule is ready.</p>
+            </div>
+            <?php elseif ($job && $job['status'] === 'done'): ?>
+            <div class="flex justify-end px-4 mb-4">
+                <button type="submit" name="publish_job" value="<?php echo htmlspecialchars($job['job_id']); ?>" formnovalidate
+                  class="flex cursor-pointer items-center justify-center rounded-xl h-10 px-4 bg-[#f0f2f4] text-[#111418] text-sm font-bold hover:bg-gray-200">
+                  <span class="truncate">Publish this schedule</span>
+                </button>
+            </div>
             <?php endif; ?>
 
              <!-- Date Range Display Area -->
@@ -272,16 +346,25 @@ if (file_exists($resultFilePath)) {
                              $suggestion_lines = explode("\n", trim($loaded_result['suggestion']));
                              $schedule_data = [];
                              $parsing_errors = [];
-                             foreach ($suggestion_lines as $line) {
-                                 $line = trim($line);
-                                 if (empty($line)) continue;
-                                 // Updated regex: Expect format like "#. YYYY-MM-DD: COURSE_CODE" or "#. YYYY-MM-DD: Study Day"
-                                 if (preg_match('/^\d+\.\s*(\d{4}-\d{2}-\d{2})\s*:\s*(\S+.*)/i', $line, $matches)) {
-                                     $schedule_data[] = ['date' => trim($matches[1]), 'course' => trim($matches[2])];
-                                 } else {
-                                     // Keep lines that aren't schedule entries but ignore common intro/outro text patterns
-                                     if (!preg_match('/^\d{4}-\d{2}-\d{2}/i', $line) && !preg_match('/^(here is|based on|schedule|note:|```)/i', $line)) {
-                                         $parsing_errors[] = $line;
+                             if (isset($loaded_result['exam_days'])) {
+                                 // Structured output: no need to re-parse the suggestion text
+                                 foreach ($loaded_result['exam_days'] as $day) {
+                                     if (!empty($day['courses'])) {
+                                         $schedule_data[] = ['date' => $day['date'], 'course' => implode(', ', array_column($day['courses'], 'code'))];
+                                     }
+                                 }
+                             } else {
+                                 foreach ($suggestion_lines as $line) {
+                                     $line = trim($line);
+                                     if (empty($line)) continue;
+                                     // Updated regex: Expect format like "#. YYYY-MM-DD: COURSE_CODE" or "#. YYYY-MM-DD: Study Day"
+                                     if (preg_match('/^\d+\.\s*(\d{4}-\d{2}-\d{2})\s*:\s*(\S+.*)/i', $line, $matches)) {
+                                         $schedule_data[] = ['date' => trim($matches[1]), 'course' => trim($matches[2])];
+                                     } else {
+                                         // Keep lines that aren't schedule entries but ignore common intro/outro text patterns
+                                         if (!preg_match('/^\d{4}-\d{2}-\d{2}/i', $line) && !preg_match('/^(here is|based on|schedule|note:|```)/i', $line)) {
+                                             $parsing_errors[] = $line;
+                                         }
                                      }
                                  }
                              }
@@ -0,0 +1,138 @@
+"""Bulk loading for the fakeData generators.
+
+The generators build their Students, CourseEnrollments and StudentMarks rows in
+memory and hand them to a BulkLoader instead of issuing one INSERT per row:
+
+- "executemany": batched executemany(), which mysql-connector sends as one
+  multi-row INSERT per batch;
+- "load_data": each table is written to a temporary CSV file and streamed
+  with LOAD DATA LOCAL INFILE (the server needs local_infile=ON and the
+  connection allow_local_infile=True).
+
+While loading, foreign key checks are switched off and the whole load is one
+transaction, so InnoDB doesn't check references or flush per row. Unique
+checks stay on: the (student_id, course_code) keys are secondary indexes,
+which InnoDB may not check for duplicates with unique_checks off, and rows
+keep INSERT IGNORE semantics (existing keys are skipped) when a seed is re-run. Each table's
+row count, time and rows/sec are reported. load_frame() takes a pandas
+DataFrame instead of row tuples, for the columnar cohort generator.
+"""
+import os
+import csv
+import time
+import tempfile
+from itertools import islice
+from contextlib import contextmanager
+
+LOAD_METHODS = ("executemany", "load_data")
+DEFAULT_BATCH_SIZE = 5000
+
+
+class BulkLoader:
+
+    def __init__(self, conn, method="executemany", batch_size=DEFAULT_BATCH_SIZE):
+        if method not in LOAD_METHODS:
+            raise ValueError(f"Unknown load method {method!r}; use one of {', '.join(LOAD_METHODS)}")
+        self.conn = conn
+        self.method = method
+        self.batch_size = batch_size
+        self.stats = [] # (table, rows, seconds)
+
+    @contextmanager
+    def deferred_checks(self):
+        """Disables foreign key checks and autocommit for the load; commits at the end."""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            self.conn.autocommit = False
+            yield self
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+            cursor.close()
+
+    def load(self, table, columns, rows):
+        """Inserts rows (a list of tuples in column order) into table, skipping existing keys."""
+        started = time.perf_counter()
+        if self.method == "load_data":
+            self._load_data(table, columns, rows)
+        else:
+            self._executemany(table, columns, rows)
+        elapsed = time.perf_counter() - started
+        self.stats.append((table, len(rows), elapsed))
+        return elapsed
+
+    def load_frame(self, table, frame):
+        """Inserts a pandas DataFrame whose column names are the table's, skipping existing keys.
+
+        With load_data the frame is written by pandas' CSV writer, so columnar
+        generator output never becomes a list of row tuples.
+        """
+        started = time.perf_counter()
+        columns = list(frame.columns)
+        if self.method == "load_data":
+            self._load_file(table, columns, lambda f: frame.to_csv(f, header=False, index=False, lineterminator='\n'))
+        else:
+            rows = frame.itertuples(index=False, name=None)
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                self._executemany(table, columns, batch)
+        elapsed = time.perf_counter() - started
+        self.stats.append((table, len(frame), elapsed))
+        return elapsed
+
+    def _executemany(self, table, columns, rows):
+        sql = (f"INSERT IGNORE INTO {table} ({', '.join(columns)}) "
+               f"VALUES ({', '.join(['%s'] * len(columns))})")
+        cursor = self.conn.cursor()
+        try:
+            for start in range(0, len(rows), self.batch_size):
+                cursor.executemany(sql, rows[start:start + self.batch_size])
+        finally:
+            cursor.close()
+
+    def _load_data(self, table, columns, rows):
+        self._load_file(table, columns, lambda f: csv.writer(f, lineterminator='\n').writerows(rows))
+
+    def _load_file(self, table, columns, write):
+        """Streams a temporary CSV file, filled by write(file), with LOAD DATA LOCAL INFILE."""
+        handle, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".csv")
+        try:
+            with os.fdopen(handle, 'w', newline='') as f:
+                write(f)
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(
+                    f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {table} "
+                    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                    f"({', '.join(columns)})",
+                    (path,)
+                )
+            finally:
+                cursor.close()
+        finally:
+            os.remove(path)
+
+    def print_report(self):
+        """Prints rows, seconds and rows/sec per table and in total."""
+        print(f"\nBulk load ({self.method}):")
+        print(f"{'table':<20} {'rows':>10} {'seconds':>9} {'rows/s':>12}")
+        per_table = {} # tables loaded block by block are reported once
+        for table, rows, seconds in self.stats:
+            total_rows, total_seconds = per_table.get(table, (0, 0.0))
+            per_table[table] = (total_rows + rows, total_seconds + seconds)
+        for table, (rows, seconds) in per_table.items():
+            print(f"{table:<20} {rows:>10,} {seconds:>9.2f} {rows / max(seconds, 1e-9):>12,.0f}")
+        total_rows = sum(rows for _, rows, _ in self.stats)
+        total_seconds = sum(seconds for _, _, seconds in self.stats)
+        print(f"{'total':<20} {total_rows:>10,} {total_seconds:>9.2f} {total_rows / max(total_seconds, 1e-9):>12,.0f}")
+
+
+def connect_options(method):
+    """Extra mysql.connector.connect() arguments the load method needs."""
+    return {"allow_local_infile": True} if method == "load_data" else {}
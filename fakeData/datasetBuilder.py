@@ -0,0 +1,570 @@
+"""Seeded, reproducible dataset builder for the scheduler's MySQL tables.
+
+Usage: python fakeData/datasetBuilder.py [--profile fake|realistic|enhanced] [--students N] [--courses N] [--seed 42]
+                                         [--output mysql|csv|parquet] [--out-dir DIR] [--workers N] [--load-method executemany|load_data]
+
+One module for what generateFakeData.py, generateRealisticData.py and
+enhancedStudentData.py each did with their own copy of the schema, course
+catalogue, mark model and insert loops (they are now wrappers around their
+profile). A profile (PROFILES) describes a dataset: academic levels and their
+shares, enrollment patterns (how many courses of each level a student takes,
+with relative weights), the difficulty and mark model and the default cohort
+size. --courses splits that many courses over the profile's levels, adding
+synthetic course codes beyond the catalogue.
+
+Every value is drawn with NumPy from np.random.default_rng([seed, block]) for
+each block of BLOCK_SIZE students, so a seed always gives the same rows, however
+many --workers processes build the blocks. Student IDs keep the
+"<prefix><middle><year>" layout and VARCHAR(10) width with a 5-character
+base-36 middle part (60M IDs per level). Tables are columnar pandas DataFrames
+written to MySQL (BulkLoader), headerless CSV or Parquet (needs pyarrow).
+build_tables() and enrollment_mapping() are the fixture source for the
+scheduler benchmarks in process/.
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import mysql.connector
+from mysql.connector import Error
+
+from bulkLoad import BulkLoader, connect_options, LOAD_METHODS
+
+# MySQL Connection Parameters
+mysql_config = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',  # Standard XAMPP password is empty
+    'database': 'dataUTAS'
+}
+
+# Course catalogue with codes, names and academic levels
+COURSES = [
+    # Diploma Level Courses (100-200 series)
+    {"code": "EEE101", "name": "Basic Electrical Engineering", "level": "Diploma"},
+    {"code": "EEE115", "name": "Introduction to Electronics", "level": "Diploma"},
+    {"code": "EEE120", "name": "Electrical Circuits I", "level": "Diploma"},
+    {"code": "EEE135", "name": "Digital Logic Design", "level": "Diploma"},
+    {"code": "EEE145", "name": "Computer Programming", "level": "Diploma"},
+    {"code": "EEE180", "name": "Electrical Measurement", "level": "Diploma"},
+    {"code": "EEE201", "name": "Electrical Circuits II", "level": "Diploma"},
+    {"code": "EEE210", "name": "Electronic Devices", "level": "Diploma"},
+    {"code": "EEE220", "name": "Signals and Systems", "level": "Diploma"},
+    {"code": "EEE235", "name": "Microcontrollers", "level": "Diploma"},
+
+    # Advanced Diploma Level Courses (200-300 series)
+    {"code": "EEE245", "name": "Advanced Programming", "level": "Advanced Diploma"},
+    {"code": "EEE250", "name": "Digital Communications", "level": "Advanced Diploma"},
+    {"code": "EEE265", "name": "Industrial Electronics", "level": "Advanced Diploma"},
+    {"code": "EEE275", "name": "Electrical Machines", "level": "Advanced Diploma"},
+    {"code": "EEE280", "name": "Control Systems Fundamentals", "level": "Advanced Diploma"},
+    {"code": "EEE290", "name": "Power Distribution", "level": "Advanced Diploma"},
+    {"code": "EEE295", "name": "Electronic Instrumentation", "level": "Advanced Diploma"},
+    {"code": "EEE298", "name": "Embedded System Design", "level": "Advanced Diploma"},
+
+    # Bachelor Level Courses (300-400 series)
+    {"code": "EEE301", "name": "Advanced Circuit Theory", "level": "Bachelor"},
+    {"code": "EEE315", "name": "Power Electronics", "level": "Bachelor"},
+    {"code": "EEE327", "name": "Digital Signal Processing", "level": "Bachelor"},
+    {"code": "EEE333", "name": "Electromagnetic Fields", "level": "Bachelor"},
+    {"code": "EEE342", "name": "Microprocessor Systems", "level": "Bachelor"},
+    {"code": "EEE356", "name": "Control Systems", "level": "Bachelor"},
+    {"code": "EEE371", "name": "Power Systems", "level": "Bachelor"},
+    {"code": "EEE385", "name": "Communication Systems", "level": "Bachelor"},
+    {"code": "EEE392", "name": "Digital Electronics", "level": "Bachelor"},
+    {"code": "EEE403", "name": "VLSI Design", "level": "Bachelor"},
+    {"code": "EEE418", "name": "Embedded Systems", "level": "Bachelor"},
+    {"code": "EEE425", "name": "Renewable Energy Systems", "level": "Bachelor"}
+]
+
+LEVEL_PREFIXES = {"Diploma": "10d", "Advanced Diploma": "11a", "Bachelor": "12s"}
+# Course numbers of each level, for synthetic courses beyond the catalogue
+LEVEL_NUMBERS = {"Diploma": (100, 240), "Advanced Diploma": (240, 300), "Bachelor": (300, 500)}
+DEPARTMENTS = ("EEE", "ECE", "MCE", "CSE", "CVE", "CHE", "IND", "MTH", "PHY", "ARC")
+ID_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ID_WIDTH = 5 # base-36 characters between prefix and year
+BLOCK_SIZE = 50000 # students per seeded block; part of what a seed means, so changing it changes the data
+
+TABLE_COLUMNS = {
+    "Students": ("student_id", "academic_level"),
+    "CourseEnrollments": ("student_id", "course_code"),
+    "StudentMarks": ("student_id", "course_code", "test1", "midterm", "test2", "assignment", "total", "grade")
+}
+GRADE_THRESHOLDS = [25, 30, 35, 40, 45]
+GRADES = ['F', 'D', 'C', 'B', 'A', 'A+']
+
+# Mark component: (mean at performance 1.0, standard deviation, minimum, maximum)
+MARK_COMPONENTS = {
+    "test1": (7, 1.5, 0, 10),
+    "midterm": (14, 3, 0, 20),
+    "test2": (7, 1.5, 0, 10),
+    "assignment": (8, 1.2, 3, 10)
+}
+
+# levels: share of the cohort per academic level
+# years: relative weights of the enrollment year suffixes
+# patterns: per student level, ({course level: number of courses}, relative weight)
+# difficulty: "course_number" (code number scaled to 0-1 plus noise per enrollment),
+#   "level" (base per course level plus noise per enrollment) or "course" (uniform in range, once per course)
+# performance: (base, ability weight, difficulty weight), clamped to 0.4-1.2, scales the mark means
+PROFILES = {
+    # generateFakeData.py: one Bachelor cohort over the 12 Bachelor courses, difficulty per course
+    "fake": {
+        "students": 120,
+        "levels": {"Bachelor": 1.0},
+        "years": {"25": 1},
+        "patterns": {
+            "Bachelor": [({"Bachelor": 2}, 0.15), ({"Bachelor": 3}, 0.2), ({"Bachelor": 4}, 0.3),
+                         ({"Bachelor": 5}, 0.2), ({"Bachelor": 6}, 0.15)]
+        },
+        "difficulty": {"by": "course", "range": (0, 1)},
+        "performance": (0.8, 0.0, -0.4), # this model's "difficulty" raised the marks: 0.8-1.2
+        "marks": dict(MARK_COMPONENTS, assignment=(8, 1, 5, 10))
+    },
+    # generateRealisticData.py: 60% Diploma / 40% Bachelor, sometimes one course of the other level
+    "realistic": {
+        "students": 150,
+        "levels": {"Diploma": 0.6, "Bachelor": 0.4},
+        "years": {"23": 1, "24": 1, "25": 1},
+        "patterns": {
+            "Diploma": [({"Diploma": 5}, 1), ({"Diploma": 4}, 1), ({"Diploma": 4, "Bachelor": 1}, 1)],
+            "Bachelor": [({"Bachelor": 5}, 1), ({"Bachelor": 4}, 1), ({"Bachelor": 4, "Diploma": 1}, 1)]
+        },
+        "difficulty": {"by": "level", "levels": {"Diploma": 0.4, "Bachelor": 0.7}, "noise": 0.2, "range": (0.1, 1.0)},
+        "performance": (0.6, 0.5, 0.3),
+        "marks": MARK_COMPONENTS
+    },
+    # enhancedStudentData.py: three levels with cross-level enrollments
+    "enhanced": {
+        "students": 150,
+        "levels": {"Diploma": 0.35, "Advanced Diploma": 0.30, "Bachelor": 0.35},
+        "years": {"23": 0.2, "24": 0.3, "25": 0.5}, # newer students are more common
+        "patterns": {
+            "Diploma": [
+                ({"Diploma": 5}, 0.6),
+                ({"Diploma": 4, "Advanced Diploma": 1}, 0.3),
+                ({"Diploma": 4}, 0.1)
+            ],
+            "Advanced Diploma": [
+                ({"Advanced Diploma": 5}, 0.5),
+                ({"Advanced Diploma": 4, "Bachelor": 1}, 0.2),
+                ({"Advanced Diploma": 4, "Diploma": 1}, 0.2),
+                ({"Advanced Diploma": 4}, 0.1)
+            ],
+            "Bachelor": [
+                ({"Bachelor": 5}, 0.6),
+                ({"Bachelor": 4, "Advanced Diploma": 1}, 0.2),
+                ({"Bachelor": 4}, 0.2)
+            ]
+        },
+        "difficulty": {"by": "course_number", "noise": 0.1, "range": (0, 1)},
+        "performance": (0.6, 0.5, 0.3),
+        "marks": MARK_COMPONENTS
+    }
+}
+
+
+def get_profile(profile):
+    """The profile dict for a PROFILES name (dicts are returned as they are)."""
+    if isinstance(profile, dict):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile {profile!r}; use one of {', '.join(PROFILES)}")
+    return PROFILES[profile]
+
+
+def profile_courses(profile, num_courses=None):
+    """The profile's courses ({"code", "name", "level"}); num_courses splits that many evenly over its levels."""
+    levels = list(profile["levels"])
+    catalogue = {level: [course for course in COURSES if course['level'] == level] for level in levels}
+    if num_courses is None:
+        return [course for level in levels for course in catalogue[level]]
+
+    taken = {course['code'] for course in COURSES}
+    courses = []
+    for i, level in enumerate(levels):
+        count = num_courses // len(levels) + (i < num_courses % len(levels))
+        chosen = catalogue[level][:count]
+        low, high = LEVEL_NUMBERS[level]
+        for code in (f"{department}{number}" for department in DEPARTMENTS for number in range(low, high)):
+            if len(chosen) >= count:
+                break
+            if code not in taken:
+                chosen.append({"code": code, "name": f"{code[:3]} Course {code[3:]}", "level": level})
+        if len(chosen) < count:
+            raise ValueError(f"At most {len(chosen)} {level} courses can be generated")
+        courses.extend(chosen)
+    return courses
+
+
+def check_profile(profile, courses):
+    """Raises ValueError if a pattern asks for more courses of a level than there are."""
+    available = {level: sum(course['level'] == level for course in courses) for level in profile["levels"]}
+    for level, patterns in profile["patterns"].items():
+        for pattern, _ in patterns:
+            for course_level, count in pattern.items():
+                if count > available.get(course_level, 0):
+                    raise ValueError(f"{level} pattern needs {count} {course_level} courses, only {available.get(course_level, 0)} exist")
+
+
+def level_counts(profile, num_students):
+    """{level: students} splitting num_students by the profile's shares (the remainder goes to the last level)."""
+    levels = list(profile["levels"])
+    total = sum(profile["levels"].values())
+    counts = [int(num_students * profile["levels"][level] / total) for level in levels[:-1]]
+    counts.append(num_students - sum(counts))
+    return dict(zip(levels, counts))
+
+
+def encode_student_ids(level, sequence, years):
+    """'<prefix><5 base-36 chars><year>' for each sequence number, built as a byte matrix."""
+    count = len(sequence)
+    chars = np.empty((count, 10), dtype=np.uint8)
+    chars[:, :3] = np.frombuffer(LEVEL_PREFIXES[level].encode(), dtype=np.uint8)
+    digits = np.frombuffer(ID_DIGITS.encode(), dtype=np.uint8)
+    for position in range(ID_WIDTH):
+        chars[:, 3 + position] = digits[(sequence // 36 ** (ID_WIDTH - 1 - position)) % 36]
+    chars[:, 8:] = np.frombuffer(''.join(years).encode(), dtype=np.uint8).reshape(count, 2) if count else 0
+    return chars.view('S10').ravel().astype(str)
+
+
+def sample_courses(rng, counts, num_courses):
+    """Distinct course indices per student: an (n, max(counts)) matrix, -1 where a student takes fewer."""
+    width = int(counts.max()) if len(counts) else 0
+    if width == 0:
+        return np.full((len(counts), 0), -1)
+    # The first k columns of a random permutation per row are a uniform k-sample without replacement
+    chosen = np.argsort(rng.random((len(counts), num_courses)), axis=1)[:, :width]
+    chosen[np.arange(width)[None, :] >= counts[:, None]] = -1
+    return chosen
+
+
+def course_difficulty(profile, courses, seed, rng, enroll_course):
+    """Difficulty (0-1) of each enrollment under the profile's difficulty model."""
+    model = profile["difficulty"]
+    low, high = model["range"]
+    if model["by"] == "course":
+        # Drawn from the seed alone so every block sees the same difficulty per course
+        return np.random.default_rng(seed).uniform(low, high, len(courses))[enroll_course]
+    if model["by"] == "level":
+        base = np.array([model["levels"][course['level']] for course in courses])
+    else:
+        base = (np.array([int(course['code'][3:]) for course in courses]) - 100) / 400
+    noise = rng.uniform(-model["noise"], model["noise"], len(enroll_course))
+    return np.clip(base[enroll_course] + noise, low, high)
+
+
+def build_block(profile, courses, seed, block, num_students):
+    """{"Students", "CourseEnrollments", "StudentMarks"} DataFrames for num_students students of block."""
+    rng = np.random.default_rng([seed, block])
+    levels = list(profile["levels"])
+    course_codes = np.array([course['code'] for course in courses])
+    by_level = {level: np.array([i for i, course in enumerate(courses) if course['level'] == level]) for level in levels}
+    years = np.array(list(profile["years"]))
+    year_weights = np.array(list(profile["years"].values()), dtype=float)
+    full_block = level_counts(profile, BLOCK_SIZE) # every earlier block was full
+
+    student_ids = []
+    student_levels = []
+    enroll_student = []
+    enroll_course = []
+    offset = 0
+    for level, count in level_counts(profile, num_students).items():
+        sequence = block * full_block[level] + np.arange(count)
+        student_ids.append(encode_student_ids(level, sequence, rng.choice(years, size=count, p=year_weights / year_weights.sum())))
+        student_levels.append(np.full(count, levels.index(level), dtype=np.int8))
+
+        patterns = profile["patterns"][level]
+        weights = np.array([weight for _, weight in patterns], dtype=float)
+        chosen_pattern = rng.choice(len(patterns), size=count, p=weights / weights.sum())
+        for course_level in levels:
+            counts = np.array([pattern.get(course_level, 0) for pattern, _ in patterns])[chosen_pattern]
+            if not counts.any():
+                continue
+            pool = by_level[course_level]
+            chosen = sample_courses(rng, counts, len(pool))
+            rows, slots = np.nonzero(chosen >= 0)
+            enroll_student.append(offset + rows)
+            enroll_course.append(pool[chosen[rows, slots]])
+        offset += count
+
+    student_ids = np.concatenate(student_ids)
+    student_levels = np.concatenate(student_levels)
+    enroll_student = np.concatenate(enroll_student) if enroll_student else np.empty(0, dtype=int)
+    enroll_course = np.concatenate(enroll_course) if enroll_course else np.empty(0, dtype=int)
+    order = np.lexsort((enroll_course, enroll_student)) # group each student's rows together
+    enroll_student = enroll_student[order]
+    enroll_course = enroll_course[order]
+
+    # Marks: ability per student, difficulty per enrollment
+    ability = rng.random(num_students)
+    difficulty = course_difficulty(profile, courses, seed, rng, enroll_course)
+    base, ability_weight, difficulty_weight = profile["performance"]
+    performance = np.clip(base + ability_weight * ability[enroll_student] - difficulty_weight * difficulty, 0.4, 1.2)
+    marks = {}
+    for name, (mean, sd, low, high) in profile["marks"].items():
+        marks[name] = np.clip(np.round(rng.normal(mean * performance, sd), 1), low, high)
+    total = np.round(sum(marks.values()), 1) if marks else np.zeros(len(enroll_student))
+    grade = np.searchsorted(GRADE_THRESHOLDS, total, side='right')
+
+    students = pd.Categorical.from_codes(np.arange(num_students), categories=student_ids)
+    enrolled = pd.Categorical.from_codes(enroll_student, categories=student_ids)
+    codes = pd.Categorical.from_codes(enroll_course, categories=course_codes)
+    return {
+        "Students": pd.DataFrame({
+            "student_id": students,
+            "academic_level": pd.Categorical.from_codes(student_levels, categories=levels)
+        }),
+        "CourseEnrollments": pd.DataFrame({"student_id": enrolled, "course_code": codes}),
+        "StudentMarks": pd.DataFrame({
+            "student_id": enrolled, "course_code": codes, **marks, "total": total,
+            "grade": pd.Categorical.from_codes(grade, categories=GRADES)
+        })
+    }
+
+
+def _build_block(args):
+    return build_block(*args)
+
+
+def iter_blocks(profile, num_students=None, seed=42, num_courses=None, workers=1):
+    """Yields the dataset's tables block by block, in order; workers > 1 builds blocks in parallel processes."""
+    profile = get_profile(profile)
+    num_students = profile["students"] if num_students is None else num_students
+    courses = profile_courses(profile, num_courses)
+    check_profile(profile, courses)
+    blocks = [(profile, courses, seed, block, min(BLOCK_SIZE, num_students - block * BLOCK_SIZE))
+              for block in range(max(1, -(-num_students // BLOCK_SIZE)))]
+    if workers <= 1 or len(blocks) == 1:
+        for args in blocks:
+            yield build_block(*args)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as pool:
+        yield from pool.map(_build_block, blocks)
+
+
+def build_tables(profile="enhanced", num_students=None, seed=42, num_courses=None, workers=1):
+    """The whole dataset as one DataFrame per table."""
+    blocks = list(iter_blocks(profile, num_students, seed, num_courses, workers))
+    if len(blocks) == 1:
+        return blocks[0]
+    return {table: pd.concat([tables[table] for tables in blocks], ignore_index=True) for table in TABLE_COLUMNS}
+
+
+def enrollment_mapping(tables):
+    """{student_id: [course_code, ...]} from a dataset's CourseEnrollments."""
+    frame = tables["CourseEnrollments"]
+    enrollments = {}
+    for student_id, course_code in zip(frame["student_id"].astype(str), frame["course_code"].astype(str)):
+        enrollments.setdefault(student_id, []).append(course_code)
+    return enrollments
+
+
+def write_csv(blocks, out_dir):
+    """Writes headerless <table>.csv files (columns in TABLE_COLUMNS order); returns {table: rows}."""
+    os.makedirs(out_dir, exist_ok=True)
+    rows = dict.fromkeys(TABLE_COLUMNS, 0)
+    for tables in blocks:
+        for table, frame in tables.items():
+            path = os.path.join(out_dir, f"{table}.csv")
+            frame.to_csv(path, mode='a' if rows[table] else 'w', header=False, index=False)
+            rows[table] += len(frame)
+    return rows
+
+
+def write_parquet(blocks, out_dir):
+    """Writes <table>.parquet files, one row group per block; returns {table: rows}. Needs pyarrow."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(out_dir, exist_ok=True)
+    rows = dict.fromkeys(TABLE_COLUMNS, 0)
+    writers = {}
+    try:
+        for tables in blocks:
+            for table, frame in tables.items():
+                # Plain strings: each block's categories differ, the file schema must not
+                frame = frame.astype({column: str for column in frame.columns if isinstance(frame[column].dtype, pd.CategoricalDtype)})
+                data = pa.Table.from_pandas(frame, preserve_index=False)
+                if table not in writers:
+                    writers[table] = pq.ParquetWriter(os.path.join(out_dir, f"{table}.parquet"), data.schema)
+                writers[table].write_table(data)
+                rows[table] += len(frame)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows
+
+
+def create_database_and_tables():
+    """Create the database and necessary tables"""
+    conn = None
+    try:
+        # First connect without specifying database to create it if needed
+        conn = mysql.connector.connect(
+            host=mysql_config['host'],
+            user=mysql_config['user'],
+            password=mysql_config['password']
+        )
+
+        if conn.is_connected():
+            cursor = conn.cursor()
+
+            # Create database if it doesn't exist
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {mysql_config['database']}")
+            print(f"Database '{mysql_config['database']}' created or already exists")
+
+            # Switch to the database
+            cursor.execute(f"USE {mysql_config['database']}")
+
+            # Create Students table with level
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS Students (
+                    student_id VARCHAR(10) PRIMARY KEY,
+                    academic_level VARCHAR(20) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            print("Students table created or already exists")
+
+            # Create Courses table with level
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS Courses (
+                    course_code VARCHAR(10) PRIMARY KEY,
+                    course_name VARCHAR(100) NOT NULL,
+                    academic_level VARCHAR(20) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            print("Courses table created or already exists")
+
+            # Create CourseEnrollments table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS CourseEnrollments (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    student_id VARCHAR(10),
+                    course_code VARCHAR(10),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES Students(student_id),
+                    FOREIGN KEY (course_code) REFERENCES Courses(course_code),
+                    UNIQUE (student_id, course_code)
+                )
+            """)
+            print("CourseEnrollments table created or already exists")
+
+            # Create StudentMarks table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS StudentMarks (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    student_id VARCHAR(10),
+                    course_code VARCHAR(10),
+                    test1 DECIMAL(5,2),
+                    midterm DECIMAL(5,2),
+                    test2 DECIMAL(5,2),
+                    assignment DECIMAL(5,2),
+                    total DECIMAL(5,2),
+                    grade VARCHAR(5),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES Students(student_id),
+                    FOREIGN KEY (course_code) REFERENCES Courses(course_code),
+                    UNIQUE (student_id, course_code)
+                )
+            """)
+            print("StudentMarks table created or already exists")
+
+            conn.commit()
+            return True
+
+    except Error as e:
+        print(f"Error: {e}")
+        return False
+
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+
+def insert_course_data(courses):
+    """Insert course data into the database"""
+    conn = None
+    try:
+        conn = mysql.connector.connect(**mysql_config)
+
+        if conn.is_connected():
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT IGNORE INTO Courses (course_code, course_name, academic_level) VALUES (%s, %s, %s)",
+                [(course['code'], course['name'], course['level']) for course in courses]
+            )
+            conn.commit()
+            print(f"Inserted {len(courses)} courses into the database")
+            cursor.close()
+
+    except Error as e:
+        print(f"Error: {e}")
+
+    finally:
+        if conn and conn.is_connected():
+            conn.close()
+
+
+def build_mysql(profile="enhanced", num_students=None, seed=42, num_courses=None, workers=1, method="executemany"):
+    """Creates the schema, inserts the profile's courses and bulk-loads the generated students; True on success."""
+    profile = get_profile(profile)
+    if not create_database_and_tables():
+        return False
+    insert_course_data(profile_courses(profile, num_courses))
+    conn = None
+    try:
+        conn = mysql.connector.connect(**mysql_config, **connect_options(method))
+        loader = BulkLoader(conn, method)
+        with loader.deferred_checks():
+            for tables in iter_blocks(profile, num_students, seed, num_courses, workers):
+                for table, frame in tables.items():
+                    loader.load_frame(table, frame)
+        loader.print_report()
+        return True
+    except Error as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        if conn and conn.is_connected():
+            conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=list(PROFILES), default='enhanced')
+    parser.add_argument('--students', type=int, default=None, help="cohort size (default: the profile's)")
+    parser.add_argument('--courses', type=int, default=None, help="number of courses (default: the profile's catalogue)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', choices=['mysql', 'csv', 'parquet'], default='mysql')
+    parser.add_argument('--out-dir', default='dataset')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--load-method', choices=LOAD_METHODS, default='executemany')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.output == 'mysql':
+            return 0 if build_mysql(args.profile, args.students, args.seed, args.courses, args.workers, args.load_method) else 1
+        blocks = iter_blocks(args.profile, args.students, args.seed, args.courses, args.workers)
+        rows = write_csv(blocks, args.out_dir) if args.output == 'csv' else write_parquet(blocks, args.out_dir)
+    except (ValueError, ImportError) as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    for table, count in rows.items():
+        print(f"{table}: {count:,} rows")
+    print(f"Wrote {sum(rows.values()):,} rows to {args.out_dir} in {elapsed:.2f}s "
+          f"({sum(rows.values()) / max(elapsed, 1e-9):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
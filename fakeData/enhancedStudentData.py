@@ -1,519 +1,18 @@
-import random
-import pandas as pd
-import numpy as np
-import os
 import mysql.connector
 from mysql.connector import Error
 
-# Set seed for reproducibility
-np.random.seed(42)
+from datasetBuilder import PROFILES, build_mysql, mysql_config
 
-# MySQL Connection Parameters
-mysql_config = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '',  # Standard XAMPP password is empty
-    'database': 'dataUTAS'
-}
-
-# Define courses with their codes, names, and academic levels
-courses = [
-    # Diploma Level Courses (100-200 series)
-    {"code": "EEE101", "name": "Basic Electrical Engineering", "level": "Diploma"},
-    {"code": "EEE115", "name": "Introduction to Electronics", "level": "Diploma"},
-    {"code": "EEE120", "name": "Electrical Circuits I", "level": "Diploma"},
-    {"code": "EEE135", "name": "Digital Logic Design", "level": "Diploma"},
-    {"code": "EEE145", "name": "Computer Programming", "level": "Diploma"},
-    {"code": "EEE180", "name": "Electrical Measurement", "level": "Diploma"},
-    {"code": "EEE201", "name": "Electrical Circuits II", "level": "Diploma"},
-    {"code": "EEE210", "name": "Electronic Devices", "level": "Diploma"},
-    {"code": "EEE220", "name": "Signals and Systems", "level": "Diploma"},
-    {"code": "EEE235", "name": "Microcontrollers", "level": "Diploma"},
-    
-    # Advanced Diploma Level Courses (200-300 series)
-    {"code": "EEE245", "name": "Advanced Programming", "level": "Advanced Diploma"},
-    {"code": "EEE250", "name": "Digital Communications", "level": "Advanced Diploma"},
-    {"code": "EEE265", "name": "Industrial Electronics", "level": "Advanced Diploma"},
-    {"code": "EEE275", "name": "Electrical Machines", "level": "Advanced Diploma"},
-    {"code": "EEE280", "name": "Control Systems Fundamentals", "level": "Advanced Diploma"},
-    {"code": "EEE290", "name": "Power Distribution", "level": "Advanced Diploma"},
-    {"code": "EEE295", "name": "Electronic Instrumentation", "level": "Advanced Diploma"},
-    {"code": "EEE298", "name": "Embedded System Design", "level": "Advanced Diploma"},
-    
-    # Bachelor Level Courses (300-400 series)
-    {"code": "EEE301", "name": "Advanced Circuit Theory", "level": "Bachelor"},
-    {"code": "EEE315", "name": "Power Electronics", "level": "Bachelor"},
-    {"code": "EEE327", "name": "Digital Signal Processing", "level": "Bachelor"},
-    {"code": "EEE333", "name": "Electromagnetic Fields", "level": "Bachelor"},
-    {"code": "EEE342", "name": "Microprocessor Systems", "level": "Bachelor"},
-    {"code": "EEE356", "name": "Control Systems", "level": "Bachelor"},
-    {"code": "EEE371", "name": "Power Systems", "level": "Bachelor"},
-    {"code": "EEE385", "name": "Communication Systems", "level": "Bachelor"},
-    {"code": "EEE392", "name": "Digital Electronics", "level": "Bachelor"},
-    {"code": "EEE403", "name": "VLSI Design", "level": "Bachelor"},
-    {"code": "EEE418", "name": "Embedded Systems", "level": "Bachelor"},
-    {"code": "EEE425", "name": "Renewable Energy Systems", "level": "Bachelor"}
-]
+# Dataset profile (datasetBuilder.PROFILES["enhanced"]: Diploma / Advanced Diploma / Bachelor)
+PROFILE = "enhanced"
+SEED = 42
 
 # Total number of students across all levels
-TOTAL_STUDENTS = 150
-
-# Distribution of academic levels (percentage)
-LEVEL_DISTRIBUTION = {
-    "Diploma": 0.35,        # 35% in Diploma programs
-    "Advanced Diploma": 0.30, # 30% in Advanced Diploma programs
-    "Bachelor": 0.35        # 35% in Bachelor programs
-}
-
-# Generate student IDs based on academic year and level
-def generate_student_ids(count, level):
-    ids = set()
-    # Different prefix for each level
-    if level == "Diploma":
-        prefix = "10d"
-    elif level == "Advanced Diploma":
-        prefix = "11a"
-    else:  # Bachelor
-        prefix = "12s"
-    
-    while len(ids) < count:
-        middle_part = ''.join(random.choices('0123456789', k=3))
-        # Different suffix for different enrollment years (23, 24, 25)
-        # Newer students (25) are more common than older ones
-        year_weights = {"23": 0.2, "24": 0.3, "25": 0.5}
-        year_suffix = random.choices(list(year_weights.keys()), 
-                                   weights=list(year_weights.values()), k=1)[0]
-        ids.add(f"{prefix}{middle_part}{year_suffix}")
-    return list(ids)
-
-# Generate marks with variability based on course difficulty and student ability
-def generate_marks(student_ability, course_difficulty):
-    # Adjust base performance based on student ability and course difficulty
-    # Higher ability = better performance, higher difficulty = lower performance
-    performance_factor = 0.6 + (0.5 * student_ability) - (0.3 * course_difficulty)
-    performance_factor = max(0.4, min(1.2, performance_factor))  # Clamp between 0.4 and 1.2
-    
-    # Generate individual marks
-    test1 = min(10, max(0, round(random.normalvariate(7 * performance_factor, 1.5), 1)))
-    midterm = min(20, max(0, round(random.normalvariate(14 * performance_factor, 3), 1)))
-    test2 = min(10, max(0, round(random.normalvariate(7 * performance_factor, 1.5), 1)))
-    assignment = min(10, max(3, round(random.normalvariate(8 * performance_factor, 1.2), 1)))
-    
-    # Calculate total and grade
-    total = test1 + midterm + test2 + assignment
-    
-    grade = 'F'
-    if total >= 45:
-        grade = 'A+'
-    elif total >= 40:
-        grade = 'A'
-    elif total >= 35:
-        grade = 'B'
-    elif total >= 30:
-        grade = 'C'
-    elif total >= 25:
-        grade = 'D'
-        
-    return test1, midterm, test2, assignment, total, grade
-
-def create_database_and_tables():
-    """Create the database and necessary tables"""
-    try:
-        # First connect without specifying database to create it if needed
-        conn = mysql.connector.connect(
-            host=mysql_config['host'],
-            user=mysql_config['user'],
-            password=mysql_config['password']
-        )
-        
-        if conn.is_connected():
-            cursor = conn.cursor()
-            
-            # Create database if it doesn't exist
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {mysql_config['database']}")
-            print(f"Database '{mysql_config['database']}' created or already exists")
-            
-            # Switch to the database
-            cursor.execute(f"USE {mysql_config['database']}")
-            
-            # Create Students table with level
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Students (
-                    student_id VARCHAR(10) PRIMARY KEY,
-                    academic_level VARCHAR(20) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            print("Students table created or already exists")
-            
-            # Create Courses table with level
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Courses (
-                    course_code VARCHAR(10) PRIMARY KEY,
-                    course_name VARCHAR(100) NOT NULL,
-                    academic_level VARCHAR(20) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            print("Courses table created or already exists")
-            
-            # Create CourseEnrollments table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS CourseEnrollments (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    student_id VARCHAR(10),
-                    course_code VARCHAR(10),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (student_id) REFERENCES Students(student_id),
-                    FOREIGN KEY (course_code) REFERENCES Courses(course_code),
-                    UNIQUE (student_id, course_code)
-                )
-            """)
-            print("CourseEnrollments table created or already exists")
-            
-            # Create StudentMarks table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS StudentMarks (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    student_id VARCHAR(10),
-                    course_code VARCHAR(10),
-                    test1 DECIMAL(5,2),
-                    midterm DECIMAL(5,2),
-                    test2 DECIMAL(5,2),
-                    assignment DECIMAL(5,2),
-                    total DECIMAL(5,2),
-                    grade VARCHAR(5),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (student_id) REFERENCES Students(student_id),
-                    FOREIGN KEY (course_code) REFERENCES Courses(course_code),
-                    UNIQUE (student_id, course_code)
-                )
-            """)
-            print("StudentMarks table created or already exists")
-            
-            conn.commit()
-            return True
-            
-    except Error as e:
-        print(f"Error: {e}")
-        return False
-        
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
-
-def insert_course_data():
-    """Insert course data into the database"""
-    try:
-        conn = mysql.connector.connect(**mysql_config)
-        
-        if conn.is_connected():
-            cursor = conn.cursor()
-            
-            # Insert course data
-            for course in courses:
-                cursor.execute(
-                    "INSERT IGNORE INTO Courses (course_code, course_name, academic_level) VALUES (%s, %s, %s)",
-                    (course['code'], course['name'], course['level'])
-                )
-            
-            conn.commit()
-            print(f"Inserted {len(courses)} courses into the database")
-            
-    except Error as e:
-        print(f"Error: {e}")
-        
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+TOTAL_STUDENTS = PROFILES[PROFILE]["students"]
 
-def generate_and_insert_student_data():
-    """Generate realistic student data and insert into the database"""
-    try:
-        conn = mysql.connector.connect(**mysql_config)
-        
-        if conn.is_connected():
-            cursor = conn.cursor()
-            
-            # Calculate number of students per level based on distribution
-            diploma_count = int(TOTAL_STUDENTS * LEVEL_DISTRIBUTION["Diploma"])
-            adv_diploma_count = int(TOTAL_STUDENTS * LEVEL_DISTRIBUTION["Advanced Diploma"])
-            bachelor_count = TOTAL_STUDENTS - diploma_count - adv_diploma_count
-            
-            print(f"Generating {diploma_count} Diploma students, {adv_diploma_count} Advanced Diploma students, and {bachelor_count} Bachelor students")
-            
-            # Generate student IDs for each level
-            diploma_students = generate_student_ids(diploma_count, "Diploma")
-            adv_diploma_students = generate_student_ids(adv_diploma_count, "Advanced Diploma")
-            bachelor_students = generate_student_ids(bachelor_count, "Bachelor")
-            
-            # Insert all students to the Students table with their level
-            for student_id in diploma_students:
-                cursor.execute(
-                    "INSERT IGNORE INTO Students (student_id, academic_level) VALUES (%s, %s)",
-                    (student_id, "Diploma")
-                )
-            
-            for student_id in adv_diploma_students:
-                cursor.execute(
-                    "INSERT IGNORE INTO Students (student_id, academic_level) VALUES (%s, %s)",
-                    (student_id, "Advanced Diploma")
-                )
-            
-            for student_id in bachelor_students:
-                cursor.execute(
-                    "INSERT IGNORE INTO Students (student_id, academic_level) VALUES (%s, %s)",
-                    (student_id, "Bachelor")
-                )
-            
-            conn.commit()
-            print(f"Inserted {len(diploma_students) + len(adv_diploma_students) + len(bachelor_students)} students into the database")
-            
-            # Filter courses by level
-            diploma_courses = [course for course in courses if course['level'] == "Diploma"]
-            adv_diploma_courses = [course for course in courses if course['level'] == "Advanced Diploma"]
-            bachelor_courses = [course for course in courses if course['level'] == "Bachelor"]
-            
-            # Define enrollment patterns with probabilities
-            # Format: (primary_level_courses, secondary_level_courses, tertiary_level_courses, probability)
-            enrollment_patterns = {
-                "Diploma": [
-                    (5, 0, 0, 0.6),  # 60% take 5 diploma courses
-                    (4, 1, 0, 0.3),  # 30% take 4 diploma + 1 adv diploma course
-                    (4, 0, 0, 0.1),  # 10% take 4 diploma courses only
-                ],
-                "Advanced Diploma": [
-                    (5, 0, 0, 0.5),  # 50% take 5 adv diploma courses
-                    (4, 1, 0, 0.2),  # 20% take 4 adv diploma + 1 bachelor course
-                    (4, 0, 1, 0.2),  # 20% take 4 adv diploma + 1 diploma course
-                    (4, 0, 0, 0.1),  # 10% take 4 adv diploma courses only
-                ],
-                "Bachelor": [
-                    (5, 0, 0, 0.6),  # 60% take 5 bachelor courses
-                    (4, 1, 0, 0.2),  # 20% take 4 bachelor + 1 adv diploma course
-                    (4, 0, 0, 0.2),  # 20% take 4 bachelor courses only
-                ]
-            }
-            
-            # Process Diploma students
-            for student_id in diploma_students:
-                # Assign student ability (randomized but consistent for this student)
-                student_ability = random.Random(student_id).random()
-                
-                # Choose enrollment pattern based on probability
-                pattern_choice = random.random()
-                cumulative_prob = 0
-                selected_pattern = None
-                
-                for pattern in enrollment_patterns["Diploma"]:
-                    cumulative_prob += pattern[3]
-                    if pattern_choice <= cumulative_prob:
-                        selected_pattern = pattern
-                        break
-                
-                primary_course_count, secondary_course_count, tertiary_course_count, _ = selected_pattern
-                
-                # Select random courses for each level
-                selected_primary_courses = random.sample(diploma_courses, primary_course_count)
-                selected_secondary_courses = []
-                selected_tertiary_courses = []
-                
-                # If taking courses from the secondary level (Advanced Diploma)
-                if secondary_course_count > 0:
-                    selected_secondary_courses = random.sample(adv_diploma_courses, secondary_course_count)
-                
-                # If taking courses from the tertiary level (Bachelor)
-                if tertiary_course_count > 0:
-                    selected_tertiary_courses = random.sample(bachelor_courses, tertiary_course_count)
-                
-                # Combine all courses for this student
-                student_courses = selected_primary_courses + selected_secondary_courses + selected_tertiary_courses
-                
-                # Process each course enrollment for this student
-                for course in student_courses:
-                    # Insert course enrollment
-                    cursor.execute(
-                        "INSERT IGNORE INTO CourseEnrollments (student_id, course_code) VALUES (%s, %s)",
-                        (student_id, course['code'])
-                    )
-                    
-                    # Course difficulty is partly based on course code (higher = more difficult)
-                    # and partly random per student-course combination
-                    course_number = int(course['code'][3:])
-                    base_difficulty = (course_number - 100) / 400  # Normalize to 0-1 range
-                    course_difficulty = base_difficulty + random.uniform(-0.1, 0.1)
-                    course_difficulty = max(0, min(1, course_difficulty))
-                    
-                    # Generate marks
-                    test1, midterm, test2, assignment, total, grade = generate_marks(student_ability, course_difficulty)
-                    
-                    # Insert student marks
-                    cursor.execute(
-                        """
-                        INSERT IGNORE INTO StudentMarks 
-                        (student_id, course_code, test1, midterm, test2, assignment, total, grade) 
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        (
-                            student_id, 
-                            course['code'], 
-                            test1, 
-                            midterm, 
-                            test2, 
-                            assignment, 
-                            total, 
-                            grade
-                        )
-                    )
-            
-            # Process Advanced Diploma students
-            for student_id in adv_diploma_students:
-                # Assign student ability
-                student_ability = random.Random(student_id).random()
-                
-                # Choose enrollment pattern based on probability
-                pattern_choice = random.random()
-                cumulative_prob = 0
-                selected_pattern = None
-                
-                for pattern in enrollment_patterns["Advanced Diploma"]:
-                    cumulative_prob += pattern[3]
-                    if pattern_choice <= cumulative_prob:
-                        selected_pattern = pattern
-                        break
-                
-                primary_course_count, secondary_course_count, tertiary_course_count, _ = selected_pattern
-                
-                # Select random courses for each level
-                selected_primary_courses = random.sample(adv_diploma_courses, primary_course_count)
-                selected_secondary_courses = []
-                selected_tertiary_courses = []
-                
-                # If taking courses from the secondary level (Bachelor)
-                if secondary_course_count > 0:
-                    selected_secondary_courses = random.sample(bachelor_courses, secondary_course_count)
-                
-                # If taking courses from the tertiary level (Diploma)
-                if tertiary_course_count > 0:
-                    selected_tertiary_courses = random.sample(diploma_courses, tertiary_course_count)
-                
-                # Combine all courses for this student
-                student_courses = selected_primary_courses + selected_secondary_courses + selected_tertiary_courses
-                
-                # Process each course enrollment for this student
-                for course in student_courses:
-                    # Insert course enrollment
-                    cursor.execute(
-                        "INSERT IGNORE INTO CourseEnrollments (student_id, course_code) VALUES (%s, %s)",
-                        (student_id, course['code'])
-                    )
-                    
-                    # Course difficulty is partly based on course code and partly random
-                    course_number = int(course['code'][3:])
-                    base_difficulty = (course_number - 100) / 400  # Normalize to 0-1 range
-                    course_difficulty = base_difficulty + random.uniform(-0.1, 0.1)
-                    course_difficulty = max(0, min(1, course_difficulty))
-                    
-                    # Generate marks
-                    test1, midterm, test2, assignment, total, grade = generate_marks(student_ability, course_difficulty)
-                    
-                    # Insert student marks
-                    cursor.execute(
-                        """
-                        INSERT IGNORE INTO StudentMarks 
-                        (student_id, course_code, test1, midterm, test2, assignment, total, grade) 
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        (
-                            student_id, 
-                            course['code'], 
-                            test1, 
-                            midterm, 
-                            test2, 
-                            assignment, 
-                            total, 
-                            grade
-                        )
-                    )
-            
-            # Process Bachelor students
-            for student_id in bachelor_students:
-                # Assign student ability
-                student_ability = random.Random(student_id).random()
-                
-                # Choose enrollment pattern based on probability
-                pattern_choice = random.random()
-                cumulative_prob = 0
-                selected_pattern = None
-                
-                for pattern in enrollment_patterns["Bachelor"]:
-                    cumulative_prob += pattern[3]
-                    if pattern_choice <= cumulative_prob:
-                        selected_pattern = pattern
-                        break
-                
-                primary_course_count, secondary_course_count, tertiary_course_count, _ = selected_pattern
-                
-                # Select random courses for each level
-                selected_primary_courses = random.sample(bachelor_courses, primary_course_count)
-                selected_secondary_courses = []
-                selected_tertiary_courses = []
-                
-                # If taking courses from the secondary level (Advanced Diploma)
-                if secondary_course_count > 0:
-                    selected_secondary_courses = random.sample(adv_diploma_courses, secondary_course_count)
-                
-                # Combine all courses for this student
-                student_courses = selected_primary_courses + selected_secondary_courses + selected_tertiary_courses
-                
-                # Process each course enrollment for this student
-                for course in student_courses:
-                    # Insert course enrollment
-                    cursor.execute(
-                        "INSERT IGNORE INTO CourseEnrollments (student_id, course_code) VALUES (%s, %s)",
-                        (student_id, course['code'])
-                    )
-                    
-                    # Course difficulty is partly based on course code and partly random
-                    course_number = int(course['code'][3:])
-                    base_difficulty = (course_number - 100) / 400  # Normalize to 0-1 range
-                    course_difficulty = base_difficulty + random.uniform(-0.1, 0.1)
-                    course_difficulty = max(0, min(1, course_difficulty))
-                    
-                    # Generate marks
-                    test1, midterm, test2, assignment, total, grade = generate_marks(student_ability, course_difficulty)
-                    
-                    # Insert student marks
-                    cursor.execute(
-                        """
-                        INSERT IGNORE INTO StudentMarks 
-                        (student_id, course_code, test1, midterm, test2, assignment, total, grade) 
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        (
-                            student_id, 
-                            course['code'], 
-                            test1, 
-                            midterm, 
-                            test2, 
-                            assignment, 
-                            total, 
-                            grade
-                        )
-                    )
-                    
-            conn.commit()
-            print("All student enrollments and marks have been inserted")
-            
-    except Error as e:
-        print(f"Error: {e}")
-        
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+# How generated rows are written: "executemany" (batched multi-row INSERTs) or
+# "load_data" (LOAD DATA LOCAL INFILE from a temporary CSV; needs local_infile=ON)
+LOAD_METHOD = "executemany"
 
 def run_summary_queries():
     """Run and display summary queries of the data"""
@@ -664,17 +163,11 @@ def run_summary_queries():
 def main():
     print("Starting Enhanced Student Database Setup and Data Generation...")
     
-    # Step 1: Create database and tables
-    if not create_database_and_tables():
-        print("Failed to create database structure. Exiting...")
+    # Steps 1-3: Create database and tables, insert course data, generate and load student data
+    if not build_mysql(PROFILE, TOTAL_STUDENTS, SEED, method=LOAD_METHOD):
+        print("Failed to build the database. Exiting...")
         return
     
-    # Step 2: Insert course data
-    insert_course_data()
-    
-    # Step 3: Generate and insert student data
-    generate_and_insert_student_data()
-    
     # Step 4: Display summary information
     run_summary_queries()
     
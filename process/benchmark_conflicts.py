@@ -0,0 +1,90 @@
+"""Benchmark: pairwise set-intersection vs. inverted-index conflict detection.
+
+Usage: python process/benchmark_conflicts.py [--sizes 150x30,5000x200,...] [--repeat N]
+
+Each size is <students>x<courses>. The enrollments come from
+fakeData/datasetBuilder.py's "enhanced" profile with the courses split over its
+Diploma / Advanced Diploma / Bachelor levels: students take 4-5 courses of their
+level and sometimes one of a neighbouring level, so the graph has the real
+clusters.
+"""
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+from conflict_graph import ConflictGraph
+
+DEFAULT_SIZES = "150x30,2000x100,10000x300,30000x600"
+FAKEDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fakeData')
+
+
+def import_dataset_builder():
+    """fakeData/datasetBuilder.py, the fixture source of the benchmarks."""
+    sys.path.insert(0, FAKEDATA_DIR)
+    try:
+        import datasetBuilder
+    finally:
+        sys.path.pop(0)
+    return datasetBuilder
+
+
+def make_synthetic_enrollments(num_students, num_courses, seed=42):
+    """Returns {student_id: [course_code, ...]} from the "enhanced" profile with num_courses courses."""
+    builder = import_dataset_builder()
+    return builder.enrollment_mapping(builder.build_tables("enhanced", num_students, seed, num_courses=num_courses))
+
+
+def find_conflicting_courses_pairwise(enrollments):
+    """The original O(C^2) implementation, kept here as the benchmark baseline."""
+    course_pairs = defaultdict(set)
+    for student_id, courses in enrollments.items():
+        for course_code in courses:
+            course_pairs[course_code].add(student_id)
+
+    conflicts = set()
+    course_list = list(course_pairs.keys())
+    for i in range(len(course_list)):
+        for j in range(i + 1, len(course_list)):
+            course1 = course_list[i]
+            course2 = course_list[j]
+            if course_pairs[course1].intersection(course_pairs[course2]):
+                conflicts.add(tuple(sorted((course1, course2))))
+    return conflicts
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'students':>9} {'courses':>8} {'edges':>8} {'pairwise (s)':>13} {'graph (s)':>10} {'speedup':>8}")
+    for size in args.sizes.split(','):
+        num_students, num_courses = (int(x) for x in size.lower().split('x'))
+        enrollments = make_synthetic_enrollments(num_students, num_courses)
+
+        old_time, old_pairs = best_of(lambda: find_conflicting_courses_pairwise(enrollments), args.repeat)
+        new_time, graph = best_of(lambda: ConflictGraph.from_enrollments(enrollments), args.repeat)
+
+        if set(graph.conflict_pairs()) != old_pairs:
+            print(f"Mismatch between implementations for size {size}")
+            return 1
+        speedup = old_time / new_time if new_time else float('inf')
+        print(f"{num_students:>9} {num_courses:>8} {graph.edge_count():>8} {old_time:>13.4f} {new_time:>10.4f} {speedup:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
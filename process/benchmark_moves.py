@@ -0,0 +1,114 @@
+"""Benchmark: delta evaluation of moves/swaps vs. full penalty recomputation.
+
+Usage: python process/benchmark_moves.py [--students N] [--sizes 10000x300,...] [--moves N]
+
+"fakedata" is fakeData/datasetBuilder.py's "realistic" profile (60% Diploma /
+40% Bachelor students taking 4-5 courses of their level, sometimes one of the
+other) scaled to --students; the "<students>x<courses>" sizes use its
+"enhanced" profile via benchmark_conflicts.py. Each run starts from the local solver's schedule.
+"""
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+
+from benchmark_conflicts import make_synthetic_enrollments, import_dataset_builder
+from conflict_graph import ConflictGraph
+from enrollment_store import EnrollmentMatrix
+from move_evaluator import ScheduleState
+from solver import solve_schedule
+from workload_metrics import WorkloadEvaluator
+
+DEFAULT_SIZES = "2000x100,10000x300"
+
+
+def make_fakedata_enrollments(num_students, seed=42):
+    """{student_id: [course_code, ...]} from the dataset builder's "realistic" profile."""
+    builder = import_dataset_builder()
+    return builder.enrollment_mapping(builder.build_tables("realistic", num_students, seed))
+
+
+def exam_period(num_days, start=date(2025, 4, 1)):
+    """The first num_days available dates from start (Fridays excluded, as in the pipeline)."""
+    dates = []
+    current = start
+    while len(dates) < num_days:
+        if current.weekday() != 4:
+            dates.append(current.isoformat())
+        current += timedelta(days=1)
+    return dates
+
+
+def benchmark(name, enrollments, num_moves, seed=7):
+    matrix = EnrollmentMatrix.from_mapping(enrollments)
+    graph = ConflictGraph.from_matrix(matrix)
+    courses = sorted(graph.courses)
+    summary = {code: {'level': 'Unknown', 'average_total': None, 'enrollment': graph.enrollment[code]} for code in courses}
+    num_days = max(graph.degree(c) for c in courses) + 1 # always colourable
+    dates = exam_period(num_days)
+    schedule = solve_schedule(dates, summary, graph)["schedule"]
+
+    state = ScheduleState.from_schedule(graph, schedule, dates)
+    rng = random.Random(seed)
+    num_courses = len(state.course_codes)
+    candidates = [(rng.randrange(num_courses), rng.randrange(num_days), rng.randrange(num_courses)) for _ in range(num_moves)]
+
+    started = time.perf_counter()
+    for course, day, _ in candidates:
+        state.move_delta(course, day)
+    move_rate = num_moves / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for course, _, other in candidates:
+        state.swap_delta(course, other)
+    swap_rate = num_moves / (time.perf_counter() - started)
+
+    # Apply every candidate move, then undo them all: the running cost must return exactly
+    initial = state.cost
+    started = time.perf_counter()
+    tokens = [state.apply_move(course, day) for course, day, _ in candidates]
+    apply_rate = num_moves / (time.perf_counter() - started)
+    drift = abs(state.cost - state.full_cost())
+    for token in reversed(tokens):
+        state.undo(token)
+    if abs(state.cost - initial) > 1e-6 or drift > 1e-6:
+        print(f"{name}: incremental cost drifted from the full recomputation")
+        return False
+
+    # Baseline: full vectorised recomputation per candidate
+    evaluator = WorkloadEvaluator(matrix)
+    course_days = np.zeros(matrix.num_courses, dtype=np.int64)
+    for course, day in enumerate(state.day):
+        course_days[matrix.course_index[state.course_codes[course]]] = state.day_ordinals[day]
+    full_runs = max(3, min(50, num_moves // 1000))
+    started = time.perf_counter()
+    for _ in range(full_runs):
+        evaluator.penalty(course_days)
+    full_rate = full_runs / (time.perf_counter() - started)
+
+    print(f"{name:>18} {matrix.num_students:>9} {num_courses:>8} {graph.edge_count():>8} "
+          f"{move_rate:>12,.0f} {swap_rate:>12,.0f} {apply_rate:>12,.0f} {full_rate:>10,.1f}")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=5000, help="students for the fakeData-based run")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES)
+    parser.add_argument('--moves', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    print(f"{'data':>18} {'students':>9} {'courses':>8} {'edges':>8} "
+          f"{'moves/s':>12} {'swaps/s':>12} {'apply/s':>12} {'full/s':>10}")
+    ok = benchmark("fakedata", make_fakedata_enrollments(args.students), args.moves)
+    for size in filter(None, args.sizes.split(',')):
+        num_students, num_courses = (int(x) for x in size.lower().split('x'))
+        ok &= benchmark(f"synthetic {size}", make_synthetic_enrollments(num_students, num_courses), args.moves)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Benchmark: scaling of the parallel annealing optimizer across cores.
+
+Usage: python process/benchmark_optimizer.py [--size 10000x300] [--budget SECONDS] [--workers 1,2,4,8]
+
+Runs one chain per worker for the same wall-clock budget and reports the
+total iterations per second, the parallel efficiency relative to one worker
+and the best penalty reached.
+"""
+import os
+import sys
+import time
+import argparse
+
+from benchmark_conflicts import make_synthetic_enrollments
+from benchmark_moves import exam_period
+from conflict_graph import ConflictGraph
+from optimizer import optimize_schedule
+from solver import solve_schedule
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default="10000x300")
+    parser.add_argument('--budget', type=float, default=5.0)
+    parser.add_argument('--workers', default=None, help="comma-separated worker counts (default: 1, 2, 4, ... up to the core count)")
+    args = parser.parse_args(argv)
+
+    num_students, num_courses = (int(x) for x in args.size.lower().split('x'))
+    graph = ConflictGraph.from_enrollments(make_synthetic_enrollments(num_students, num_courses))
+    courses = sorted(graph.courses)
+    summary = {code: {'level': 'Unknown', 'average_total': None, 'enrollment': graph.enrollment[code]} for code in courses}
+    dates = exam_period(max(graph.degree(c) for c in courses) + 20)
+    schedule = solve_schedule(dates, summary, graph)["schedule"]
+
+    if args.workers:
+        counts = [int(x) for x in args.workers.split(',')]
+    else:
+        cores = os.cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= cores:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cores:
+            counts.append(cores)
+
+    print(f"{'workers':>8} {'wall (s)':>9} {'iterations/s':>13} {'efficiency':>11} {'initial':>10} {'best':>10}")
+    base_rate = None
+    for workers in counts:
+        started = time.perf_counter()
+        result = optimize_schedule(schedule, dates, graph, args.budget, chains=workers, workers=workers)
+        wall = time.perf_counter() - started
+        rate = sum(chain["iterations"] for chain in result["chains"]) / args.budget
+        base_rate = base_rate or rate
+        efficiency = rate / (base_rate * workers)
+        print(f"{workers:>8} {wall:>9.2f} {rate:>13,.0f} {efficiency:>10.0%} {result['initial_cost']:>10.0f} {result['best_cost']:>10.0f}")
+        if result["clashes"]:
+            print(f"Optimizer introduced {result['clashes']} clashes with {workers} workers")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""Benchmark: the scheduling pipeline end to end across dataset sizes.
+
+Usage: python process/benchmark_pipeline.py [--sizes 1000,10000,100000] [--profile enhanced] [--courses N]
+                                            [--repeat N] [--llm] [--seats N] [--report FILE] [--compare OLD_REPORT]
+
+For each size a cohort is generated with fakeData/datasetBuilder.py and loaded
+into a SQLite file that stands in for MySQL (the pipeline's queries are plain
+SQL; SQLiteConnection answers the few mysql.connector calls they make). Each
+stage of process_schedule.py is then timed (best of --repeat): dates, summary
+(get_course_marks_summary, cache off), enrollments, conflicts, solve (local
+solver), validate (validation report and workload metrics) and, with --llm,
+the DeepSeek path against mock_deepseek.py. Every size runs in a fresh process,
+so its peak RSS is its own; each stage's peak Python/NumPy allocation is taken
+from one extra run under tracemalloc, outside the timed runs.
+
+The report (JSON, default process/cache/benchmark_pipeline.json) records the
+git commit, machine and settings with the per-stage numbers; --compare prints
+each stage's time against an earlier report for regression tracking.
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from benchmark_conflicts import import_dataset_builder
+
+PROCESS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_REPORT = os.path.join(PROCESS_DIR, 'cache', 'benchmark_pipeline.json')
+STAGES = ("dates", "summary", "enrollments", "conflicts", "solve", "validate", "llm")
+
+SQLITE_SCHEMA = """
+    CREATE TABLE Students (
+        student_id VARCHAR(10) PRIMARY KEY,
+        academic_level VARCHAR(20) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE Courses (
+        course_code VARCHAR(10) PRIMARY KEY,
+        course_name VARCHAR(100) NOT NULL,
+        academic_level VARCHAR(20) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE CourseEnrollments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id VARCHAR(10),
+        course_code VARCHAR(10),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (student_id, course_code)
+    );
+    CREATE TABLE StudentMarks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id VARCHAR(10),
+        course_code VARCHAR(10),
+        test1 DECIMAL(5,2),
+        midterm DECIMAL(5,2),
+        test2 DECIMAL(5,2),
+        assignment DECIMAL(5,2),
+        total DECIMAL(5,2),
+        grade VARCHAR(5),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (student_id, course_code)
+    );
+"""
+
+
+class SQLiteConnection:
+    """sqlite3 connection accepting the mysql.connector cursor() options the pipeline passes."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+
+    def cursor(self, buffered=None, dictionary=False):
+        return self.conn.cursor()
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def load_sqlite(path, builder, profile, num_students, seed, num_courses):
+    """Generates the dataset and writes it to a new SQLite file; returns row counts and timings."""
+    started = time.perf_counter()
+    tables = builder.build_tables(profile, num_students, seed, num_courses)
+    generated = time.perf_counter()
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SQLITE_SCHEMA)
+        courses = builder.profile_courses(builder.get_profile(profile), num_courses)
+        conn.executemany("INSERT INTO Courses (course_code, course_name, academic_level) VALUES (?, ?, ?)",
+                         [(course['code'], course['name'], course['level']) for course in courses])
+        for table, frame in tables.items():
+            columns = ', '.join(frame.columns)
+            placeholders = ', '.join('?' * len(frame.columns))
+            conn.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", frame.itertuples(index=False, name=None))
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        "students": len(tables["Students"]),
+        "enrollments": len(tables["CourseEnrollments"]),
+        "courses": len(courses),
+        "generate_seconds": round(generated - started, 3),
+        "load_seconds": round(time.perf_counter() - generated, 3)
+    }
+
+
+def time_stage(func, repeat, trace_memory=True):
+    """({"seconds": best, "runs": [...], "peak_mb": ...}, last result) for func() run repeat times."""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - started)
+    entry = {"seconds": round(min(runs), 6), "runs": [round(run, 6) for run in runs]}
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            entry["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    if isinstance(result, dict) and "error" in result:
+        entry["error"] = result["error"]
+    return entry, result
+
+
+def run_size(num_students, settings):
+    """Generates, loads and times every stage for one cohort size (runs in its own process)."""
+    import process_schedule
+    from schedule_validator import validate_schedule
+    from workload_metrics import schedule_workload
+    from solver import solve_schedule
+    import exam_slots
+
+    builder = import_dataset_builder()
+    sessions = {"Morning": settings["seats"], "Afternoon": settings["seats"]}
+    repeat = settings["repeat"]
+    trace = settings["trace_memory"]
+    report = {"students": num_students, "stages": {}}
+    stages = report["stages"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dataUTAS.sqlite3')
+        report.update(load_sqlite(path, builder, settings["profile"], num_students, settings["seed"], settings["courses"]))
+        conn = SQLiteConnection(path)
+        try:
+            stages["dates"], dates = time_stage(lambda: process_schedule.get_available_dates(settings["start"], settings["end"], ""), repeat, trace)
+            available_dates = dates["dates"]
+            stages["summary"], summary = time_stage(lambda: process_schedule.get_course_marks_summary(conn, use_cache=False), repeat, trace)
+            stages["enrollments"], enrollments = time_stage(lambda: process_schedule.get_student_enrollments(conn), repeat, trace)
+        finally:
+            conn.close()
+    if "error" in summary or "error" in enrollments:
+        return report
+    summary = summary["summary"]
+    enrollments = enrollments["enrollments"]
+    stages["conflicts"], conflicts = time_stage(lambda: process_schedule.find_conflicting_courses(enrollments), repeat, trace)
+    graph = conflicts["graph"]
+    report["edges"] = graph.edge_count()
+
+    solve = lambda: solve_schedule(available_dates, summary, graph, max_exams_per_day=process_schedule.MAX_EXAMS_PER_DAY,
+                                   min_component_weight=process_schedule.SOLVER_MIN_COMPONENT_WEIGHT, sessions=sessions)
+    stages["solve"], solved = time_stage(solve, repeat, trace)
+    if "error" not in solved:
+        demand = exam_slots.course_demand(summary, graph)
+
+        def validate():
+            validation = validate_schedule(solved["schedule"], available_dates, summary, graph, solved["sessions"],
+                                           demand, sessions, enrollments)
+            return {"validation": validation, "workload": schedule_workload(solved["schedule"], enrollments)}
+
+        stages["validate"], _ = time_stage(validate, repeat, trace)
+
+    if settings["llm"]:
+        import mock_deepseek
+
+        server = mock_deepseek.serve(0)
+        process_schedule.DEEPSEEK_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        process_schedule.DEEPSEEK_API_KEY = "benchmark"
+        process_schedule.LLM_CACHE_ENABLED = False
+        process_schedule.EXAM_SESSIONS = sessions
+        data = {"summary": summary, "graph": graph, "enrollments": enrollments}
+
+        def ask_llm():
+            result = process_schedule.get_deepseek_suggestion(available_dates, summary, graph)
+            if "error" not in result:
+                error = process_schedule.repair_llm_result(result, available_dates, data)
+                if error:
+                    result["error"] = error
+            return result
+
+        try:
+            stages["llm"], _ = time_stage(ask_llm, repeat, trace)
+        finally:
+            server.shutdown()
+
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROCESS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    stages = [stage for stage in STAGES if any(stage in result["stages"] for result in results)]
+    print(f"{'students':>9} {'enrollments':>12} {'courses':>8} {'edges':>8} " + " ".join(f"{stage:>11}" for stage in stages) + f" {'peak RSS':>9}")
+    for result in results:
+        cells = []
+        for stage in stages:
+            entry = result["stages"].get(stage)
+            cells.append(f"{'-' if entry is None else 'error' if 'error' in entry else format(entry['seconds'], '.4f'):>11}")
+        print(f"{result['students']:>9,} {result.get('enrollments', 0):>12,} {result.get('courses', 0):>8} {result.get('edges', 0):>8} "
+              + " ".join(cells) + f" {result.get('peak_rss_mb', 0):>7.0f}MB")
+    for result in results:
+        for stage, entry in result["stages"].items():
+            if "error" in entry:
+                print(f"{result['students']:,} students, {stage}: {entry['error']}")
+
+
+def compare_reports(report, baseline):
+    """Prints each stage's time as a ratio of the baseline report's, for the sizes (students, courses) both contain."""
+    base = {(result["students"], result.get("courses")): result for result in baseline.get("results", [])}
+    print(f"\nCompared with {baseline.get('label') or baseline.get('git_commit')} (ratio new / old, < 1 is faster):")
+    changed = [key for key, value in report["settings"].items() if baseline.get("settings", {}).get(key) != value]
+    if changed:
+        print(f"Note: settings differ ({', '.join(changed)})")
+    for result in report["results"]:
+        old = base.get((result["students"], result.get("courses")))
+        if old is None:
+            continue
+        ratios = []
+        for stage, entry in result["stages"].items():
+            old_entry = old["stages"].get(stage)
+            if old_entry and old_entry["seconds"] and "error" not in entry:
+                ratios.append(f"{stage} {entry['seconds'] / old_entry['seconds']:.2f}x")
+        print(f"{result['students']:>9,}: " + ", ".join(ratios))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="comma-separated student counts")
+    parser.add_argument('--profile', default='enhanced', help="fakeData/datasetBuilder.py profile")
+    parser.add_argument('--courses', type=int, default=None, help="number of courses (default: the profile's catalogue)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--start', default="2025-04-01")
+    parser.add_argument('--end', default="2025-04-30")
+    parser.add_argument('--seats', type=int, default=None, help="seats per session (default: unlimited)")
+    parser.add_argument('--llm', action='store_true', help="also time the DeepSeek path against mock_deepseek.py")
+    parser.add_argument('--no-trace-memory', action='store_true', help="skip the tracemalloc run of each stage")
+    parser.add_argument('--label', default=None)
+    parser.add_argument('--report', default=DEFAULT_REPORT)
+    parser.add_argument('--compare', default=None, help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    settings = {"profile": args.profile, "courses": args.courses, "seed": args.seed, "repeat": args.repeat,
+                "start": args.start, "end": args.end, "seats": args.seats, "llm": args.llm,
+                "trace_memory": not args.no_trace_memory}
+    results = []
+    for size in args.sizes.split(','):
+        # A fresh (spawned) process per size keeps peak RSS and imports from leaking between sizes
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results.append(pool.submit(run_size, int(size), settings).result())
+
+    report = {
+        "label": args.label,
+        "git_commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings,
+        "results": results
+    }
+    print_results(results)
+    os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+    with open(args.report + '.tmp', 'w') as f:
+        json.dump(report, f, indent=4)
+    os.replace(args.report + '.tmp', args.report)
+    print(f"\nReport written to {args.report}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_reports(report, json.load(f))
+    return 1 if any("error" in entry for result in results for entry in result["stages"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
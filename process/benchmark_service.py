@@ -0,0 +1,85 @@
+"""Benchmark: cold CLI run vs. warm schedule service request.
+
+Usage: python process/benchmark_service.py [--start 2025-04-01] [--end 2025-04-30] [--holidays ...] [--runs N]
+
+Run from the repository root. "cold" spawns python process/process_schedule.py
+for every request (interpreter start, imports, connect, full data load);
+"warm" sends the same request to a schedule_service.py instance started by
+this script, after one priming request. Neither publishes (no --publish), so
+the students' timetables in StudentExamTimetable are left alone.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+import urllib.error
+
+from schedule_client import request_schedule, SERVICE_HOST
+
+PROCESS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def wait_for_service(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://{SERVICE_HOST}:{port}/health", timeout=1) as response:
+                return json.loads(response.read())
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    raise RuntimeError("Schedule service did not start")
+
+
+def time_runs(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {"median_s": round(statistics.median(timings), 4), "min_s": round(min(timings), 4), "runs": runs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold vs. warm schedule latency.")
+    parser.add_argument('--start', default='2025-04-01')
+    parser.add_argument('--end', default='2025-04-30')
+    parser.add_argument('--holidays', default='')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8799)
+    args = parser.parse_args(argv)
+
+    cli = [sys.executable, os.path.join(PROCESS_DIR, 'process_schedule.py'), args.start, args.end, args.holidays]
+    # Run the CLI from a scratch directory so it doesn't overwrite the real schedule_result.json
+    with tempfile.TemporaryDirectory() as scratch:
+        cold = time_runs(lambda: subprocess.run(cli, cwd=scratch, stdout=subprocess.DEVNULL, check=False), args.runs)
+
+    service = subprocess.Popen([sys.executable, os.path.join(PROCESS_DIR, 'schedule_service.py'), '--port', str(args.port)],
+                               stdout=subprocess.DEVNULL)
+    try:
+        wait_for_service(args.port)
+        payload = {"start_date": args.start, "end_date": args.end, "holidays": args.holidays}
+        request = lambda: request_schedule(payload, port=args.port)
+        first = time_runs(request, 1) # loads summary, enrollments and graph
+        warm = time_runs(request, args.runs)
+        sample = request()
+    finally:
+        service.terminate()
+        service.wait()
+
+    print(json.dumps({
+        "cold_cli": cold,
+        "service_first_request": first,
+        "service_warm": warm,
+        "speedup_warm_vs_cold": round(cold["median_s"] / warm["median_s"], 1) if warm["median_s"] else None,
+        "result_has_error": "error" in sample
+    }, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 
 # Replace with your actual DeepSeek API Key
 DEEPSEEK_API_KEY = "xxxxxxxxxxxxxxxxxxxxxxx"
+DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
 
 # MySQL Database Configuration (assumes XAMPP defaults)
 DB_CONFIG = {
@@ -9,4 +10,65 @@ DB_CONFIG = {
     'user': 'root',
     'password': '',
     'database': 'dataUTAS'
-} 
+}
+
+# Connection pool shared by every step of the scheduling pipeline
+DB_POOL_SIZE = 4
+DB_POOL_TIMEOUT = 10 # seconds to wait for a free pooled connection
+
+# Long-running schedule service (process/schedule_service.py)
+SCHEDULE_SERVICE_HOST = '127.0.0.1'
+SCHEDULE_SERVICE_PORT = 8765
+SCHEDULE_SERVICE_TIMEOUT = 300 # seconds the CLI client waits for an answer
+
+# Persist the conflict graph and update it from CourseEnrollments changes
+# (needs the TRIGGER privilege once, to create the change log triggers)
+INCREMENTAL_CONFLICT_GRAPH = True
+
+# Cache of DeepSeek responses for repeated identical requests
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL = 86400 # seconds
+LLM_CACHE_MAX_ENTRIES = 500
+
+# DeepSeek prompt limits; larger problems are split into concurrent sub-requests
+LLM_PROMPT_TOKEN_BUDGET = 12000
+LLM_MAX_OUTPUT_TOKENS = 8192
+LLM_MAX_CONCURRENT_REQUESTS = 4
+
+# DeepSeek HTTP client: request timeout, retries of 429/5xx/connection errors with
+# exponential backoff, streamed responses, and how many candidate schedules to
+# request concurrently (the one with the fewest violations is kept)
+LLM_REQUEST_TIMEOUT = 45 # seconds
+LLM_MAX_RETRIES = 3
+LLM_RETRY_BACKOFF = 1.0 # seconds before the first retry, doubled each time
+LLM_STREAM = True
+LLM_CANDIDATES = 1
+
+# Local solver: maximum exams per day (None = unlimited), and the minimum number
+# of shared students for a conflict to keep two courses in one component when the
+# conflict graph is split for parallel solving (conflicts below it are repaired after merging)
+MAX_EXAMS_PER_DAY = None
+SOLVER_MIN_COMPONENT_WEIGHT = 1
+
+# Write each student's exams to the StudentExamTimetable table when a schedule is
+# published (job_queue.py publish or --publish; student_schedule.php then reads a
+# student's timetable with one keyed query)
+MATERIALIZE_STUDENT_TIMETABLE = True
+
+# Annealing chains run in parallel by --optimize SECONDS (None = one per CPU core)
+OPTIMIZER_CHAINS = None
+
+# Exam sessions on every date and the seats available in each ({name: seats},
+# None = unlimited). Each course sits in one session, so its enrollment must fit
+# the largest session (benchmark_pipeline.py runs with unlimited seats unless --seats)
+EXAM_SESSIONS = {"Morning": 300, "Afternoon": 300}
+
+# Background schedule jobs (process/job_queue.py): queue polling interval of an
+# idle worker and how long an automatically started worker waits for more jobs
+JOB_POLL_INTERVAL = 1.0 # seconds
+JOB_WORKER_IDLE_EXIT = 300 # seconds
+
+# Per-stage wall/CPU time, rows and peak memory under "trace" in the schedule
+# result (same as --trace), optionally appended to a JSON-lines span log
+TRACE_PIPELINE = False
+TRACE_LOG_FILE = None # e.g. 'process/cache/pipeline_trace.jsonl'
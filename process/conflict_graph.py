@@ -0,0 +1,172 @@
+from collections import defaultdict, Counter
+from itertools import combinations
+
+from enrollment_store import EnrollmentMatrix
+
+
+class ConflictGraph:
+    """Weighted course conflict graph built from student enrollments.
+
+    Nodes are course codes and the weight of an edge is the number of
+    students enrolled in both courses. The adjacency is stored as a
+    dict-of-Counters, so only pairs that actually share students use memory.
+    """
+
+    def __init__(self):
+        self.adjacency = defaultdict(Counter) # {course_code: Counter({other_course: shared_students})}
+        self.enrollment = Counter() # {course_code: number_of_students}
+
+    @classmethod
+    def from_enrollments(cls, enrollments):
+        """Builds the graph from {student_id: [course_code, ...]} or an EnrollmentMatrix in one pass over the students."""
+        if isinstance(enrollments, EnrollmentMatrix):
+            return cls.from_matrix(enrollments)
+        graph = cls()
+        pair_counts = Counter()
+        for courses in enrollments.values():
+            courses = sorted(set(courses))
+            graph.enrollment.update(courses)
+            # Counter.update on an iterable counts in C, which keeps the per-student walk cheap
+            pair_counts.update(combinations(courses, 2))
+        adjacency = graph.adjacency
+        for (course1, course2), weight in pair_counts.items():
+            adjacency[course1][course2] = weight
+            adjacency[course2][course1] = weight
+        return graph
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Builds the graph from an EnrollmentMatrix, counting pairs on integer course codes."""
+        pair_counts = Counter()
+        for row in matrix.rows():
+            pair_counts.update(combinations(sorted(row), 2))
+        graph = cls()
+        codes = matrix.course_codes
+        for c, count in enumerate(matrix.course_counts()):
+            if count:
+                graph.enrollment[codes[c]] = count
+        adjacency = graph.adjacency
+        for (c1, c2), weight in pair_counts.items():
+            course1, course2 = codes[c1], codes[c2]
+            adjacency[course1][course2] = weight
+            adjacency[course2][course1] = weight
+        return graph
+
+    def add_student(self, courses, count=1):
+        """Adds (or with count=-1 removes) one student's course list to the edge weights."""
+        courses = set(courses)
+        if count < 0:
+            courses = sorted(courses)
+            for i, course1 in enumerate(courses):
+                self.enrollment[course1] += count
+                for course2 in courses[i + 1:]:
+                    self.add_edge(course1, course2, count)
+            return
+        # Fast path: weights only grow, so both directions can be bumped directly
+        self.enrollment.update(dict.fromkeys(courses, count))
+        adjacency = self.adjacency
+        for course1 in courses:
+            neighbours = adjacency[course1]
+            for course2 in courses:
+                if course2 != course1:
+                    neighbours[course2] += count
+
+    def add_edge(self, course1, course2, weight=1):
+        """Adjusts the weight of a single edge, dropping it when it reaches zero."""
+        adjacency = self.adjacency
+        new_weight = adjacency[course1][course2] + weight
+        if new_weight > 0:
+            adjacency[course1][course2] = new_weight
+            adjacency[course2][course1] = new_weight
+        else:
+            adjacency[course1].pop(course2, None)
+            adjacency[course2].pop(course1, None)
+
+    def weight(self, course1, course2):
+        """Number of students shared by the two courses (0 if they do not conflict)."""
+        neighbours = self.adjacency.get(course1)
+        return neighbours.get(course2, 0) if neighbours else 0
+
+    def neighbors(self, course_code):
+        """Returns {other_course: shared_students} for every course conflicting with course_code."""
+        return self.adjacency.get(course_code, {})
+
+    def degree(self, course_code):
+        return len(self.adjacency.get(course_code, ()))
+
+    @property
+    def courses(self):
+        """All courses with at least one enrolled student, sorted by code."""
+        return sorted(code for code, count in self.enrollment.items() if count > 0)
+
+    def edges(self):
+        """Yields (course1, course2, weight) once per conflicting pair, with course1 < course2."""
+        for course1, neighbours in self.adjacency.items():
+            for course2, weight in neighbours.items():
+                if course1 < course2:
+                    yield course1, course2, weight
+
+    def edge_count(self):
+        return sum(len(neighbours) for neighbours in self.adjacency.values()) // 2
+
+    def conflict_pairs(self):
+        """Returns the conflicting pairs as sorted (course1, course2) tuples."""
+        return sorted((course1, course2) for course1, course2, _ in self.edges())
+
+    def to_conflict_strings(self):
+        """Legacy "A & B" representation used by the DeepSeek prompt."""
+        return [f"{c1} & {c2}" for c1, c2 in self.conflict_pairs()]
+
+    def connected_components(self, courses=None, min_weight=1):
+        """Groups courses into connected components, ignoring edges lighter than min_weight.
+
+        With min_weight > 1 this yields "near-components" joined only by a few
+        shared students. Components keep the order of `courses` (default: sorted codes).
+        """
+        courses = self.courses if courses is None else list(courses)
+        selected = set(courses)
+        order = {code: i for i, code in enumerate(courses)}
+        seen = set()
+        components = []
+        for course in courses:
+            if course in seen:
+                continue
+            component = []
+            stack = [course]
+            seen.add(course)
+            while stack:
+                current = stack.pop()
+                component.append(current)
+                for other, weight in self.neighbors(current).items():
+                    if weight >= min_weight and other in selected and other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            components.append(sorted(component, key=order.get))
+        return components
+
+    def subgraph(self, courses):
+        """New graph restricted to the given courses."""
+        selected = set(courses)
+        graph = ConflictGraph()
+        for course in selected:
+            if self.enrollment.get(course):
+                graph.enrollment[course] = self.enrollment[course]
+            neighbours = {other: weight for other, weight in self.neighbors(course).items() if other in selected}
+            if neighbours:
+                graph.adjacency[course].update(neighbours)
+        return graph
+
+    def to_dict(self):
+        """JSON-serialisable form of the graph."""
+        return {
+            "enrollment": dict(self.enrollment),
+            "edges": [[c1, c2, w] for c1, c2, w in self.edges()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        graph = cls()
+        graph.enrollment.update(data.get("enrollment", {}))
+        for course1, course2, weight in data.get("edges", []):
+            graph.add_edge(course1, course2, weight)
+        return graph
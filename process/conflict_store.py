@@ -0,0 +1,231 @@
+"""Persisted conflict graph kept up to date from enrollment deltas.
+
+Triggers on CourseEnrollments append every insert/delete to the
+CourseEnrollmentChanges log. The store remembers the last log id it applied
+(the watermark), so a sync only reads newer log rows and adjusts the edge
+weights of the affected student's other courses, instead of re-reading the
+whole enrollment table and rebuilding every edge.
+
+The enrollments are persisted as the CSR EnrollmentMatrix arrays, which load
+as flat buffers. Changed students' rows are collected during a sync and
+patched into the matrix in one pass (EnrollmentMatrix.patched), which copies
+the unchanged runs of rows as array slices: a sync with changes still costs a
+memory copy proportional to the enrollment count, but no per-row Python work.
+
+The watermark is not exact. InnoDB hands out AUTO_INCREMENT log ids when a
+row is inserted, not when its transaction commits, so a transaction that
+logged a lower id can become visible after a sync has moved past it. Each
+sync therefore re-reads the last RESCAN_WINDOW log ids below the watermark
+too, and applies only the last logged operation per (student, course) pair,
+which apply_change() turns into a no-op when it is already applied. A change
+committed later than RESCAN_WINDOW newer log rows is still missed; delete
+the state file to force a full rebuild.
+
+The triggers need MySQL's TRIGGER privilege; they are created only if
+information_schema.TRIGGERS doesn't list them yet, since CREATE TRIGGER IF
+NOT EXISTS needs MySQL 8.0.29 or later.
+"""
+import os
+import pickle
+
+from mysql.connector import Error, errorcode
+
+from conflict_graph import ConflictGraph
+from enrollment_store import EnrollmentMatrix, stream_enrollments
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'conflict_graph.pickle')
+STATE_VERSION = 2
+RESCAN_WINDOW = 1000 # log ids below the watermark re-read by every sync
+
+CHANGE_LOG_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS CourseEnrollmentChanges (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        op CHAR(1) NOT NULL,
+        student_id VARCHAR(10) NOT NULL,
+        course_code VARCHAR(10) NOT NULL,
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+CHANGE_LOG_TRIGGERS = {
+    'CourseEnrollments_log_insert': """
+        CREATE TRIGGER CourseEnrollments_log_insert AFTER INSERT ON CourseEnrollments
+        FOR EACH ROW INSERT INTO CourseEnrollmentChanges (op, student_id, course_code)
+        VALUES ('I', NEW.student_id, NEW.course_code)
+    """,
+    'CourseEnrollments_log_delete': """
+        CREATE TRIGGER CourseEnrollments_log_delete AFTER DELETE ON CourseEnrollments
+        FOR EACH ROW INSERT INTO CourseEnrollmentChanges (op, student_id, course_code)
+        VALUES ('D', OLD.student_id, OLD.course_code)
+    """,
+    'CourseEnrollments_log_update': """
+        CREATE TRIGGER CourseEnrollments_log_update AFTER UPDATE ON CourseEnrollments
+        FOR EACH ROW INSERT INTO CourseEnrollmentChanges (op, student_id, course_code)
+        VALUES ('D', OLD.student_id, OLD.course_code), ('I', NEW.student_id, NEW.course_code)
+    """
+}
+
+
+def ensure_change_log(conn):
+    """Creates the change log table and whichever of its triggers don't exist yet."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CHANGE_LOG_TABLE_DDL)
+        cursor.execute(
+            "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+            "WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE = 'CourseEnrollments'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        for name, statement in CHANGE_LOG_TRIGGERS.items():
+            if name in existing:
+                continue
+            try:
+                cursor.execute(statement)
+            except Error as e:
+                if e.errno != errorcode.ER_TRG_ALREADY_EXISTS: # created by a concurrent run
+                    raise
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+class ConflictGraphState:
+    """Conflict graph plus the CSR enrollment matrix needed to apply deltas."""
+
+    def __init__(self, graph=None, enrollments=None, watermark=0):
+        self.graph = graph or ConflictGraph()
+        self._matrix = enrollments if enrollments is not None else EnrollmentMatrix.from_pairs(())
+        self._changed = {} # {student_id: [course_code, ...]} rows not yet patched into the matrix
+        self.watermark = watermark # last CourseEnrollmentChanges.id applied
+
+    @property
+    def enrollments(self):
+        """EnrollmentMatrix of the current enrollments, patching in the rows changed since the last call."""
+        if self._changed:
+            self._matrix = self._matrix.patched(self._changed)
+            self._changed = {}
+        return self._matrix
+
+    def courses_of(self, student_id):
+        courses = self._changed.get(student_id)
+        return courses if courses is not None else self._matrix.courses_of(student_id)
+
+    def apply_change(self, op, student_id, course_code):
+        """Applies one insert ('I') or delete ('D'); repeated or stale changes are ignored."""
+        courses = self.courses_of(student_id)
+        graph = self.graph
+        if op == 'I':
+            if course_code in courses:
+                return False
+            for other in courses:
+                graph.add_edge(course_code, other, 1)
+            courses = courses + [course_code]
+            graph.enrollment[course_code] += 1
+        else:
+            if course_code not in courses:
+                return False
+            courses = [code for code in courses if code != course_code]
+            for other in courses:
+                graph.add_edge(course_code, other, -1)
+            graph.enrollment[course_code] -= 1
+        self._changed[student_id] = courses
+        return True
+
+    def save(self, state_file=STATE_FILE):
+        matrix = self.enrollments
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        tmp_file = state_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({
+                'version': STATE_VERSION,
+                'watermark': self.watermark,
+                'graph': self.graph.to_dict(),
+                'student_ids': matrix.student_ids,
+                'course_codes': matrix.course_codes,
+                'indptr': matrix.indptr,
+                'indices': matrix.indices
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, state_file)
+
+    @classmethod
+    def load(cls, state_file=STATE_FILE):
+        """Returns the persisted state, or None if there is none (or it is unreadable)."""
+        try:
+            with open(state_file, 'rb') as f:
+                data = pickle.load(f)
+        except (IOError, OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if data.get('version') != STATE_VERSION:
+            return None
+        matrix = EnrollmentMatrix(data['student_ids'], data['course_codes'], data['indptr'], data['indices'])
+        return cls(ConflictGraph.from_dict(data['graph']), matrix, data['watermark'])
+
+
+def _current_watermark(cursor):
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM CourseEnrollmentChanges")
+    return cursor.fetchone()[0]
+
+
+def rebuild_state(conn):
+    """Full rebuild from CourseEnrollments, recording the change log position first."""
+    cursor = conn.cursor()
+    try:
+        watermark = _current_watermark(cursor)
+    finally:
+        cursor.close()
+    # Changes logged between reading the watermark and the snapshot, and changes
+    # below it whose transactions commit after the snapshot, are picked up by the
+    # next sync; apply_change() ignores the ones already in the snapshot.
+    matrix = stream_enrollments(conn)
+    return ConflictGraphState(ConflictGraph.from_matrix(matrix), matrix, watermark)
+
+
+def apply_pending_changes(conn, state):
+    """Applies change log rows above the watermark, and late commits within RESCAN_WINDOW below it.
+
+    Only the last logged operation per (student, course) pair is applied (ids
+    of one pair are ordered like its commits, because the row lock serializes
+    them), so re-reading rows that are already applied changes nothing.
+    Returns the number of changes that altered the state.
+    """
+    cursor = conn.cursor(buffered=False)
+    latest = {}
+    try:
+        cursor.execute(
+            "SELECT id, op, student_id, course_code FROM CourseEnrollmentChanges WHERE id > %s ORDER BY id",
+            (max(state.watermark - RESCAN_WINDOW, 0),)
+        )
+        for change_id, op, student_id, course_code in cursor:
+            latest[(student_id, course_code)] = op
+            state.watermark = max(state.watermark, change_id)
+    finally:
+        cursor.close()
+    applied = 0
+    for (student_id, course_code), op in latest.items():
+        applied += state.apply_change(op, student_id, course_code)
+    return applied
+
+
+def sync_conflict_graph(conn, state=None, state_file=STATE_FILE):
+    """Returns an up-to-date ConflictGraphState, applying deltas to `state` or the persisted one.
+
+    Falls back to a full rebuild (creating the change log if needed) when there
+    is no usable saved state. Raises mysql.connector.Error if the change log
+    can't be read or created.
+    """
+    if state is None:
+        state = ConflictGraphState.load(state_file)
+    if state is None:
+        ensure_change_log(conn)
+        state = rebuild_state(conn)
+        changed = True
+    else:
+        before = state.watermark
+        applied = apply_pending_changes(conn, state)
+        changed = applied > 0 or state.watermark != before
+    if changed:
+        try:
+            state.save(state_file)
+        except (IOError, OSError):
+            pass # the next run just replays more of the log
+    return state
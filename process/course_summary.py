@@ -0,0 +1,203 @@
+"""Course summary query, its on-disk cache and a before/after timing report.
+
+Usage (timing report): python process/course_summary.py [--repeat N]
+"""
+import os
+import json
+import tempfile
+import time
+from decimal import Decimal
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'course_summary.json')
+
+# Original query: joining both detail tables before grouping multiplies rows
+# (marks x enrollments per course), and inflates enrollment_count.
+LEGACY_SUMMARY_QUERY = """
+    SELECT
+        c.course_code,
+        c.course_name,
+        c.academic_level,
+        COUNT(ce.student_id) AS enrollment_count,
+        ROUND(AVG(sm.total), 1) as average_total
+    FROM Courses c
+    LEFT JOIN StudentMarks sm ON c.course_code = sm.course_code
+    LEFT JOIN CourseEnrollments ce ON c.course_code = ce.course_code
+    GROUP BY c.course_code, c.course_name, c.academic_level
+    ORDER BY average_total ASC;
+"""
+
+# Each detail table is aggregated on its own (one row per course), then joined
+SUMMARY_QUERY = """
+    SELECT
+        c.course_code,
+        c.course_name,
+        c.academic_level,
+        COALESCE(ce.enrollment_count, 0) AS enrollment_count,
+        sm.average_total
+    FROM Courses c
+    LEFT JOIN (
+        SELECT course_code, COUNT(*) AS enrollment_count
+        FROM CourseEnrollments
+        GROUP BY course_code
+    ) ce ON c.course_code = ce.course_code
+    LEFT JOIN (
+        SELECT course_code, ROUND(AVG(total), 1) AS average_total
+        FROM StudentMarks
+        GROUP BY course_code
+    ) sm ON c.course_code = sm.course_code
+    ORDER BY sm.average_total ASC;
+"""
+
+# Change detector for the three tables the summary depends on: row counts plus
+# an order-independent checksum of the columns the summary and the enrollment
+# load read, so UPDATEs (a changed mark, a renamed course) invalidate the cache
+# too, not just inserts and deletes. Each table is scanned once, without the
+# joins and grouping of the summary query.
+FINGERPRINT_QUERY = """
+    SELECT 'Courses' AS table_name, COUNT(*) AS row_count,
+           BIT_XOR(CRC32(CONCAT_WS('|', course_code, course_name, academic_level))) AS checksum
+    FROM Courses
+    UNION ALL
+    SELECT 'CourseEnrollments', COUNT(*), BIT_XOR(CRC32(CONCAT_WS('|', student_id, course_code)))
+    FROM CourseEnrollments
+    UNION ALL
+    SELECT 'StudentMarks', COUNT(*), BIT_XOR(CRC32(CONCAT_WS('|', student_id, course_code, total)))
+    FROM StudentMarks;
+"""
+
+
+def _json_value(value):
+    """Converts DECIMAL/DATETIME values from MySQL into JSON-friendly types."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if value is not None and not isinstance(value, (int, float, str)):
+        return str(value)
+    return value
+
+
+def fetch_fingerprint(cursor):
+    """Returns {table: [row_count, checksum]} for the summary's source tables."""
+    cursor.execute(FINGERPRINT_QUERY)
+    return {row[0]: [_json_value(row[1]), _json_value(row[2])] for row in cursor.fetchall()}
+
+
+def fetch_summary(cursor, query=SUMMARY_QUERY):
+    """Runs the summary query and returns {course_code: details}, hardest (lowest average) first."""
+    cursor.execute(query)
+    summary = {}
+    for course_code, course_name, level, enrollment_count, average_total in cursor.fetchall():
+        summary[course_code] = {
+            'average_total': _json_value(average_total),
+            'level': level,
+            'name': course_name,
+            'enrollment': enrollment_count if enrollment_count else 0
+        }
+    return summary
+
+
+def load_cached_summary(fingerprint, cache_file=CACHE_FILE):
+    """Returns the cached summary if it was computed for the same fingerprint, else None."""
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if cached.get('fingerprint') != fingerprint:
+        return None
+    return cached.get('summary')
+
+
+def save_cached_summary(fingerprint, summary, cache_file=CACHE_FILE):
+    """Writes the summary cache atomically; failures only cost a cache miss next time."""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        # A unique temporary name, so concurrent runs never write the same file
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(cache_file), suffix='.tmp', delete=False) as f:
+            json.dump({'fingerprint': fingerprint, 'summary': summary}, f)
+        os.replace(f.name, cache_file)
+    except (IOError, OSError):
+        pass
+
+
+def get_summary(conn, use_cache=True):
+    """Returns (summary, cache_hit) using the fingerprint-keyed cache when possible."""
+    cursor = conn.cursor()
+    try:
+        fingerprint = fetch_fingerprint(cursor) if use_cache else None
+        if use_cache:
+            summary = load_cached_summary(fingerprint)
+            if summary is not None:
+                return summary, True
+        summary = fetch_summary(cursor)
+        if use_cache and summary:
+            save_cached_summary(fingerprint, summary)
+        return summary, False
+    finally:
+        cursor.close()
+
+
+def _handler_reads(cursor):
+    """Total InnoDB handler row reads for this session (rows examined)."""
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(value) for _, value in cursor.fetchall())
+
+
+def _measure(conn, func, repeat):
+    cursor = conn.cursor()
+    try:
+        best = float('inf')
+        rows_read = 0
+        result = None
+        for _ in range(repeat):
+            before = _handler_reads(cursor)
+            started = time.perf_counter()
+            result = func(cursor)
+            elapsed = time.perf_counter() - started
+            rows_read = _handler_reads(cursor) - before
+            best = min(best, elapsed)
+        return {'seconds': round(best, 6), 'rows_read': rows_read}, result
+    finally:
+        cursor.close()
+
+
+def timing_report(conn, repeat=3):
+    """Compares the legacy query, the pre-aggregated query and a cache hit.
+
+    Row counts come from the session Handler_read* counters, so they reflect
+    the rows the server actually touched for each variant.
+    """
+    legacy, legacy_summary = _measure(conn, lambda c: fetch_summary(c, LEGACY_SUMMARY_QUERY), repeat)
+    aggregated, summary = _measure(conn, fetch_summary, repeat)
+
+    cursor = conn.cursor()
+    try:
+        save_cached_summary(fetch_fingerprint(cursor), summary)
+    finally:
+        cursor.close()
+    cached, _ = _measure(conn, lambda c: load_cached_summary(fetch_fingerprint(c)), repeat)
+
+    inflated = sorted(code for code, details in summary.items()
+                      if code in legacy_summary and legacy_summary[code]['enrollment'] != details['enrollment'])
+    return {
+        'legacy_query': legacy,
+        'preaggregated_query': aggregated,
+        'cache_hit': cached,
+        'courses': len(summary),
+        'courses_with_inflated_enrollment_in_legacy': inflated
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import mysql.connector
+    import config
+
+    parser = argparse.ArgumentParser(description="Course summary timing report.")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**config.DB_CONFIG)
+    try:
+        print(json.dumps(timing_report(conn, args.repeat), indent=4))
+    finally:
+        conn.close()
@@ -0,0 +1,58 @@
+import time
+from contextlib import contextmanager
+
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+import config
+
+DB_CONFIG = getattr(config, 'DB_CONFIG', None)
+DB_POOL_SIZE = getattr(config, 'DB_POOL_SIZE', 4)
+DB_POOL_TIMEOUT = getattr(config, 'DB_POOL_TIMEOUT', 10) # seconds to wait for a free connection
+
+_pool = None
+
+
+def get_pool():
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = pooling.MySQLConnectionPool(
+            pool_name="utas_schedule",
+            pool_size=DB_POOL_SIZE,
+            pool_reset_session=True,
+            **DB_CONFIG
+        )
+    return _pool
+
+
+def get_connection():
+    """Borrows a connection, waiting up to DB_POOL_TIMEOUT seconds if the pool is exhausted."""
+    deadline = time.monotonic() + DB_POOL_TIMEOUT
+    while True:
+        try:
+            return get_pool().get_connection()
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+@contextmanager
+def connection():
+    """Context manager yielding a pooled connection; closing it returns it to the pool."""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def borrow(conn=None):
+    """Yields conn if one is given, otherwise a pooled connection for the duration of the block."""
+    if conn is not None:
+        yield conn
+    else:
+        with connection() as pooled:
+            yield pooled
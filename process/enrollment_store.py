@@ -0,0 +1,194 @@
+from array import array
+from functools import cached_property
+
+FETCH_BATCH_SIZE = 10000 # rows per fetchmany() call when streaming enrollments
+
+
+class EnrollmentMatrix:
+    """Student x course enrollments in compressed sparse row (CSR) form.
+
+    Student IDs and course codes are interned into dense integer codes
+    (student_ids[i] / course_codes[j] give them back). The courses of student i
+    are indices[indptr[i]:indptr[i + 1]], stored as unsigned int arrays, so a
+    whole institution fits in a few bytes per enrollment.
+    """
+
+    def __init__(self, student_ids, course_codes, indptr, indices):
+        self.student_ids = student_ids
+        self.course_codes = course_codes
+        self.indptr = indptr
+        self.indices = indices
+
+    # The ID -> integer code maps are built on first lookup, not for every loaded matrix
+    @cached_property
+    def student_index(self):
+        return {sid: i for i, sid in enumerate(self.student_ids)}
+
+    @cached_property
+    def course_index(self):
+        return {code: j for j, code in enumerate(self.course_codes)}
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """Builds the matrix from an iterable of (student_id, course_code) rows in any order."""
+        student_index = {}
+        course_index = {}
+        row_students = array('I')
+        row_courses = array('I')
+        for student_id, course_code in pairs:
+            s = student_index.get(student_id)
+            if s is None:
+                s = student_index[student_id] = len(student_index)
+            c = course_index.get(course_code)
+            if c is None:
+                c = course_index[course_code] = len(course_index)
+            row_students.append(s)
+            row_courses.append(c)
+        return cls._from_coordinates(list(student_index), list(course_index), row_students, row_courses)
+
+    @classmethod
+    def from_mapping(cls, enrollments):
+        """Builds the matrix from {student_id: [course_code, ...]}."""
+        return cls.from_pairs((sid, code) for sid, courses in enrollments.items() for code in courses)
+
+    @classmethod
+    def _from_coordinates(cls, student_ids, course_codes, row_students, row_courses):
+        # Counting sort of the (student, course) rows by student gives the CSR layout in O(rows)
+        num_students = len(student_ids)
+        indptr = array('I', [0]) * (num_students + 1)
+        for s in row_students:
+            indptr[s + 1] += 1
+        for i in range(num_students):
+            indptr[i + 1] += indptr[i]
+        fill = array('I', indptr[:-1])
+        indices = array('I', [0]) * len(row_courses)
+        for s, c in zip(row_students, row_courses):
+            indices[fill[s]] = c
+            fill[s] += 1
+        return cls(student_ids, course_codes, indptr, indices)
+
+    @property
+    def num_students(self):
+        return len(self.student_ids)
+
+    @property
+    def num_courses(self):
+        return len(self.course_codes)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def course_indexes(self, student):
+        """Integer course codes of the student with integer code `student`."""
+        return self.indices[self.indptr[student]:self.indptr[student + 1]]
+
+    def courses_of(self, student_id):
+        """Course codes of student_id (empty list if unknown)."""
+        s = self.student_index.get(student_id)
+        if s is None:
+            return []
+        return [self.course_codes[c] for c in self.course_indexes(s)]
+
+    def rows(self):
+        """Yields the integer course codes of every student, in student order."""
+        indptr = self.indptr
+        indices = self.indices
+        for s in range(len(self.student_ids)):
+            yield indices[indptr[s]:indptr[s + 1]]
+
+    def items(self):
+        """Yields (student_id, [course_code, ...]) like the old enrollment dict."""
+        course_codes = self.course_codes
+        for student_id, row in zip(self.student_ids, self.rows()):
+            yield student_id, [course_codes[c] for c in row]
+
+    def course_counts(self):
+        """Number of enrolled students per integer course code."""
+        counts = [0] * len(self.course_codes)
+        for c in self.indices:
+            counts[c] += 1
+        return counts
+
+    def to_numpy(self):
+        """Zero-copy (indptr, indices) NumPy views of the CSR arrays."""
+        import numpy as np # Only needed by the vectorised consumers
+        return np.frombuffer(self.indptr, dtype=np.uint32), np.frombuffer(self.indices, dtype=np.uint32)
+
+    def patched(self, changed_rows):
+        """A new matrix with the rows of some students replaced.
+
+        changed_rows is {student_id: [course_code, ...]}; unknown students are
+        appended and students left without courses are dropped. The runs of
+        unchanged rows are copied as whole array slices, so a patch costs one
+        memory copy of the CSR arrays plus Python work per changed student
+        rather than a rebuild of every row.
+        """
+        import numpy as np
+        indptr, indices = self.to_numpy()
+        num_students = self.num_students
+        student_index = self.student_index
+        student_ids = list(self.student_ids)
+        course_codes = list(self.course_codes)
+        course_index = dict(self.course_index)
+        replaced = {}
+        for student_id, courses in changed_rows.items():
+            row = []
+            for code in courses:
+                c = course_index.get(code)
+                if c is None:
+                    c = course_index[code] = len(course_codes)
+                    course_codes.append(code)
+                row.append(c)
+            s = student_index.get(student_id)
+            if s is None:
+                if not row:
+                    continue
+                s = len(student_ids)
+                student_ids.append(student_id)
+            replaced[s] = np.array(row, dtype=np.uint32)
+
+        lengths = np.zeros(len(student_ids), dtype=np.int64)
+        lengths[:num_students] = np.diff(indptr)
+        pieces = []
+        start = 0
+        for s in sorted(s for s in replaced if s < num_students):
+            pieces.append(indices[indptr[start]:indptr[s]])
+            pieces.append(replaced[s])
+            lengths[s] = len(replaced[s])
+            start = s + 1
+        pieces.append(indices[indptr[start]:indptr[num_students]])
+        for s in range(num_students, len(student_ids)):
+            pieces.append(replaced[s])
+            lengths[s] = len(replaced[s])
+
+        kept = lengths > 0
+        dropped = not kept.all()
+        if dropped:
+            student_ids = [sid for sid, keep in zip(student_ids, kept.tolist()) if keep]
+            lengths = lengths[kept]
+        new_indptr = np.zeros(len(student_ids) + 1, dtype=np.uint32)
+        new_indptr[1:] = np.cumsum(lengths)
+        new_indices = np.concatenate(pieces).astype(np.uint32, copy=False)
+        matrix = EnrollmentMatrix(student_ids, course_codes, array('I', new_indptr.tobytes()), array('I', new_indices.tobytes()))
+        matrix.course_index = course_index
+        if not dropped and len(student_ids) == num_students:
+            matrix.student_index = student_index # same students, same integer codes
+        return matrix
+
+
+def stream_enrollments(conn, batch_size=FETCH_BATCH_SIZE):
+    """Streams CourseEnrollments with an unbuffered tuple cursor into an EnrollmentMatrix."""
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute("SELECT student_id, course_code FROM CourseEnrollments")
+
+        def batches():
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+
+        return EnrollmentMatrix.from_pairs(batches())
+    finally:
+        cursor.close()
@@ -0,0 +1,147 @@
+"""Exam sessions and seat capacity.
+
+Each exam date is split into sessions (config.EXAM_SESSIONS, e.g. morning and
+afternoon), each with a number of seats; a slot is a (date, session) pair.
+Conflicting courses still never share a date, so students sit at most one exam
+a day, and the courses of one date must be packed into its sessions with every
+course's enrollment fitting in a single session: a bin-packing problem per day.
+
+SeatCapacity tracks the remaining seats of every slot while the solver places
+courses (best fit, O(sessions) per placement; sessions that fit equally well,
+such as unlimited ones, are balanced by the seats already used) and re-packs a day with first fit
+decreasing when online placement leaves it over capacity.
+"""
+
+DEFAULT_SESSIONS = {"Morning": None, "Afternoon": None} # None = unlimited seats
+
+
+def session_capacities(sessions):
+    """[(session, seats), ...] with unlimited sessions as float('inf')."""
+    sessions = sessions or DEFAULT_SESSIONS
+    return [(name, float('inf') if seats is None else seats) for name, seats in sessions.items()]
+
+
+def build_slots(available_dates, sessions=None):
+    """[[date, session], ...] for every available date, sessions in configured order."""
+    names = [name for name, _ in session_capacities(sessions)]
+    return [[exam_date, name] for exam_date in available_dates for name in names]
+
+
+def course_demand(course_summary, graph=None):
+    """Seats needed per course: its enrollment from the course summary (or the conflict graph)."""
+    demand = {code: details.get('enrollment') or 0 for code, details in course_summary.items()}
+    if graph is not None:
+        for code in graph.courses:
+            demand.setdefault(code, graph.enrollment.get(code, 0))
+    return demand
+
+
+def _best_fit(free, used, need):
+    """Session index with the fewest free seats that still fit need, else the emptiest one.
+
+    Ties (e.g. between unlimited sessions, whose free seats are always inf) go
+    to the session with the fewest seats used, so load is spread across them.
+    """
+    best = None
+    for i, seats in enumerate(free):
+        if seats >= need and (best is None or (seats, used[i]) < (free[best], used[best])):
+            best = i
+    if best is None:
+        best = max(range(len(free)), key=lambda i: (free[i], -used[i]))
+    return best
+
+
+def pack_day(courses, demand, sessions=None):
+    """First fit decreasing packing of one day's courses into sessions.
+
+    Returns ({session: [course, ...]}, seats_over_capacity).
+    """
+    capacities = session_capacities(sessions)
+    free = [seats for _, seats in capacities]
+    used = [0] * len(capacities)
+    packing = {name: [] for name, _ in capacities}
+    for course in sorted(courses, key=lambda c: (-demand.get(c, 0), c)):
+        i = _best_fit(free, used, demand.get(course, 0))
+        free[i] -= demand.get(course, 0)
+        used[i] += demand.get(course, 0)
+        packing[capacities[i][0]].append(course)
+    return packing, -sum(seats for seats in free if seats < 0)
+
+
+def pack_schedule(schedule, demand, sessions=None):
+    """Packs every date of a {date: [course, ...]} schedule.
+
+    Returns ({date: {session: [course, ...]}}, {date: seats_over_capacity} for the dates that don't fit).
+    """
+    packed = {}
+    over_capacity = {}
+    for exam_date, courses in schedule.items():
+        packed[exam_date], over = pack_day(courses, demand, sessions)
+        if over:
+            over_capacity[exam_date] = over
+    return packed, over_capacity
+
+
+class SeatCapacity:
+    """Remaining seats of every (day index, session) slot during solving."""
+
+    def __init__(self, num_days, sessions, demand):
+        capacities = session_capacities(sessions)
+        self.sessions = sessions
+        self.session_names = [name for name, _ in capacities]
+        self.capacities = [seats for _, seats in capacities]
+        self.largest = max(self.capacities)
+        self.demand = demand
+        self.free = [list(self.capacities) for _ in range(num_days)]
+        self.used = [[0] * len(self.capacities) for _ in range(num_days)]
+        self.placed = {} # course -> (day, session index)
+
+    def seats(self, course):
+        return self.demand.get(course, 0)
+
+    def fits(self, course, day):
+        """True if course can be seated in some session of day without exceeding it."""
+        placed = self.placed.get(course)
+        if placed is not None and placed[0] == day:
+            return True
+        return self.seats(course) <= max(self.free[day])
+
+    def add(self, course, day):
+        free = self.free[day]
+        i = _best_fit(free, self.used[day], self.seats(course))
+        free[i] -= self.seats(course)
+        self.used[day][i] += self.seats(course)
+        self.placed[course] = (day, i)
+
+    def remove(self, course):
+        day, i = self.placed.pop(course)
+        self.free[day][i] += self.seats(course)
+        self.used[day][i] -= self.seats(course)
+
+    def move(self, course, day):
+        self.remove(course)
+        self.add(course, day)
+
+    def overflow(self, day):
+        """Seats over capacity on day (0 when every session fits)."""
+        return -sum(seats for seats in self.free[day] if seats < 0)
+
+    def repack(self, day):
+        """Re-packs day with first fit decreasing; returns the seats still over capacity."""
+        courses = [course for course, (d, _) in self.placed.items() if d == day]
+        for course in courses:
+            self.remove(course)
+        for course in sorted(courses, key=lambda c: (-self.seats(c), c)):
+            self.add(course, day)
+        return self.overflow(day)
+
+    def oversized(self):
+        """Courses with more students than the largest session seats."""
+        return sorted(code for code, seats in self.demand.items() if seats > self.largest)
+
+    def sessions_by_day(self, available_dates):
+        """{date: {session: [course, ...]}} of the current placement."""
+        packed = {exam_date: {name: [] for name in self.session_names} for exam_date in available_dates}
+        for course, (day, i) in sorted(self.placed.items()):
+            packed[available_dates[day]][self.session_names[i]].append(course)
+        return packed
@@ -0,0 +1,280 @@
+"""Asynchronous schedule jobs: submit, poll, run in a background worker.
+
+Usage:
+    python process/job_queue.py submit <start_date> <end_date> [holidays] [--solver ...]  -> {"job_id": ...}
+    python process/job_queue.py status <job_id>
+    python process/job_queue.py publish <job_id>   (make a finished result the live schedule)
+    python process/job_queue.py worker [--idle-exit SECONDS]
+
+Submitting only inserts a row into a SQLite queue (process/cache/jobs.sqlite3)
+and returns, starting a worker in the background if none is alive, so the web
+request no longer waits for the DeepSeek call. A worker claims queued jobs one
+at a time (BEGIN IMMEDIATE, so several workers never take the same job), runs
+the pipeline and records each completed stage (dates, summary, enrollments,
+conflicts, solve). Everything the PHP pages need is written atomically to
+process/jobs/<job_id>.json: status, stages and, once finished, the result,
+so concurrent planners no longer overwrite each other's schedule_result.json.
+Jobs leave the StudentExamTimetable table alone; publishing a job copies its
+result to schedule_result.json and materializes its student timetables.
+
+Only the standard library is imported up front; the worker imports the
+pipeline when it starts.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import subprocess
+
+from schedule_client import build_arg_parser, args_to_payload, save_result, RESULT_FILE
+
+try:
+    import config
+except ImportError:
+    config = None
+
+PROCESS_DIR = os.path.dirname(os.path.abspath(__file__))
+QUEUE_FILE = os.path.join(PROCESS_DIR, 'cache', 'jobs.sqlite3')
+JOBS_DIR = os.path.join(PROCESS_DIR, 'jobs')
+JOB_POLL_INTERVAL = getattr(config, 'JOB_POLL_INTERVAL', 1.0) # seconds between queue checks of an idle worker
+JOB_WORKER_IDLE_EXIT = getattr(config, 'JOB_WORKER_IDLE_EXIT', 300) # seconds an auto-started worker waits for work
+HEARTBEAT_TIMEOUT = 30 # seconds without a heartbeat before a worker counts as gone
+
+USAGE = "Usage: python job_queue.py submit <start_date> <end_date> [holidays] [options] | status <job_id> | publish <job_id> | worker [--idle-exit SECONDS]"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+
+    def __init__(self, queue_file=QUEUE_FILE, jobs_dir=JOBS_DIR):
+        self.queue_file = queue_file
+        self.jobs_dir = jobs_dir
+        os.makedirs(os.path.dirname(queue_file), exist_ok=True)
+        os.makedirs(jobs_dir, exist_ok=True)
+        # Autocommit; the pipeline reports stages from its worker threads, so access is serialised by lock
+        self.conn = sqlite3.connect(queue_file, timeout=10, isolation_level=None, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                progress TEXT NOT NULL DEFAULT '[]',
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                worker_pid INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+            CREATE TABLE IF NOT EXISTS workers (
+                pid INTEGER PRIMARY KEY,
+                heartbeat REAL NOT NULL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def job_file(self, job_id):
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def submit(self, params):
+        """Queues a schedule request (args_to_payload() shape); returns the job ID."""
+        job_id = uuid.uuid4().hex
+        self.conn.execute("INSERT INTO jobs (id, params, status, created_at) VALUES (?, ?, 'queued', ?)",
+                          (job_id, json.dumps(params), time.time()))
+        self._write_job_file(job_id)
+        return job_id
+
+    def claim(self, pid):
+        """Marks the oldest queued job as running for worker pid; returns (job_id, params) or None."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT id, params FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self.conn.execute("UPDATE jobs SET status = 'running', started_at = ?, worker_pid = ? WHERE id = ?",
+                                  (time.time(), pid, row[0]))
+            self.conn.execute("COMMIT")
+        except sqlite3.Error:
+            self.conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        self._write_job_file(row[0])
+        return row[0], json.loads(row[1])
+
+    def record_stage(self, job_id, stage):
+        """Appends a completed pipeline stage with the seconds since the job started."""
+        with self.lock:
+            started_at, progress = self.conn.execute("SELECT started_at, progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            progress = json.loads(progress)
+            progress.append({"stage": stage, "seconds": round(time.time() - started_at, 3)})
+            self.conn.execute("UPDATE jobs SET stage = ?, progress = ? WHERE id = ?", (stage, json.dumps(progress), job_id))
+            self._write_job_file(job_id)
+
+    def finish(self, job_id, result):
+        """Stores the pipeline result; the job is "failed" if the result is an error."""
+        status = 'failed' if "error" in result else 'done'
+        self.conn.execute("UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?", (status, time.time(), job_id))
+        self._write_job_file(job_id, result)
+
+    def status(self, job_id):
+        """The job's file contents (status, stages and result when finished), or None if unknown."""
+        try:
+            with open(self.job_file(job_id)) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    def requeue_orphans(self):
+        """Puts running jobs whose worker process has died back in the queue; returns how many."""
+        orphans = [job_id for job_id, pid in self.conn.execute("SELECT id, worker_pid FROM jobs WHERE status = 'running'")
+                   if not _pid_alive(pid)]
+        for job_id in orphans:
+            self.conn.execute("UPDATE jobs SET status = 'queued', stage = NULL, progress = '[]', started_at = NULL, "
+                              "worker_pid = NULL WHERE id = ? AND status = 'running'", (job_id,))
+            self._write_job_file(job_id)
+        return len(orphans)
+
+    def heartbeat(self, pid):
+        self.conn.execute("INSERT OR REPLACE INTO workers (pid, heartbeat) VALUES (?, ?)", (pid, time.time()))
+
+    def unregister(self, pid):
+        self.conn.execute("DELETE FROM workers WHERE pid = ?", (pid,))
+
+    def worker_alive(self):
+        """True if some worker has sent a heartbeat recently and its process still exists."""
+        rows = self.conn.execute("SELECT pid FROM workers WHERE heartbeat > ?", (time.time() - HEARTBEAT_TIMEOUT,)).fetchall()
+        return any(_pid_alive(pid) for pid, in rows)
+
+    def _write_job_file(self, job_id, result=None):
+        """Writes the job's state to process/jobs/<job_id>.json atomically (readers never see half a file)."""
+        row = self.conn.execute(
+            "SELECT params, status, stage, progress, created_at, started_at, finished_at FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        params, status, stage, progress, created_at, started_at, finished_at = row
+        job = {"job_id": job_id, "status": status, "stage": stage, "progress": json.loads(progress),
+               "params": json.loads(params), "created_at": created_at, "started_at": started_at, "finished_at": finished_at}
+        if result is not None:
+            job["result"] = result
+        path = self.job_file(job_id)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(job, f, indent=4)
+        os.replace(path + '.tmp', path)
+
+
+def spawn_worker(idle_exit=JOB_WORKER_IDLE_EXIT):
+    """Starts a detached worker that exits after idle_exit seconds without jobs."""
+    command = [sys.executable, os.path.abspath(__file__), 'worker', '--idle-exit', str(idle_exit)]
+    with open(os.devnull, 'wb') as devnull:
+        subprocess.Popen(command, cwd=os.path.dirname(PROCESS_DIR), stdin=devnull, stdout=devnull, stderr=devnull,
+                         start_new_session=True)
+
+
+def run_job(queue, job_id, params):
+    """Runs one claimed job through the pipeline, recording its stages and result."""
+    import process_schedule
+
+    try:
+        result = process_schedule.run_pipeline(
+            params["start_date"], params["end_date"], params.get("holidays", ""),
+            solver=params.get("solver", "local"), refine=params.get("refine", False),
+            use_summary_cache=params.get("use_summary_cache", True),
+            optimize=params.get("optimize", 0), chains=params.get("chains"), trace=params.get("trace"),
+            progress=lambda stage: queue.record_stage(job_id, stage)
+        )
+    except Exception as e:
+        result = {"error": f"Schedule job failed: {e}"}
+    queue.finish(job_id, result)
+    return result
+
+
+def work(idle_exit=None, poll_interval=JOB_POLL_INTERVAL):
+    """Worker loop: runs queued jobs until idle for idle_exit seconds (forever if None)."""
+    pid = os.getpid()
+    queue = JobQueue()
+    queue.requeue_orphans()
+    idle_since = time.monotonic()
+    try:
+        while True:
+            queue.heartbeat(pid)
+            job = queue.claim(pid)
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    return 0
+                time.sleep(poll_interval)
+                continue
+            run_job(queue, *job)
+            idle_since = time.monotonic()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        queue.unregister(pid)
+        queue.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else None
+
+    if command == 'worker':
+        idle_exit = None
+        if '--idle-exit' in argv:
+            idle_exit = float(argv[argv.index('--idle-exit') + 1])
+        return work(idle_exit)
+
+    if command == 'submit' and len(argv) >= 3:
+        params = args_to_payload(build_arg_parser().parse_args(argv[1:]))
+        queue = JobQueue()
+        try:
+            job_id = queue.submit(params)
+            if not queue.worker_alive():
+                spawn_worker()
+        finally:
+            queue.close()
+        print(json.dumps({"job_id": job_id}))
+        return 0
+
+    if command in ('status', 'publish') and len(argv) == 2:
+        queue = JobQueue()
+        try:
+            job = queue.status(argv[1])
+        finally:
+            queue.close()
+        if job is None:
+            print(json.dumps({"error": f"Unknown job {argv[1]}"}))
+            return 1
+        if command == 'status':
+            print(json.dumps(job))
+            return 0
+        if "result" not in job:
+            print(json.dumps({"error": f"Job {argv[1]} has not finished ({job['status']})."}))
+            return 1
+        result = job["result"]
+        if "error" not in result:
+            import process_schedule
+            result = process_schedule.publish_schedule(result)
+        save_result(result, RESULT_FILE)
+        return 0
+
+    print(json.dumps({"error": USAGE}))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""SQLite cache for DeepSeek responses.
+
+Entries are keyed by a SHA-256 of the request (endpoint, model, parameters
+and messages), expire after a TTL and are evicted least-recently-used once the
+cache holds more than max_entries. Hit/miss counters are kept in the same file.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'llm_cache.sqlite3')
+
+
+def make_key(api_url, payload):
+    """Content address of a request: identical prompts and parameters share a key."""
+    canonical = json.dumps({"url": api_url, "payload": payload}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+
+    def __init__(self, cache_file=CACHE_FILE, ttl=86400, max_entries=500):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        self.conn = sqlite3.connect(cache_file, timeout=10)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+
+    def _bump(self, name):
+        self.conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, key):
+        """Returns the cached response (decoded JSON) or None, updating the counters."""
+        now = time.time()
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._bump('misses')
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._bump('hits')
+        return json.loads(row[0])
+
+    def put(self, key, response):
+        """Stores a response and evicts expired and least-recently-used entries."""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now)
+            )
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self.conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def stats(self):
+        """{"hits", "misses", "entries"} for reporting in the result JSON."""
+        counters = dict(self.conn.execute("SELECT name, value FROM stats").fetchall())
+        entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": counters.get('hits', 0), "misses": counters.get('misses', 0), "entries": entries}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,110 @@
+"""Pooled HTTP client for the DeepSeek chat completions API.
+
+One requests.Session per process keeps TLS connections alive between calls
+(the connection pool is sized for the concurrent sub-requests and candidates).
+Connection errors, 429 and 5xx answers are retried with exponential backoff and
+jitter, honouring Retry-After. With stream=True the completion is read as
+server-sent events and on_line(line) is called for each finished line of the
+answer, so the caller can parse the schedule while the model is still writing;
+the assembled response has the same shape as a non-streamed one (and is what
+gets cached).
+"""
+import json
+import time
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class DeepSeekClient:
+
+    def __init__(self, api_url, api_key, timeout=45, max_retries=3, backoff=1.0, max_backoff=20.0, pool_size=4):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def _delay(self, attempt, response=None):
+        """Seconds to wait before retry number attempt (0-based)."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * (0.5 + random.random() / 2)
+
+    def _post(self, payload, stream, stats):
+        """POSTs payload, retrying connection errors and retryable statuses; returns the response."""
+        attempt = 0
+        stats["retries"] = 0
+        while True:
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._delay(attempt))
+            else:
+                if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._delay(attempt, response)
+                response.content # reading the error body releases the connection back to the pool
+                time.sleep(delay)
+            attempt += 1
+            stats["retries"] = attempt
+
+    def complete(self, payload, stream=False, on_line=None, stats=None):
+        """Runs one chat completion; returns the decoded response ({"choices": [...], "usage": ...}).
+
+        stats (a dict) receives "retries" and, when streaming, "first_token_seconds".
+        Raises requests.exceptions.RequestException once the retries are exhausted.
+        """
+        stats = {} if stats is None else stats
+        if not stream:
+            return self._post(payload, False, stats).json()
+
+        # Without include_usage the streamed events carry no token counts
+        response = self._post(dict(payload, stream=True, stream_options={"include_usage": True}), True, stats)
+        content = []
+        pending = ""
+        usage = None
+        first_token = None
+        started = time.perf_counter()
+        with response:
+            for raw in response.iter_lines(decode_unicode=True):
+                if not raw or not raw.startswith('data:'):
+                    continue
+                data = raw[5:].strip()
+                if data == '[DONE]':
+                    break
+                event = json.loads(data)
+                usage = event.get('usage') or usage
+                for choice in event.get('choices') or []:
+                    text = (choice.get('delta') or {}).get('content')
+                    if not text:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    content.append(text)
+                    if on_line is not None:
+                        *lines, pending = (pending + text).split('\n')
+                        for line in lines:
+                            on_line(line)
+        if on_line is not None and pending:
+            on_line(pending)
+        stats["first_token_seconds"] = None if first_token is None else round(first_token, 3)
+        return {
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(content)}}],
+            "usage": usage or {}
+        }
@@ -0,0 +1,131 @@
+"""Local stand-in for the DeepSeek chat completions endpoint.
+
+Usage: python process/mock_deepseek.py [--port 8766] [--fail-first N] [--delay SECONDS] [--chunk-delay SECONDS]
+
+Point config.DEEPSEEK_API_URL at http://127.0.0.1:<port>/v1/chat/completions
+to exercise the client without an API key or network: the answer spreads the
+prompt's courses round-robin over its available dates (so it usually has
+conflicts for the repair step to fix), streamed as server-sent events when the
+request asks for it. The first --fail-first requests are answered with 503
+and a Retry-After header to exercise the retry/backoff path.
+"""
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from solver import COURSE_CODE
+
+AVAILABLE_DATES = re.compile(r'Available dates[^:]*are: ([0-9, -]+)\.')
+
+
+def mock_schedule(prompt, seed=0):
+    """'YYYY-MM-DD: A, B' lines placing the prompt's courses round-robin (shuffled by temperature seed)."""
+    match = AVAILABLE_DATES.search(prompt)
+    dates = [d.strip() for d in match.group(1).split(',')] if match else []
+    details = prompt.split("COURSE DETAILS", 1)[-1].split("SCHEDULING REQUIREMENTS", 1)[0]
+    courses = list(dict.fromkeys(COURSE_CODE.findall(details)))
+    random.Random(seed).shuffle(courses)
+    days = {d: [] for d in dates}
+    for i, course in enumerate(courses):
+        if dates:
+            days[dates[i % len(dates)]].append(course)
+    return "\n".join(f"{i + 1}. {d}: {', '.join(c)}" for i, (d, c) in enumerate(days.items()))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, like the real API
+    fail_first = 0
+    delay = 0.0
+    chunk_delay = 0.0
+    lock = threading.Lock()
+    requests_seen = 0
+
+    def _send(self, status, body, headers=()):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with self.lock:
+            MockHandler.requests_seen += 1
+            failing = MockHandler.requests_seen <= self.fail_first
+        if failing:
+            self._send(503, {"error": {"message": "Service temporarily unavailable"}}, [('Retry-After', '0')])
+            return
+        time.sleep(self.delay)
+        prompt = payload["messages"][-1]["content"]
+        content = mock_schedule(prompt, seed=int(payload.get("temperature", 0) * 100))
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+
+        if not payload.get("stream"):
+            self._send(200, {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}], "usage": usage})
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        pieces = re.findall(r'.{1,16}', content, re.S)
+        for piece in pieces:
+            event = {"choices": [{"index": 0, "delta": {"content": piece}}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n")
+            time.sleep(self.chunk_delay)
+        self._write_chunk(f"data: {json.dumps({'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n")
+        # Like the real API, a streamed answer reports usage (in a final event without choices) only on request
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            self._write_chunk(f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass # clients dropping idle keep-alive connections is expected
+
+
+def serve(port, fail_first=0, delay=0.0, chunk_delay=0.0):
+    """Starts the mock server in a background thread; returns it (call shutdown() to stop)."""
+    handler = type('ConfiguredMockHandler', (MockHandler,), {"fail_first": fail_first, "delay": delay, "chunk_delay": chunk_delay})
+    server = MockServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--fail-first', type=int, default=0)
+    parser.add_argument('--delay', type=float, default=0.0)
+    parser.add_argument('--chunk-delay', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    server = serve(args.port, args.fail_first, args.delay, args.chunk_delay)
+    print(f"Mock DeepSeek API on http://127.0.0.1:{args.port}/v1/chat/completions")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
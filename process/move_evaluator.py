@@ -0,0 +1,197 @@
+"""Incremental (delta) evaluation of schedule moves for local search.
+
+ScheduleState keeps each course's day, the courses on every day and the total
+student penalty of the assignment. The penalty is the one workload_metrics
+computes per student, expressed over conflict-graph edges: an edge of weight w
+between courses on days d1 and d2 costs w * penalty(|d1 - d2|), because w is
+exactly the number of students who sit both exams. The change caused by moving
+one course therefore only involves that course's edges, so move_delta() and
+swap_delta() run in O(degree) and moves are applied or undone in place.
+
+Given per-course target days (the solver's hardest-first spread), the cost
+also carries the solver's difficulty placement term, TARGET_PENALTY per day a
+course sits away from its target, so local search keeps harder courses early.
+"""
+from datetime import date
+
+from solver import PROXIMITY_PENALTY, TARGET_PENALTY
+from workload_metrics import CLASH_PENALTY
+
+
+def distance_penalties(max_distance=None):
+    """penalty[distance] for distance 0..max(PROXIMITY_PENALTY); larger distances cost nothing."""
+    max_distance = max(PROXIMITY_PENALTY) if max_distance is None else max_distance
+    penalty = [float(PROXIMITY_PENALTY.get(d, 0)) for d in range(max_distance + 1)]
+    penalty[0] = float(CLASH_PENALTY)
+    return penalty
+
+
+class ScheduleState:
+    """Mutable course -> day assignment with an incrementally maintained penalty.
+
+    Courses and days are addressed by integer index (course_codes[i],
+    available_dates[d]); day_ordinals holds each day's calendar ordinal so that
+    distances count calendar days, as in the solver and workload metrics.
+    targets (target day index per course, or None) adds the difficulty term.
+    """
+
+    def __init__(self, course_codes, available_dates, neighbours, weights, day, targets=None):
+        self.course_codes = list(course_codes)
+        self.available_dates = list(available_dates)
+        self.day_ordinals = [date.fromisoformat(d).toordinal() for d in self.available_dates]
+        self.penalties = distance_penalties()
+        self.max_distance = len(self.penalties) - 1
+        # Adjacency as parallel lists of integer neighbours and weights: the hot loops avoid dict lookups
+        self.neighbours = neighbours
+        self.weights = weights
+        self.day = list(day)
+        self.targets = list(targets) if targets is not None else None
+        self.day_courses = [set() for _ in self.available_dates]
+        for course, course_day in enumerate(self.day):
+            self.day_courses[course_day].add(course)
+        self.cost = self.full_cost()
+
+    @classmethod
+    def from_graph(cls, graph, course_codes, available_dates, assignment, targets=None):
+        """Builds the state from a ConflictGraph, {course_code: day_index} and optional {course_code: target_day}."""
+        course_index = {code: i for i, code in enumerate(course_codes)}
+        neighbours = []
+        weights = []
+        for code in course_codes:
+            row = [(course_index[other], weight) for other, weight in graph.neighbors(code).items()
+                   if other in course_index]
+            neighbours.append([other for other, _ in row])
+            weights.append([weight for _, weight in row])
+        day = [assignment[code] for code in course_codes]
+        if targets is not None:
+            # Courses without a target (unknown to the summary) cost nothing where they start
+            targets = [targets.get(code, d) for code, d in zip(course_codes, day)]
+        return cls(course_codes, available_dates, neighbours, weights, day, targets)
+
+    @classmethod
+    def from_schedule(cls, graph, schedule, available_dates, targets=None):
+        """Builds the state from a {date: [course_code, ...]} schedule.
+
+        Courses are indexed in schedule order (dates ascending, each day's list
+        in order), which to_schedule() keeps.
+        """
+        day_index = {d: i for i, d in enumerate(available_dates)}
+        assignment = {code: day_index[d] for d in sorted(schedule) for code in schedule[d]}
+        return cls.from_graph(graph, list(assignment), available_dates, assignment, targets)
+
+    def _pair_penalty(self, day_a, day_b):
+        distance = abs(self.day_ordinals[day_a] - self.day_ordinals[day_b])
+        return self.penalties[distance] if distance <= self.max_distance else 0.0
+
+    def course_cost(self, course, day=None):
+        """Penalty of course's edges with course placed on day (default: its current day)."""
+        ordinal = self.day_ordinals[self.day[course] if day is None else day]
+        ordinals = self.day_ordinals
+        day_of = self.day
+        penalties = self.penalties
+        max_distance = self.max_distance
+        cost = 0.0
+        for other, weight in zip(self.neighbours[course], self.weights[course]):
+            distance = abs(ordinals[day_of[other]] - ordinal)
+            if distance <= max_distance:
+                cost += weight * penalties[distance]
+        return cost
+
+    def target_cost(self, course, day=None):
+        """Difficulty placement penalty of course on day (default: its current day); 0 without targets."""
+        if self.targets is None:
+            return 0.0
+        return TARGET_PENALTY * abs((self.day[course] if day is None else day) - self.targets[course])
+
+    def day_clash(self, course, day, ignore=None):
+        """Students of course with another exam on day (not counting course `ignore`)."""
+        day_of = self.day
+        return sum(weight for other, weight in zip(self.neighbours[course], self.weights[course])
+                   if day_of[other] == day and other != ignore)
+
+    def full_cost(self):
+        """Penalty recomputed from scratch (each edge counted once)."""
+        courses = range(len(self.course_codes))
+        return sum(self.course_cost(course) for course in courses) / 2 + sum(self.target_cost(course) for course in courses)
+
+    def move_delta(self, course, day):
+        """Cost change if course moved to day; O(degree)."""
+        if day == self.day[course]:
+            return 0.0
+        delta = self.course_cost(course, day) - self.course_cost(course)
+        if self.targets is not None:
+            delta += self.target_cost(course, day) - self.target_cost(course)
+        return delta
+
+    def swap_delta(self, course_a, course_b):
+        """Cost change if course_a and course_b exchanged days; O(degree(a) + degree(b))."""
+        day_a = self.day[course_a]
+        day_b = self.day[course_b]
+        if day_a == day_b:
+            return 0.0
+        delta = self.move_delta(course_a, day_b) + self.move_delta(course_b, day_a)
+        # Both deltas above treat the a-b edge as moving to distance 0, but a swap keeps its distance
+        weight = self.edge_weight(course_a, course_b)
+        if weight:
+            delta -= 2 * weight * (self.penalties[0] - self._pair_penalty(day_a, day_b))
+        return delta
+
+    def edge_weight(self, course_a, course_b):
+        neighbours = self.neighbours[course_a]
+        if len(neighbours) > len(self.neighbours[course_b]):
+            course_a, course_b = course_b, course_a
+            neighbours = self.neighbours[course_a]
+        for other, weight in zip(neighbours, self.weights[course_a]):
+            if other == course_b:
+                return weight
+        return 0
+
+    def apply_move(self, course, day, delta=None):
+        """Moves course to day and returns an undo token; pass delta if already computed."""
+        previous = self.day[course]
+        if delta is None:
+            delta = self.move_delta(course, day)
+        self.day_courses[previous].discard(course)
+        self.day_courses[day].add(course)
+        self.day[course] = day
+        self.cost += delta
+        return ('move', course, previous, delta)
+
+    def apply_swap(self, course_a, course_b, delta=None):
+        """Exchanges the days of two courses and returns an undo token."""
+        if delta is None:
+            delta = self.swap_delta(course_a, course_b)
+        day_a = self.day[course_a]
+        day_b = self.day[course_b]
+        self.day_courses[day_a].discard(course_a)
+        self.day_courses[day_b].discard(course_b)
+        self.day_courses[day_b].add(course_a)
+        self.day_courses[day_a].add(course_b)
+        self.day[course_a] = day_b
+        self.day[course_b] = day_a
+        self.cost += delta
+        return ('swap', course_a, course_b, delta)
+
+    def undo(self, token):
+        """Reverts the move or swap that returned token."""
+        kind, first, second, delta = token
+        if kind == 'swap':
+            self.apply_swap(first, second, -delta)
+        else:
+            self.apply_move(first, second, -delta)
+
+    def clashes(self):
+        """Number of students with two exams on the same day."""
+        return sum(w for course, day in enumerate(self.day)
+                   for other, w in zip(self.neighbours[course], self.weights[course])
+                   if other > course and self.day[other] == day)
+
+    def to_schedule(self):
+        """{date: [course_code, ...]} with every available date present.
+
+        Each day lists its courses in course index order, so for a state built by
+        from_schedule() they keep the original (hardest-first) order; a moved
+        course takes its original overall position among the day's courses.
+        """
+        return {d: [self.course_codes[c] for c in sorted(courses)]
+                for d, courses in zip(self.available_dates, self.day_courses)}
@@ -0,0 +1,274 @@
+"""Simulated annealing with a tabu list, run as parallel independent chains.
+
+Starting from a schedule (the local solver's or the LLM's), each chain makes
+random moves (course -> other day) and swaps (two courses exchange days),
+evaluated incrementally by move_evaluator.ScheduleState. Moves that would add
+a same-day clash are rejected outright, so a conflict-free start stays
+conflict-free, as are moves that leave no session able to seat the
+course (exam_slots); other moves are accepted by the Metropolis rule with a
+temperature that cools geometrically over the wall-clock budget. Recently moved
+courses are tabu for a few hundred iterations so a chain doesn't undo its own
+moves.
+
+Chains run on a multiprocessing pool and share nothing but the read-only
+conflict graph, published once in CSR form through shared memory (edge weights
+count the students sitting both exams, so it carries all the enrollment
+information the penalty needs). The best schedule of all chains is returned
+with each chain's convergence trace.
+
+Given target days (solver.spread_targets), the objective also includes the
+solver's difficulty placement term (see move_evaluator), and every day keeps
+its courses in the starting schedule's order.
+"""
+import os
+import math
+import time
+import random
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from exam_slots import SeatCapacity
+from move_evaluator import ScheduleState
+
+TABU_TENURE = 200 # iterations a moved course stays fixed
+SWAP_PROBABILITY = 0.3
+FINAL_TEMPERATURE_RATIO = 1e-3 # final temperature as a fraction of the initial one
+TRACE_INTERVAL = 0.25 # seconds between convergence trace points
+TIME_CHECK_EVERY = 256 # iterations between clock reads
+
+
+def initial_temperature(state, rng, samples=500):
+    """Temperature at which a typical uphill (non-clashing) move is accepted half the time."""
+    num_courses = len(state.course_codes)
+    num_days = len(state.day_courses)
+    uphill = []
+    for _ in range(samples):
+        course = rng.randrange(num_courses)
+        day = rng.randrange(num_days)
+        if day != state.day[course] and not state.day_clash(course, day):
+            delta = state.move_delta(course, day)
+            if delta > 0:
+                uphill.append(delta)
+    if not uphill:
+        return 1.0
+    uphill.sort()
+    return uphill[len(uphill) // 2] / math.log(2)
+
+
+def seat_capacity(day, num_days, sessions, demand):
+    """SeatCapacity for a course -> day index list (demand keyed by course index), packed largest first."""
+    seats = SeatCapacity(num_days, sessions, demand)
+    for course in sorted(range(len(day)), key=lambda c: -demand.get(c, 0)):
+        seats.add(course, day[course])
+    return seats
+
+
+def _try_swap_seats(seats, course, other, course_day, other_day):
+    """Re-seats two courses on each other's days if both fit; leaves seats unchanged otherwise."""
+    seats.remove(course)
+    seats.remove(other)
+    if seats.fits(course, other_day):
+        seats.add(course, other_day)
+        if seats.fits(other, course_day):
+            seats.add(other, course_day)
+            return True
+        seats.remove(course)
+    seats.add(course, course_day)
+    seats.add(other, other_day)
+    return False
+
+
+def run_chain(state, budget, seed=0, max_per_day=None, tabu_tenure=TABU_TENURE,
+              swap_probability=SWAP_PROBABILITY, trace_interval=TRACE_INTERVAL, seats=None):
+    """Anneals state in place for `budget` seconds (seats: SeatCapacity keyed by course index).
+
+    Returns {"best_cost", "best_day", "iterations", "accepted", "trace"}, where
+    trace is a list of [elapsed_seconds, current_cost, best_cost].
+    """
+    rng = random.Random(seed)
+    num_courses = len(state.course_codes)
+    num_days = len(state.day_courses)
+    day_of = state.day
+    day_courses = state.day_courses
+    tabu_until = [0] * num_courses
+
+    start_temperature = initial_temperature(state, rng)
+    final_temperature = start_temperature * FINAL_TEMPERATURE_RATIO
+    temperature = start_temperature
+    best_cost = state.cost
+    best_day = list(day_of)
+    trace = [[0.0, state.cost, best_cost]]
+
+    started = time.perf_counter()
+    deadline = started + budget
+    next_trace = started + trace_interval
+    iteration = 0
+    accepted = 0
+    while num_courses and num_days > 1:
+        iteration += 1
+        if iteration % TIME_CHECK_EVERY == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            temperature = start_temperature * (final_temperature / start_temperature) ** ((now - started) / budget)
+            if now >= next_trace:
+                trace.append([round(now - started, 3), state.cost, best_cost])
+                next_trace = now + trace_interval
+
+        course = rng.randrange(num_courses)
+        if tabu_until[course] > iteration:
+            continue
+        current = day_of[course]
+        if rng.random() < swap_probability:
+            other = rng.randrange(num_courses)
+            other_day = day_of[other]
+            if other_day == current or tabu_until[other] > iteration:
+                continue
+            # Hard constraint: a swap may not add same-day clashes
+            if (state.day_clash(course, other_day, ignore=other) > state.day_clash(course, current)
+                    or state.day_clash(other, current, ignore=course) > state.day_clash(other, other_day)):
+                continue
+            delta = state.swap_delta(course, other)
+            if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                continue
+            if seats is not None and not _try_swap_seats(seats, course, other, current, other_day):
+                continue
+            state.apply_swap(course, other, delta)
+            tabu_until[other] = iteration + tabu_tenure
+        else:
+            day = rng.randrange(num_days)
+            if day == current or (max_per_day is not None and len(day_courses[day]) >= max_per_day):
+                continue
+            if state.day_clash(course, day) > state.day_clash(course, current):
+                continue
+            if seats is not None and not seats.fits(course, day):
+                continue
+            delta = state.move_delta(course, day)
+            if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                continue
+            state.apply_move(course, day, delta)
+            if seats is not None:
+                seats.move(course, day)
+        tabu_until[course] = iteration + tabu_tenure
+        accepted += 1
+        if state.cost < best_cost - 1e-9:
+            best_cost = state.cost
+            best_day = list(day_of)
+
+    trace.append([round(time.perf_counter() - started, 3), state.cost, best_cost])
+    return {"best_cost": best_cost, "best_day": best_day, "iterations": iteration,
+            "accepted": accepted, "trace": trace}
+
+
+def adjacency_arrays(state):
+    """The state's adjacency as CSR NumPy arrays (indptr, indices, weights)."""
+    indptr = np.zeros(len(state.neighbours) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in state.neighbours])
+    indices = np.fromiter((o for row in state.neighbours for o in row), dtype=np.int32, count=indptr[-1])
+    weights = np.fromiter((w for row in state.weights for w in row), dtype=np.int64, count=indptr[-1])
+    return indptr, indices, weights
+
+
+def _share(array):
+    """Copies array into a new shared memory block; returns (block, descriptor for workers)."""
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptor):
+    """Attaches a shared block; returns (block, typed memoryview of its elements, without a copy)."""
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    dtype = np.dtype(dtype)
+    return block, block.buf[:shape[0] * dtype.itemsize].cast(dtype.char)
+
+
+def _chain_worker(task):
+    """Pool worker: runs one chain on views of the shared CSR arrays, closing them once it finishes."""
+    attached = [_attach(descriptor) for descriptor in task[0]]
+    try:
+        return _run_shared_chain([view for _, view in attached], *task[1:])
+    except BaseException as e:
+        # The traceback's frames hold row views, which would keep the blocks from closing
+        traceback.clear_frames(e.__traceback__)
+        raise
+    finally:
+        for block, view in attached:
+            view.release()
+            block.close()
+
+
+def _run_shared_chain(views, course_codes, available_dates, day, targets, budget, seed, max_per_day, sessions, demand):
+    """Rebuilds the state with rows sliced from the shared views (iterated as ints) and runs one chain."""
+    indptr, indices, weights = views
+    neighbours = [indices[indptr[i]:indptr[i + 1]] for i in range(len(course_codes))]
+    edge_weights = [weights[indptr[i]:indptr[i + 1]] for i in range(len(course_codes))]
+    state = ScheduleState(course_codes, available_dates, neighbours, edge_weights, day, targets)
+    seats = seat_capacity(day, len(available_dates), sessions, demand) if sessions else None
+    result = run_chain(state, budget, seed, max_per_day, seats=seats)
+    result["seed"] = seed
+    return result
+
+
+def optimize_schedule(schedule, available_dates, graph, budget, chains=None, workers=None,
+                      max_per_day=None, seed=0, sessions=None, demand=None, targets=None):
+    """Improves a schedule with `chains` annealing chains within `budget` seconds of wall-clock time.
+
+    With sessions ({session: seats}) and demand ({course_code: seats}) every
+    date's courses must stay packable into its sessions. targets ({course_code:
+    target day index}) adds the difficulty placement term to the costs.
+    Returns {"schedule", "sessions", "initial_cost", "best_cost", "clashes", "chains": [...]}
+    where each chain entry has its seed, iteration counts and convergence trace.
+    """
+    state = ScheduleState.from_schedule(graph, schedule, available_dates, targets)
+    initial_cost = state.cost
+    # Seat demand by course index, as the chains address courses
+    demand = {i: (demand or {}).get(code, 0) for i, code in enumerate(state.course_codes)} if sessions else None
+    workers = workers or os.cpu_count() or 1
+    chains = chains or workers
+    # Chains beyond the worker count run in later rounds; split the budget so the total still fits
+    rounds = math.ceil(chains / workers)
+    chain_budget = budget / rounds
+
+    if chains == 1:
+        seats = seat_capacity(state.day, len(available_dates), sessions, demand) if sessions else None
+        results = [run_chain(state, chain_budget, seed, max_per_day, seats=seats)]
+        results[0]["seed"] = seed
+    else:
+        blocks = []
+        try:
+            shared = []
+            for array in adjacency_arrays(state):
+                block, descriptor = _share(array)
+                blocks.append(block)
+                shared.append(descriptor)
+            tasks = [(shared, state.course_codes, state.available_dates, state.day, state.targets, chain_budget,
+                      seed + i, max_per_day, sessions, demand) for i in range(chains)]
+            with multiprocessing.get_context().Pool(min(workers, chains)) as pool:
+                results = pool.map(_chain_worker, tasks)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    best = min(results, key=lambda r: r["best_cost"])
+    best_state = ScheduleState(state.course_codes, state.available_dates, state.neighbours, state.weights, best["best_day"],
+                               state.targets)
+    packed = None
+    if sessions:
+        seats = seat_capacity(best["best_day"], len(available_dates), sessions, demand)
+        packed = {exam_date: {name: [state.course_codes[c] for c in courses] for name, courses in day_sessions.items()}
+                  for exam_date, day_sessions in seats.sessions_by_day(state.available_dates).items()}
+    return {
+        "schedule": best_state.to_schedule(),
+        "sessions": packed,
+        "initial_cost": initial_cost,
+        "best_cost": best_state.cost, # recomputed, free of accumulated rounding
+        "clashes": best_state.clashes(),
+        "budget": budget,
+        "chains": [{key: r[key] for key in ("seed", "iterations", "accepted", "best_cost", "trace")} for r in results]
+    }
@@ -0,0 +1,185 @@
+"""Per-stage instrumentation of the schedule pipeline.
+
+With tracing on (TRACE_PIPELINE in config.py, or --trace) run_pipeline records
+a span per stage: wall time, CPU time of the thread that ran it, the process's
+peak RSS when it ended and stage attributes such as rows fetched, conflict
+edges or DeepSeek tokens. The spans are dates; summary, enrollments (mode
+"full" or "incremental") and conflicts when the data is loaded rather than
+passed in warm; llm, select_candidate (several candidates) and repair for the
+DeepSeek solver, or solve and refine (--refine) for the local one; optimize
+(--optimize); and output, validate and workload for the structured result.
+The spans are returned under "trace" in the result and, with TRACE_LOG_FILE
+set, appended to that file one JSON line per span in OpenTelemetry's span
+shape (traceId, spanId, parentSpanId, name, start/end in Unix nanoseconds,
+typed attributes) for a collector or script to pick up.
+
+With tracing off the pipeline gets NULL_TRACER, whose span() hands back one
+shared no-op object, so each instrumented stage costs a method call.
+"""
+import sys
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError: # not available on Windows: spans have no peak RSS there
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2 ** 20 if sys.platform == 'darwin' else 1024), 1) # bytes on macOS, KB elsewhere
+
+
+class Span:
+    """One timed stage; set() adds attributes while it runs."""
+
+    def __init__(self, name, parent_id=None, attributes=None, cpu_clock=time.thread_time):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.cpu_clock = cpu_clock
+        self.start_unix = time.time()
+        self._started = time.perf_counter()
+        self._cpu_started = cpu_clock()
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.peak_rss_mb = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        self.wall_seconds = time.perf_counter() - self._started
+        self.cpu_seconds = self.cpu_clock() - self._cpu_started
+        self.peak_rss_mb = peak_rss_mb()
+
+    def to_dict(self, trace_start):
+        return {
+            "name": self.name,
+            "start_seconds": round(self.start_unix - trace_start, 6),
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "peak_rss_mb": self.peak_rss_mb,
+            "attributes": self.attributes
+        }
+
+    def to_otel(self, trace_id):
+        attributes = dict(self.attributes, wall_seconds=self.wall_seconds, cpu_seconds=self.cpu_seconds,
+                          peak_rss_mb=self.peak_rss_mb)
+        return {
+            "traceId": trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": f"schedule.{self.name}",
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": int(self.start_unix * 1e9),
+            "endTimeUnixNano": int((self.start_unix + self.wall_seconds) * 1e9),
+            "attributes": [{"key": key, "value": _otel_value(value)} for key, value in attributes.items() if value is not None]
+        }
+
+
+def _otel_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)} # OTLP JSON encodes 64-bit integers as strings
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Collects the spans of one pipeline run; spans opened in worker threads hang off the root span."""
+    enabled = True
+
+    def __init__(self, name="pipeline"):
+        self.trace_id = uuid.uuid4().hex
+        self.root = Span(name, cpu_clock=time.process_time) # all threads' CPU
+        self.spans = []
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        stack = self._local.__dict__.setdefault('stack', [self.root])
+        span = Span(name, stack[-1].span_id, attributes)
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            stack.pop()
+            span.end()
+            with self.lock:
+                self.spans.append(span)
+
+    def annotate(self, **attributes):
+        """Adds attributes to the root span."""
+        self.root.set(**attributes)
+
+    def finish(self, **attributes):
+        """Ends the root span; returns the trace as a JSON-friendly dict."""
+        self.root.set(**attributes)
+        self.root.end()
+        trace_start = self.root.start_unix
+        return {
+            "trace_id": self.trace_id,
+            "wall_seconds": round(self.root.wall_seconds, 6),
+            "cpu_seconds": round(self.root.cpu_seconds, 6),
+            "peak_rss_mb": self.root.peak_rss_mb,
+            "attributes": self.root.attributes,
+            "spans": [span.to_dict(trace_start) for span in sorted(self.spans, key=lambda span: span.start_unix)]
+        }
+
+    def export(self, log_file):
+        """Appends the root span and every stage span to log_file as JSON lines. Returns an error message or None."""
+        lines = [json.dumps(span.to_otel(self.trace_id)) for span in [self.root] + self.spans]
+        try:
+            with open(log_file, 'a') as f:
+                f.write("\n".join(lines) + "\n")
+        except (IOError, OSError) as e:
+            return f"Could not write trace to {log_file}: {e}"
+        return None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullTracer:
+    """Stand-in used when tracing is off: every call is a no-op."""
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name, **attributes):
+        return self._span
+
+    def annotate(self, **attributes):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+def get_tracer(enabled):
+    """A new Tracer if enabled, else NULL_TRACER."""
+    return Tracer() if enabled else NULL_TRACER
@@ -1,7 +1,10 @@
 import sys
 import json
+import re
+import sqlite3
+import time
 from datetime import date, timedelta
-from collections import defaultdict # Import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import mysql.connector
 from mysql.connector import Error
 import requests # Requires installation: pip install requests
@@ -21,6 +24,80 @@ if not DB_CONFIG:
 
 # DeepSeek API Key
 DEEPSEEK_API_KEY = getattr(config, 'DEEPSEEK_API_KEY', None)
+# Endpoint (override in config.py to point at a local stub server)
+DEEPSEEK_API_URL = getattr(config, 'DEEPSEEK_API_URL', "https://api.deepseek.com/v1/chat/completions")
+
+# Local cache of DeepSeek responses (process/cache/llm_cache.sqlite3)
+LLM_CACHE_ENABLED = getattr(config, 'LLM_CACHE_ENABLED', True)
+LLM_CACHE_TTL = getattr(config, 'LLM_CACHE_TTL', 86400) # seconds
+LLM_CACHE_MAX_ENTRIES = getattr(config, 'LLM_CACHE_MAX_ENTRIES', 500)
+
+# Prompt size limits: larger problems are split into concurrent sub-requests
+LLM_PROMPT_TOKEN_BUDGET = getattr(config, 'LLM_PROMPT_TOKEN_BUDGET', 12000)
+LLM_MAX_OUTPUT_TOKENS = getattr(config, 'LLM_MAX_OUTPUT_TOKENS', 8192)
+LLM_MAX_CONCURRENT_REQUESTS = getattr(config, 'LLM_MAX_CONCURRENT_REQUESTS', 4)
+
+# DeepSeek HTTP client: timeout, retries of 429/5xx/connection errors (exponential
+# backoff from LLM_RETRY_BACKOFF seconds), streamed responses, and the number of
+# candidate schedules requested concurrently (the best-validated one is kept)
+LLM_REQUEST_TIMEOUT = getattr(config, 'LLM_REQUEST_TIMEOUT', 45)
+LLM_MAX_RETRIES = getattr(config, 'LLM_MAX_RETRIES', 3)
+LLM_RETRY_BACKOFF = getattr(config, 'LLM_RETRY_BACKOFF', 1.0)
+LLM_STREAM = getattr(config, 'LLM_STREAM', True)
+LLM_CANDIDATES = getattr(config, 'LLM_CANDIDATES', 1)
+LLM_TEMPERATURE = 0.4 # slightly lower temperature for a more deterministic schedule
+CANDIDATE_TEMPERATURE_STEP = 0.2 # each further candidate samples a little hotter
+
+# Keep the conflict graph persisted and apply enrollment deltas instead of rebuilding it every run
+INCREMENTAL_CONFLICT_GRAPH = getattr(config, 'INCREMENTAL_CONFLICT_GRAPH', True)
+
+# Local solver: per-day exam limit (None = unlimited) and the minimum number of
+# shared students for an edge to keep two courses in the same component
+MAX_EXAMS_PER_DAY = getattr(config, 'MAX_EXAMS_PER_DAY', None)
+SOLVER_MIN_COMPONENT_WEIGHT = getattr(config, 'SOLVER_MIN_COMPONENT_WEIGHT', 1)
+
+# Write each student's exams to StudentExamTimetable after every schedule
+MATERIALIZE_STUDENT_TIMETABLE = getattr(config, 'MATERIALIZE_STUDENT_TIMETABLE', True)
+
+# Exam sessions per date and their seats ({name: seats}, None = unlimited)
+EXAM_SESSIONS = getattr(config, 'EXAM_SESSIONS', {"Morning": None, "Afternoon": None})
+
+# Annealing chains for --optimize (None = one per CPU core)
+OPTIMIZER_CHAINS = getattr(config, 'OPTIMIZER_CHAINS', None)
+
+# Per-stage timing/memory spans under "trace" in the result (see pipeline_trace.py),
+# also appended as JSON lines to TRACE_LOG_FILE when set
+TRACE_PIPELINE = getattr(config, 'TRACE_PIPELINE', False)
+TRACE_LOG_FILE = getattr(config, 'TRACE_LOG_FILE', None)
+
+# Pipeline modules (they read config.py themselves, so import them after the checks above)
+import db
+import course_summary as summary_cache
+from conflict_graph import ConflictGraph
+from enrollment_store import stream_enrollments
+import conflict_store
+import llm_cache
+from llm_client import DeepSeekClient
+import prompt_builder
+from schedule_output import build_schedule_output
+import timetable_store
+import exam_slots
+from schedule_validator import validate_schedule
+from workload_metrics import schedule_workload
+from optimizer import optimize_schedule
+from solver import (solve_schedule, repair_schedule, format_schedule_text, parse_schedule_text, add_schedule_line,
+                    course_order, spread_targets)
+import pipeline_trace
+from pipeline_trace import NULL_TRACER
+
+_conflict_state = None # ConflictGraphState reused by long-running callers (schedule service)
+_llm_client = None # DeepSeekClient (keep-alive connection pool), created on first use
+
+# Stages reported to run_pipeline's progress callback (summary and enrollments load concurrently)
+PIPELINE_STAGES = ("dates", "summary", "enrollments", "conflicts", "solve")
+
+def _no_progress(stage):
+    pass
 
 def get_available_dates(start_date_str, end_date_str, holidays_str):
     """Calculates available exam dates, excluding Fridays and provided holidays."""
@@ -51,241 +128,556 @@ def get_available_dates(start_date_str, end_date_str, holidays_str):
     except Exception as e:
          return {"error": f"Error calculating dates: {str(e)}"}
 
-    return {"dates": available_dates}
+    return {"dates": available_dates, "slots": exam_slots.build_slots(available_dates, EXAM_SESSIONS)}
+
+def get_course_marks_summary(conn=None, use_cache=True):
+    """Fetches average marks and enrollment per course from the database.
 
-def get_course_marks_summary():
-    """Fetches average marks per course from the database."""
+    Enrollments and marks are aggregated separately before joining (see
+    summary_cache.SUMMARY_QUERY), and the result is reused from the on-disk
+    cache while the source tables' row counts and content checksums are unchanged.
+    Uses conn if given, otherwise borrows a connection from the shared pool.
+    """
     summary = {}
-    conn = None
-    cursor = None
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        if conn.is_connected():
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT 
-                    c.course_code, 
-                    c.course_name,
-                    c.academic_level,
-                    COUNT(ce.student_id) AS enrollment_count,
-                    ROUND(AVG(sm.total), 1) as average_total 
-                FROM Courses c
-                LEFT JOIN StudentMarks sm ON c.course_code = sm.course_code
-                LEFT JOIN CourseEnrollments ce ON c.course_code = ce.course_code
-                GROUP BY c.course_code, c.course_name, c.academic_level
-                ORDER BY average_total ASC; 
-            """) # Order by ASCENDING average total (hardest first)
-            results = cursor.fetchall()
-            for row in results:
-                 # Store more info: average, level, name, enrollment count
-                 summary[row['course_code']] = {
-                     'average_total': row['average_total'],
-                     'level': row['academic_level'],
-                     'name': row['course_name'],
-                     'enrollment': row['enrollment_count'] if row['enrollment_count'] else 0
-                 }
-            
+        with db.borrow(conn) as conn:
+            summary, cache_hit = summary_cache.get_summary(conn, use_cache=use_cache)
     except Error as e:
         return {"error": f"Database error fetching course summary: {e}"}
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
             
     if not summary:
          return {"error": "No course or marks data found in the database."}
          
-    return {"summary": summary}
+    return {"summary": summary, "cache_hit": cache_hit}
+
+def get_student_enrollments(conn=None):
+    """Fetches student enrollment data as an EnrollmentMatrix (CSR, integer-coded IDs).
 
-def get_student_enrollments():
-    """Fetches student enrollment data: {student_id: [course_code1, course_code2]}"""
-    enrollments = defaultdict(list)
-    conn = None
-    cursor = None
+    Rows are streamed with an unbuffered tuple cursor in fetchmany() batches, so
+    no per-row dicts or per-student lists are materialised.
+    """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        if conn.is_connected():
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT student_id, course_code FROM CourseEnrollments")
-            results = cursor.fetchall()
-            for row in results:
-                enrollments[row['student_id']].append(row['course_code'])
+        with db.borrow(conn) as conn:
+            enrollments = stream_enrollments(conn)
     except Error as e:
         return {"error": f"Database error fetching enrollments: {e}"}
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
 
-    if not enrollments:
+    if not len(enrollments):
          return {"error": "No student enrollment data found."}
          
-    return {"enrollments": dict(enrollments)} # Convert back to dict for JSON later if needed
+    return {"enrollments": enrollments}
+
+def get_enrollment_graph(conn=None, progress=None, tracer=NULL_TRACER):
+    """Fetches enrollments and their conflict graph: {"enrollments", "graph"} or {"error": ...}.
+
+    With INCREMENTAL_CONFLICT_GRAPH enabled the persisted graph is brought up to
+    date from the CourseEnrollmentChanges log; if that isn't possible (e.g. no
+    TRIGGER privilege) the enrollments are streamed and the graph rebuilt.
+    progress(stage) is called after the "enrollments" and "conflicts" stages.
+    The incremental sync is traced as one "enrollments" span (mode "incremental").
+    """
+    global _conflict_state
+    progress = progress or _no_progress
+    if INCREMENTAL_CONFLICT_GRAPH:
+        try:
+            with tracer.span("enrollments", mode="incremental") as span, db.borrow(conn) as conn:
+                _conflict_state = conflict_store.sync_conflict_graph(conn, _conflict_state)
+                if tracer.enabled:
+                    span.set(rows=len(_conflict_state.enrollments), edges=_conflict_state.graph.edge_count())
+            if len(_conflict_state.enrollments):
+                progress("enrollments")
+                progress("conflicts")
+                return {"enrollments": _conflict_state.enrollments, "graph": _conflict_state.graph}
+        except Error:
+            _conflict_state = None # fall through to a full rebuild
+
+    with tracer.span("enrollments", mode="full") as span:
+        enrollment_result = get_student_enrollments(conn)
+        if "error" in enrollment_result:
+            return enrollment_result
+        enrollments = enrollment_result["enrollments"]
+        span.set(rows=len(enrollments), students=enrollments.num_students)
+    progress("enrollments")
+    with tracer.span("conflicts") as span:
+        graph = find_conflicting_courses(enrollments)["graph"]
+        if tracer.enabled:
+            span.set(courses=len(graph.courses), edges=graph.edge_count())
+    progress("conflicts")
+    return {"enrollments": enrollments, "graph": graph}
+
+def fetch_course_data(use_summary_cache=True, progress=None, tracer=NULL_TRACER):
+    """Fetches the course summary and the enrollment graph concurrently over two pooled connections."""
+    progress = progress or _no_progress
+
+    def fetch_summary():
+        with tracer.span("summary") as span:
+            result = get_course_marks_summary(use_cache=use_summary_cache)
+            span.set(rows=len(result.get("summary", ())), cache_hit=result.get("cache_hit"))
+            return result
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        summary_future = executor.submit(fetch_summary)
+        summary_future.add_done_callback(lambda future: "error" not in future.result() and progress("summary"))
+        enrollment_future = executor.submit(get_enrollment_graph, progress=progress, tracer=tracer)
+        return summary_future.result(), enrollment_future.result()
 
 def find_conflicting_courses(enrollments):
-    """Identifies pairs of courses that share at least one student."""
-    course_pairs = defaultdict(set) # {course_code: {student1, student2}}
-    for student_id, courses in enrollments.items():
-        for course_code in courses:
-            course_pairs[course_code].add(student_id)
-
-    conflicts = set()
-    course_list = list(course_pairs.keys())
-
-    for i in range(len(course_list)):
-        for j in range(i + 1, len(course_list)):
-            course1 = course_list[i]
-            course2 = course_list[j]
-            # Check for intersection of student sets
-            if course_pairs[course1].intersection(course_pairs[course2]):
-                # Add the pair in a consistent order (alphabetical) to avoid duplicates
-                conflicts.add(tuple(sorted((course1, course2))))
-                
-    # Convert set of tuples to list of strings for the prompt
-    return {"conflicts": [f"{c1} & {c2}" for c1, c2 in conflicts]}
-
-def get_deepseek_suggestion(available_dates, course_summary, conflicts):
-    """Calls the DeepSeek API to get a schedule suggestion, considering conflicts."""
+    """Identifies pairs of courses that share at least one student.
+
+    Builds a weighted ConflictGraph by walking each student's course list once
+    (an inverted index from students to courses), instead of intersecting the
+    student sets of every pair of courses.
+    """
+    graph = ConflictGraph.from_enrollments(enrollments)
+    # "conflicts" keeps the legacy list of "A & B" strings
+    return {"conflicts": graph.to_conflict_strings(), "graph": graph}
+
+def get_deepseek_suggestion(available_dates, course_summary, graph, base_schedule=None, candidates=1):
+    """Calls the DeepSeek API to get a schedule suggestion, considering conflicts.
+
+    The prompt uses the most compact conflict encoding (see prompt_builder).
+    Problems whose prompt exceeds LLM_PROMPT_TOKEN_BUDGET are split into
+    independent sub-requests that run concurrently and are merged by date.
+    If base_schedule ({date: [course_code, ...]}) is given, it is included as a
+    conflict-free starting point for the model to review and refine.
+    With candidates > 1 that many schedules are requested concurrently (each at
+    a slightly higher temperature) and returned under "candidates" as
+    [{"suggestion", "schedule"}, ...]; "suggestion"/"schedule" are the first one
+    that succeeded. Prompt sizes and round-trip times are reported under "prompt_stats".
+    """
     if not DEEPSEEK_API_KEY or DEEPSEEK_API_KEY == "YOUR_DEEPSEEK_API_KEY":
         return {"error": "DeepSeek API key not configured in config.py."}
 
-    # --- Construct the Prompt ---
-    start_date = available_dates[0]
-    end_date = available_dates[-1]
-    num_courses = len(course_summary)
-    num_available_days = len(available_dates)
-    
-    prompt = f"Create a final exam schedule for {num_courses} university courses within the period {start_date} to {end_date}. "
-    prompt += f"Available dates for scheduling (excluding Fridays and holidays) are: {', '.join(available_dates)}.\n\n"
-    
-    prompt += "COURSE DETAILS (Harder courses listed first based on average score):\n"
-    # course_summary is already sorted by average score (ASC) from the query
-    for course_code, details in course_summary.items():
-        prompt += f"- {course_code} ({details['level']}, Avg: {details['average_total'] if details['average_total'] is not None else 'N/A'}, Enrolled: {details['enrollment']})\n"
-    
-    prompt += f"\nSCHEDULING REQUIREMENTS (MUST FOLLOW):\n"
-    prompt += f"1. MULTIPLE EXAMS PER DAY ARE ALLOWED AND ENCOURAGED: Place multiple exams on the same day, especially if they are from different academic levels (Diploma, Advanced Diploma, Bachelor), to make efficient use of the exam period.\n"
-    prompt += f"2. AVOID STUDENT CONFLICTS: The following pairs of courses CANNOT be scheduled on the SAME DAY because students are enrolled in both. Respect ALL of these constraints:\n"
-    if conflicts:
-        prompt += "   - " + "\n   - ".join(conflicts) + "\n"
+    started = time.perf_counter()
+    parts, cross_group_conflicts = prompt_builder.split_problem(available_dates, course_summary, graph, LLM_PROMPT_TOKEN_BUDGET, EXAM_SESSIONS)
+    prompts = [prompt_builder.build_prompt(available_dates, part, graph, base_schedule, sessions=EXAM_SESSIONS) for part in parts]
+    max_tokens = [prompt_builder.estimate_output_tokens(len(available_dates), len(part), LLM_MAX_OUTPUT_TOKENS) for part in parts]
+    # One request per (candidate, part)
+    requests_to_send = [(prompt, tokens, min(1.0, LLM_TEMPERATURE + CANDIDATE_TEMPERATURE_STEP * candidate))
+                        for candidate in range(candidates) for (prompt, _), tokens in zip(prompts, max_tokens)]
+
+    if len(requests_to_send) == 1:
+        results = [request_deepseek(*requests_to_send[0])]
     else:
-        prompt += "   - (No direct student conflicts identified across course pairs, but still aim to separate courses logically).\n"
-    prompt += f"3. DISTRIBUTE EXAMS THROUGHOUT THE ENTIRE PERIOD: Ensure exams are scheduled from {start_date} up to {end_date}. The last exam day should be close to {end_date}.\n"
-    prompt += f"4. BALANCE DIFFICULTY: Generally, schedule harder courses (lower average scores) earlier in the period or on days with fewer other exams. Use Study Days strategically.\n"
-    
-    # Study days logic - place remaining available days as study days
-    #num_study_days = max(0, num_available_days - num_courses) # Note: This might underestimate study days if many exams are doubled up. We'll let the AI decide where to put them.
-    #prompt += f"5. USE STUDY DAYS: Assign any available dates not used for exams as 'Study Day'. Distribute these {num_study_days if num_study_days > 0 else 'few (if any)'} study days to provide breaks, especially around harder exams.\n"
-    prompt += f"5. ASSIGN ALL AVAILABLE DATES: Every date listed as available must appear in the final schedule. If no exam is scheduled for a particular available date, simply list the date with no course assigned after the colon.\n"
-    
-    prompt += f"\nIMPORTANT FORMAT INSTRUCTIONS:\n"
-    prompt += f"Provide the final schedule ONLY as a numbered list. Each line MUST be in the format 'YYYY-MM-DD: CourseCode1' or 'YYYY-MM-DD: CourseCode1, CourseCode2' (if multiple exams on that day, comma-separated) or 'YYYY-MM-DD:' (if no exam is scheduled for that available date). List ALL available dates."
+        with ThreadPoolExecutor(max_workers=min(len(requests_to_send), LLM_MAX_CONCURRENT_REQUESTS)) as executor:
+            results = list(executor.map(lambda request: request_deepseek(*request), requests_to_send))
 
-    # --- DeepSeek API Call ---
-    api_url = "https://api.deepseek.com/v1/chat/completions" 
-    headers = {
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json"
+    part_stats = []
+    for i, result in enumerate(results):
+        (prompt, encoding), part = prompts[i % len(parts)], parts[i % len(parts)]
+        stats = result.pop("stats")
+        stats.update(courses=len(part), encoding=encoding, candidate=i // len(parts))
+        part_stats.append(stats)
+    cache_stats = results[-1].pop("llm_cache", None)
+    for result in results:
+        result.pop("llm_cache", None)
+
+    answers = []
+    errors = []
+    for candidate in range(candidates):
+        candidate_results = results[candidate * len(parts):(candidate + 1) * len(parts)]
+        candidate_errors = [result["error"] for result in candidate_results if "error" in result]
+        if candidate_errors:
+            errors.extend(candidate_errors)
+        elif len(candidate_results) == 1:
+            answers.append({"suggestion": candidate_results[0]["suggestion"], "schedule": candidate_results[0]["schedule"]})
+        else:
+            merged = {exam_date: [] for exam_date in available_dates}
+            for part_result in candidate_results:
+                for exam_date, courses in part_result["schedule"].items():
+                    merged.setdefault(exam_date, []).extend(courses)
+            answers.append({"suggestion": format_schedule_text(merged), "schedule": merged})
+
+    if not answers:
+        result = {"error": "; ".join(dict.fromkeys(errors))}
+    else:
+        result = dict(answers[0])
+        if candidates > 1:
+            result["candidates"] = answers
+            result["candidate_errors"] = errors
+
+    result["prompt_stats"] = {
+        "parts": part_stats,
+        "cross_group_conflicts": cross_group_conflicts,
+        "total_seconds": round(time.perf_counter() - started, 3)
     }
+    if cache_stats:
+        cache_stats["hit"] = all(stats["cache_hit"] for stats in part_stats)
+        result["llm_cache"] = cache_stats
+    return result
+
+def get_llm_client():
+    """Returns the process-wide DeepSeek client, creating it on first use."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = DeepSeekClient(DEEPSEEK_API_URL, DEEPSEEK_API_KEY, timeout=LLM_REQUEST_TIMEOUT,
+                                     max_retries=LLM_MAX_RETRIES, backoff=LLM_RETRY_BACKOFF,
+                                     pool_size=LLM_MAX_CONCURRENT_REQUESTS)
+    return _llm_client
+
+def request_deepseek(prompt, max_tokens, temperature=LLM_TEMPERATURE):
+    """Sends one chat completion request (or answers it from the cache).
+
+    Returns {"suggestion": ..., "schedule": ...} or {"error": ...}, plus "stats"
+    (prompt size, round-trip and first-token time, retries, cache hit) and
+    "llm_cache" counters when caching is on. With LLM_STREAM the schedule is
+    parsed line by line while the response arrives.
+    """
+    # --- DeepSeek API Call ---
+    api_url = DEEPSEEK_API_URL
     payload = {
         "model": "deepseek-chat", 
         "messages": [
-            {"role": "system", "content": "You are an AI assistant expert at creating optimized university final exam schedules based on course difficulty, student conflicts, and date constraints. You follow formatting instructions precisely."},
+            {"role": "system", "content": prompt_builder.SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        "max_tokens": 1000, # Increased max_tokens slightly for potentially longer schedule
-        "temperature": 0.4, # Slightly lower temperature for more deterministic schedule
+        "max_tokens": max_tokens, # sized from the number of dates and courses
+        "temperature": temperature,
         "top_p": 0.9
     }
 
+    # Identical requests (same model, parameters and prompt) are answered from the local cache
+    started = time.perf_counter()
+    cache = open_llm_cache()
+    cache_key = llm_cache.make_key(api_url, payload)
+    api_result = cache.get(cache_key) if cache else None
+    cache_hit = api_result is not None
+    client_stats = {}
+    streamed = {}
+
     try:
-        response = requests.post(api_url, headers=headers, json=payload, timeout=45) # Increased timeout
-        response.raise_for_status() 
-        
-        api_result = response.json()
-        
-        if api_result.get('choices') and len(api_result['choices']) > 0:
-             suggestion = api_result['choices'][0].get('message', {}).get('content')
-             if suggestion:
-                  # Basic validation: Check if output seems to follow the date format somewhat
-                  if "YYYY-MM-DD" in prompt and not re.search(r'\d{4}-\d{2}-\d{2}:', suggestion):
-                       return {"error": "API response received, but doesn't seem to contain the expected date format. Raw response: " + suggestion}
-                  return {"suggestion": suggestion.strip()}
-             else:
-                  return {"error": "Received an empty suggestion from DeepSeek."}
-        else:
-             # Log the full response for debugging if parsing fails
-             # print(json.dumps({"error": "Unexpected API response structure", "details": api_result}))
-             return {"error": f"Unexpected API response structure from DeepSeek. Details: {json.dumps(api_result)}"}
+        if api_result is None:
+            api_result = get_llm_client().complete(payload, stream=LLM_STREAM, stats=client_stats,
+                                                   on_line=lambda line: add_schedule_line(streamed, line))
+
+        result = parse_deepseek_response(api_result, prompt)
+        if "suggestion" in result:
+            result["schedule"] = streamed or parse_schedule_text(result["suggestion"])
+            if cache and not cache_hit:
+                cache.put(cache_key, api_result)
 
     except requests.exceptions.Timeout:
-         return {"error": "API request timed out. The scheduling task might be too complex or the API is slow."}
+         result = {"error": "API request timed out. The scheduling task might be too complex or the API is slow."}
     except requests.exceptions.RequestException as e:
-        return {"error": f"API request failed: {e}"}
+        result = {"error": f"API request failed: {e}"}
     except Exception as e:
         # Log the full error for debugging
         import traceback
         tb_str = traceback.format_exc()
-        return {"error": f"An unexpected error occurred during API processing: {e}. Traceback: {tb_str}"}
+        result = {"error": f"An unexpected error occurred during API processing: {e}. Traceback: {tb_str}"}
+
+    usage = (api_result or {}).get("usage", {}) if isinstance(api_result, dict) else {}
+    result["stats"] = {
+        "prompt_chars": len(prompt),
+        "prompt_tokens_estimate": prompt_builder.estimate_tokens(prompt),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "max_tokens": max_tokens,
+        "round_trip_seconds": round(time.perf_counter() - started, 3),
+        "first_token_seconds": client_stats.get("first_token_seconds"),
+        "retries": client_stats.get("retries", 0),
+        "cache_hit": cache_hit
+    }
+    if cache:
+        result["llm_cache"] = cache.stats()
+        cache.close()
+    return result
+
+def parse_deepseek_response(api_result, prompt):
+    """Extracts the schedule text from a chat completion response."""
+    if api_result.get('choices') and len(api_result['choices']) > 0:
+         suggestion = api_result['choices'][0].get('message', {}).get('content')
+         if suggestion:
+              # Basic validation: Check if output seems to follow the date format somewhat
+              if "YYYY-MM-DD" in prompt and not re.search(r'\d{4}-\d{2}-\d{2}:', suggestion):
+                   return {"error": "API response received, but doesn't seem to contain the expected date format. Raw response: " + suggestion}
+              return {"suggestion": suggestion.strip()}
+         else:
+              return {"error": "Received an empty suggestion from DeepSeek."}
+    else:
+         return {"error": f"Unexpected API response structure from DeepSeek. Details: {json.dumps(api_result)}"}
+
+def open_llm_cache():
+    """Opens the DeepSeek response cache, or returns None if it is disabled or unusable."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        return llm_cache.ResponseCache(ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+    except (sqlite3.Error, OSError):
+        return None
+
+
+def load_scheduling_data(use_summary_cache=True, progress=None, tracer=NULL_TRACER):
+    """Pipeline steps 2-4: course summary, enrollments and conflict graph.
+
+    Returns {"summary", "enrollments", "conflicts", "graph"} or {"error": ...}.
+    Kept separate from run_pipeline so a long-running caller can reuse it.
+    """
+    # 2 + 3 + 4. Get course marks summary (includes level, name, enrollment),
+    # student enrollments and their conflict graph, in parallel over the pool
+    summary_result, enrollment_result = fetch_course_data(use_summary_cache, progress, tracer)
+    if "error" in summary_result:
+        return summary_result
+    if "error" in enrollment_result:
+        return enrollment_result
+    graph = enrollment_result["graph"]
+    return {
+        "summary": summary_result["summary"],
+        "enrollments": enrollment_result["enrollments"],
+        "conflicts": graph.to_conflict_strings(),
+        "graph": graph
+    }
+
+def run_pipeline(start_date_str, end_date_str, holidays_str="", solver="local", refine=False, use_summary_cache=True, data=None,
+                 optimize=0, chains=None, progress=None, trace=None):
+    """Runs the full scheduling pipeline and returns the result dictionary.
+
+    solver="local" builds a conflict-free schedule in-process; solver="deepseek"
+    asks the DeepSeek API instead. With refine=True the local schedule is also
+    sent to DeepSeek for an optional review, stored under "llm_suggestion".
+    optimize > 0 spends that many seconds improving the schedule with parallel
+    annealing chains (see optimizer.py).
+    data may be a previous load_scheduling_data() result to skip the database.
+    progress(stage) is called as each of PIPELINE_STAGES completes (see job_queue.py);
+    the summary and enrollment stages run concurrently and may report from another thread.
+    trace (default TRACE_PIPELINE) adds per-stage spans under "trace" (see pipeline_trace.py).
+    The result is a draft: the live student timetables are only replaced when it
+    is published (see publish_schedule).
+    """
+    tracer = pipeline_trace.get_tracer(TRACE_PIPELINE if trace is None else trace)
+    result = _run_pipeline(start_date_str, end_date_str, holidays_str, solver, refine, use_summary_cache, data,
+                           optimize, chains, progress or _no_progress, tracer)
+    if tracer.enabled:
+        result["trace"] = tracer.finish(solver=solver, status="error" if "error" in result else "ok")
+        if TRACE_LOG_FILE:
+            export_error = tracer.export(TRACE_LOG_FILE)
+            if export_error:
+                result["trace"]["export_error"] = export_error
+    return result
+
+def _run_pipeline(start_date_str, end_date_str, holidays_str, solver, refine, use_summary_cache, data,
+                  optimize, chains, progress, tracer):
+    # 1. Calculate available dates
+    with tracer.span("dates") as span:
+        date_result = get_available_dates(start_date_str, end_date_str, holidays_str)
+        if "error" in date_result:
+            return date_result
+        available_dates = date_result["dates"]
+        span.set(dates=len(available_dates))
+    if not available_dates:
+        return {"error": "No available exam dates found in the specified range after excluding weekends and holidays."}
+    progress("dates")
+
+    # 2-4. Summary, enrollments and conflict graph
+    if data is None:
+        data = load_scheduling_data(use_summary_cache, progress, tracer)
+    else:
+        tracer.annotate(data="preloaded")
+    if "error" in data:
+        return data
+    course_summary = data["summary"]
+    graph = data["graph"]
+
+    # 5. Produce the schedule
+    if solver == "deepseek":
+        with tracer.span("llm", candidates=LLM_CANDIDATES) as span:
+            result = get_deepseek_suggestion(available_dates, course_summary, graph, candidates=LLM_CANDIDATES)
+            span.set(**llm_span_attributes(result))
+        if "error" in result:
+            return result
+        if "candidates" in result:
+            with tracer.span("select_candidate"):
+                select_candidate(result, available_dates, data)
+        result["solver"] = "deepseek"
+        with tracer.span("repair") as span:
+            repair_error = repair_llm_result(result, available_dates, data)
+            span.set(needed="repair" in result, retried=result.get("repair", {}).get("retried", False))
+        if repair_error:
+            return {"error": repair_error, "repair": result.get("repair")}
+        if optimize:
+            with tracer.span("optimize", budget=optimize):
+                optimize_result(result, available_dates, data, optimize, chains)
+        progress("solve")
+        return add_structured_output(result, available_dates, data, tracer)
+
+    with tracer.span("solve", courses=len(course_summary)):
+        solve_result = solve_schedule(available_dates, course_summary, graph,
+                                      max_exams_per_day=MAX_EXAMS_PER_DAY,
+                                      min_component_weight=SOLVER_MIN_COMPONENT_WEIGHT,
+                                      sessions=EXAM_SESSIONS)
+    if "error" in solve_result:
+        return solve_result
+    schedule = solve_result["schedule"]
+    result = {"suggestion": format_schedule_text(schedule), "schedule": schedule,
+              "sessions": solve_result["sessions"], "solver": "local"}
+
+    if refine:
+        with tracer.span("refine") as span:
+            llm_result = get_deepseek_suggestion(available_dates, course_summary, graph, base_schedule=schedule)
+            span.set(**llm_span_attributes(llm_result))
+        # The local schedule stays authoritative; the LLM output is advisory only
+        result["llm_suggestion"] = llm_result.get("suggestion")
+        if "error" in llm_result:
+            result["llm_error"] = llm_result["error"]
+    if optimize:
+        with tracer.span("optimize", budget=optimize):
+            optimize_result(result, available_dates, data, optimize, chains)
+    progress("solve")
+    return add_structured_output(result, available_dates, data, tracer)
+
+def llm_span_attributes(result):
+    """Request count, tokens, retries and cache hits of a get_deepseek_suggestion() result."""
+    parts = result.get("prompt_stats", {}).get("parts", [])
+    return {
+        "requests": len(parts),
+        "prompt_tokens": sum(part.get("prompt_tokens") or 0 for part in parts),
+        "completion_tokens": sum(part.get("completion_tokens") or 0 for part in parts),
+        "retries": sum(part.get("retries") or 0 for part in parts),
+        "cache_hits": sum(1 for part in parts if part.get("cache_hit")),
+        "error": result.get("error")
+    }
+
+def select_candidate(result, available_dates, data):
+    """Keeps the best of result["candidates"]: valid first, then the fewest students affected by violations."""
+    demand = exam_slots.course_demand(data["summary"], data["graph"])
+    reports = [validate_schedule(candidate["schedule"], available_dates, data["summary"], data["graph"],
+                                 demand=demand, session_seats=EXAM_SESSIONS) for candidate in result["candidates"]]
+    scores = [(not report["valid"], sum(v["students"] for v in report["violations"])) for report in reports]
+    best = min(range(len(scores)), key=lambda i: (scores[i], i))
+    result["suggestion"] = result["candidates"][best]["suggestion"]
+    result["schedule"] = result["candidates"][best]["schedule"]
+    result["candidates"] = [{"valid": report["valid"], "violation_students": score[1], "summary": report["summary"]}
+                            for report, score in zip(reports, scores)]
+    result["selected_candidate"] = best
+
+def repair_llm_result(result, available_dates, data):
+    """Validates the LLM schedule in result and repairs it locally if needed (see solver.repair_schedule).
+
+    Only when the local repair fails is DeepSeek asked again, with the valid
+    part of its answer as the starting schedule. The violations found and the
+    courses moved, placed or dropped are recorded under result["repair"].
+    Returns an error message if no valid schedule could be obtained, else None.
+    """
+    course_summary = data["summary"]
+    graph = data["graph"]
+    demand = exam_slots.course_demand(course_summary, graph)
+    report = validate_schedule(result["schedule"], available_dates, course_summary, graph,
+                               demand=demand, session_seats=EXAM_SESSIONS)
+    if report["valid"]:
+        return None
+
+    started = time.perf_counter()
+    repair = {"violations": report["summary"], "retried": False}
+    result["repair"] = repair
+    repaired = repair_schedule(result["schedule"], available_dates, course_summary, graph,
+                               max_exams_per_day=MAX_EXAMS_PER_DAY, sessions=EXAM_SESSIONS)
+    if "error" in repaired:
+        repair["local_error"] = repaired["error"]
+        repair["retried"] = True
+        retry = get_deepseek_suggestion(available_dates, course_summary, graph, base_schedule=repaired["kept"])
+        if "error" in retry:
+            return f"DeepSeek schedule is invalid and could not be repaired ({repaired['error']}); retry failed: {retry['error']}"
+        repaired = repair_schedule(retry["schedule"], available_dates, course_summary, graph,
+                                   max_exams_per_day=MAX_EXAMS_PER_DAY, sessions=EXAM_SESSIONS)
+        if "error" in repaired:
+            return f"DeepSeek schedule is invalid and could not be repaired after a retry: {repaired['error']}"
+
+    result["schedule"] = repaired["schedule"]
+    result["sessions"] = repaired["sessions"]
+    result["suggestion"] = format_schedule_text(repaired["schedule"])
+    repair.update(repaired["changes"])
+    repair["seconds"] = round(time.perf_counter() - started, 3)
+    return None
+
+def optimize_result(result, available_dates, data, budget, chains=None):
+    """Replaces result's schedule with the best one the annealing chains find within budget seconds.
+
+    The chains keep the solver's hardest-first placement as part of their cost.
+    """
+    schedule = result["schedule"]
+    graph = data["graph"]
+    if any(exam_date not in available_dates for exam_date in schedule):
+        result["optimization_error"] = "Schedule uses dates outside the exam period; optimization skipped."
+        return
+    optimized = optimize_schedule(schedule, available_dates, graph, budget,
+                                  chains=chains or OPTIMIZER_CHAINS, max_per_day=MAX_EXAMS_PER_DAY,
+                                  sessions=EXAM_SESSIONS, demand=exam_slots.course_demand(data["summary"], graph),
+                                  targets=spread_targets(course_order(data["summary"], graph), len(available_dates)))
+    result["schedule"] = optimized["schedule"]
+    result["sessions"] = optimized["sessions"]
+    result["suggestion"] = format_schedule_text(optimized["schedule"])
+    result["optimization"] = {key: optimized[key] for key in ("initial_cost", "best_cost", "clashes", "budget", "chains")}
+
+def add_structured_output(result, available_dates, data, tracer=NULL_TRACER):
+    """Adds the structured schedule (exam_days, course_dates), its validation report and student workload metrics."""
+    with tracer.span("output"):
+        demand = exam_slots.course_demand(data["summary"], data["graph"])
+        if not result.get("sessions"):
+            # LLM schedules come without sessions: pack each date's courses into them here
+            result["sessions"], _ = exam_slots.pack_schedule(result["schedule"], demand, EXAM_SESSIONS)
+        result.update(build_schedule_output(result["schedule"], data["summary"], data["graph"],
+                                            result["sessions"], demand, EXAM_SESSIONS))
+        result["available_dates"] = available_dates
+    # Every course once, no shared dates for conflicting courses, available dates, session seats
+    with tracer.span("validate") as span:
+        result["validation"] = validate_schedule(result["schedule"], available_dates, data["summary"], data["graph"],
+                                                 result["sessions"], demand, EXAM_SESSIONS, data["enrollments"])
+        span.set(valid=result["validation"]["valid"])
+    # Back-to-back days, 3 exams in 3 days and the proximity penalty across all students
+    with tracer.span("workload"):
+        result["workload"] = schedule_workload(result["schedule"], data["enrollments"])
+    return result
+
+def publish_schedule(result):
+    """Materializes the student timetables of a finished run_pipeline() result.
+
+    Called only when a result is published as schedule_result.json (job_queue.py
+    publish, or --publish on the command line), so drafts never replace the
+    timetables students see. Enrollments are read afresh; the outcome is
+    recorded in result. Without "student_timetable" in the published result,
+    student_schedule.php looks students up in CourseEnrollments instead.
+    """
+    if not MATERIALIZE_STUDENT_TIMETABLE or "course_dates" not in result:
+        return result
+    enrollment_result = get_student_enrollments()
+    if "error" in enrollment_result:
+        result["student_timetable_error"] = enrollment_result["error"]
+        return result
+    materialize_student_timetable(result, enrollment_result["enrollments"])
+    return result
+
+def materialize_student_timetable(result, enrollments):
+    """Loads the per-student timetable into StudentExamTimetable, recording the outcome in result."""
+    course_levels = {course["code"]: course["level"] for day in result["exam_days"] for course in day["courses"]}
+    rows = timetable_store.timetable_rows(result["course_dates"], enrollments, course_levels)
+    try:
+        with db.connection() as conn:
+            stats = timetable_store.materialize_timetable(conn, rows)
+    except Error as e:
+        result["student_timetable_error"] = f"Database error writing student timetables: {e}"
+        return
+    result["student_timetable"] = {"table": timetable_store.TIMETABLE_TABLE, **stats}
 
 
 if __name__ == "__main__":
-    import re # Import re for basic validation
+    # In-process entry point; process/schedule_client.py uses the running service instead when there is one
+    from schedule_client import build_arg_parser, save_result, USAGE
     RESULT_FILE = 'process/schedule_result.json' 
 
     if len(sys.argv) < 3:
-        result = {"error": "Usage: python process_schedule.py <start_date> <end_date> [holidays_comma_separated]"}
+        result = {"error": USAGE.replace("schedule_client.py", "process_schedule.py")}
         print(json.dumps(result)) 
-        try:
-            with open(RESULT_FILE, 'w') as f: json.dump(result, f)
-        except IOError as e: print(f"Error writing error to {RESULT_FILE}: {e}")
+        save_result(result, RESULT_FILE)
         sys.exit(1)
-        
-    start_arg = sys.argv[1]
-    end_arg = sys.argv[2]
-    holidays_arg = sys.argv[3] if len(sys.argv) > 3 else ""
+
+    args = build_arg_parser().parse_args()
 
     # --- Pipeline ---
-    # 1. Calculate available dates
-    date_result = get_available_dates(start_arg, end_arg, holidays_arg)
-    if "error" in date_result:
-        result = date_result
-    else:
-        available_dates = date_result["dates"]
-        if not available_dates:
-            result = {"error": "No available exam dates found in the specified range after excluding weekends and holidays."}
-        else:
-            # 2. Get course marks summary (includes level, name, enrollment)
-            summary_result = get_course_marks_summary()
-            if "error" in summary_result:
-                result = summary_result
-            else:
-                course_summary = summary_result["summary"]
-                
-                # 3. Get student enrollments
-                enrollment_result = get_student_enrollments()
-                if "error" in enrollment_result:
-                    result = enrollment_result
-                else:
-                    student_enrollments = enrollment_result["enrollments"]
-                    
-                    # 4. Find conflicting course pairs
-                    conflict_result = find_conflicting_courses(student_enrollments)
-                    # Note: Even if there's an error finding conflicts, we might proceed, 
-                    # but the schedule won't explicitly avoid them. Handle error? For now, pass empty list if error.
-                    conflicts = conflict_result.get("conflicts", []) 
-                    if "error" in conflict_result:
-                         print(f"Warning: Could not determine conflicting courses: {conflict_result['error']}")
-
-                    # 5. Get suggestion from DeepSeek API (pass conflicts)
-                    result = get_deepseek_suggestion(available_dates, course_summary, conflicts)
+    result = run_pipeline(args.start_date, args.end_date, args.holidays, solver=args.solver, refine=args.refine,
+                          use_summary_cache=not args.no_summary_cache, optimize=args.optimize, chains=args.chains,
+                          trace=args.trace or None)
+    if args.publish and "error" not in result:
+        result = publish_schedule(result)
 
     # --- Save Result ---
-    try:
-        with open(RESULT_FILE, 'w') as f:
-            json.dump(result, f, indent=4) 
-        print(f"Result saved to {RESULT_FILE}") 
-    except IOError as e:
-        print(f"Error: Could not write result to {RESULT_FILE}: {e}")
-        print("\nResult JSON:\n" + json.dumps(result))
-    except Exception as e:
-        print(f"An unexpected error occurred during file writing: {e}")
-        print("\nResult JSON:\n" + json.dumps(result)) 
\ No newline at end of file
+    save_result(result, RESULT_FILE)
@@ -0,0 +1,258 @@
+"""Prompt construction for the DeepSeek scheduler, with compact encodings.
+
+The original prompt listed every conflicting pair on its own "- A & B" line,
+so its size grew with the square of the course count. Conflicts can instead
+be written as groups of mutually conflicting courses ("cliques") plus an
+adjacency list for the remaining pairs; build_prompt() picks whichever
+encoding is smallest, and split_problem() breaks problems that still exceed
+the token budget into independent sub-requests.
+"""
+import math
+from collections import defaultdict
+
+CHARS_PER_TOKEN = 3.5 # rough average for code-heavy English prompts
+OUTPUT_TOKENS_PER_DATE = 14 # "12. 2025-04-12: " plus line break
+OUTPUT_TOKENS_PER_COURSE = 4 # "EEE342, "
+OUTPUT_TOKENS_OVERHEAD = 200 # preamble/closing remarks the model tends to add
+ENCODINGS = ('pairs', 'adjacency', 'cliques')
+
+SYSTEM_PROMPT = "You are an AI assistant expert at creating optimized university final exam schedules based on course difficulty, student conflicts, and date constraints. You follow formatting instructions precisely."
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (no tokenizer dependency); deliberately errs on the high side."""
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def estimate_output_tokens(num_dates, num_courses, limit=8192):
+    """max_tokens large enough for the numbered schedule list, capped at the model limit."""
+    needed = OUTPUT_TOKENS_OVERHEAD + num_dates * OUTPUT_TOKENS_PER_DATE + num_courses * OUTPUT_TOKENS_PER_COURSE
+    return min(limit, needed)
+
+
+def _edges_within(graph, courses):
+    """Conflicting pairs (a < b) among the given courses."""
+    selected = set(courses)
+    return sorted((a, b) for a in selected for b in graph.neighbors(a) if a < b and b in selected)
+
+
+def encode_conflict_pairs(graph, courses):
+    """Original encoding: one "A & B" line per conflicting pair."""
+    return [f"{a} & {b}" for a, b in _edges_within(graph, courses)]
+
+
+def encode_conflict_adjacency(graph, courses):
+    """One line per course listing its later-coded conflicts: "EEE301: EEE315, EEE327"."""
+    adjacency = defaultdict(list)
+    for a, b in _edges_within(graph, courses):
+        adjacency[a].append(b)
+    return [f"{course}: {', '.join(others)}" for course, others in sorted(adjacency.items())]
+
+
+def greedy_clique_cover(graph, courses, min_size=3):
+    """Covers conflict edges with cliques of at least min_size courses (greedy, largest-degree first).
+
+    Returns (cliques, leftover_edges); every edge appears in a clique or the leftovers.
+    """
+    selected = set(courses)
+    neighbours = {c: {o for o in graph.neighbors(c) if o in selected} for c in selected}
+    uncovered = {c: set(n) for c, n in neighbours.items()}
+    cliques = []
+    for seed in sorted(selected, key=lambda c: (-len(neighbours[c]), c)):
+        while uncovered[seed]:
+            clique = [seed]
+            candidates = set(uncovered[seed])
+            # Grow the clique preferring courses that still have uncovered edges to it
+            while candidates:
+                best = max(sorted(candidates), key=lambda c: len(uncovered[c] & candidates))
+                clique.append(best)
+                candidates &= neighbours[best]
+            if len(clique) < min_size:
+                break
+            for a in clique:
+                for b in clique:
+                    if a != b:
+                        uncovered[a].discard(b)
+            cliques.append(sorted(clique))
+    leftovers = sorted((a, b) for a in selected for b in uncovered[a] if a < b)
+    return cliques, leftovers
+
+
+def encode_conflict_cliques(graph, courses):
+    """Groups of mutually conflicting courses, then the remaining pairs as an adjacency list."""
+    cliques, leftovers = greedy_clique_cover(graph, courses)
+    lines = ["{" + ", ".join(clique) + "} (all on different days)" for clique in cliques]
+    adjacency = defaultdict(list)
+    for a, b in leftovers:
+        adjacency[a].append(b)
+    lines += [f"{course}: {', '.join(others)}" for course, others in sorted(adjacency.items())]
+    return lines
+
+
+def _format_courses(course_summary, compact):
+    if not compact:
+        return [f"- {code} ({details['level']}, Avg: {details['average_total'] if details['average_total'] is not None else 'N/A'}, Enrolled: {details['enrollment']})"
+                for code, details in course_summary.items()]
+    # One line per level: "Diploma: EEE101 31.2/45, ..." (average/enrolled), hardest first within each level
+    by_level = defaultdict(list)
+    for code, details in course_summary.items():
+        average = details['average_total'] if details['average_total'] is not None else 'N/A'
+        by_level[details['level']].append(f"{code} {average}/{details['enrollment']}")
+    return [f"- {level}: {', '.join(items)}" for level, items in by_level.items()]
+
+
+def _format_sessions(sessions):
+    """"Morning (300 seats), Afternoon (250 seats)" for the sessions with a seat limit, or None."""
+    limited = [f"{name} ({seats} seats)" for name, seats in (sessions or {}).items() if seats is not None]
+    return ", ".join(limited) if limited else None
+
+
+def build_prompt(available_dates, course_summary, graph, base_schedule=None, encoding='auto', sessions=None):
+    """Returns (prompt, encoding_used). encoding is 'pairs', 'adjacency', 'cliques' or 'auto' (smallest).
+
+    sessions ({session: seats}) adds the per-day seating requirement.
+    """
+    if encoding == 'auto':
+        candidates = [build_prompt(available_dates, course_summary, graph, base_schedule, e, sessions) for e in ENCODINGS]
+        return min(candidates, key=lambda candidate: len(candidate[0]))
+
+    courses = list(course_summary.keys())
+    start_date = available_dates[0]
+    end_date = available_dates[-1]
+    compact = encoding != 'pairs'
+
+    prompt = f"Create a final exam schedule for {len(courses)} university courses within the period {start_date} to {end_date}. "
+    prompt += f"Available dates for scheduling (excluding Fridays and holidays) are: {', '.join(available_dates)}.\n\n"
+
+    if compact:
+        prompt += "COURSE DETAILS by level as 'code average/enrolled' (within each level, harder courses listed first based on average score):\n"
+    else:
+        prompt += "COURSE DETAILS (Harder courses listed first based on average score):\n"
+    prompt += "\n".join(_format_courses(course_summary, compact)) + "\n"
+
+    if encoding == 'pairs':
+        conflict_lines = encode_conflict_pairs(graph, courses)
+        conflict_intro = "The following pairs of courses CANNOT be scheduled on the SAME DAY because students are enrolled in both."
+    elif encoding == 'adjacency':
+        conflict_lines = encode_conflict_adjacency(graph, courses)
+        conflict_intro = "Each line 'X: A, B' means course X CANNOT be scheduled on the SAME DAY as A or B because students are enrolled in both."
+    else:
+        conflict_lines = encode_conflict_cliques(graph, courses)
+        conflict_intro = "Courses inside one {...} group must ALL be on different days; each line 'X: A, B' means X CANNOT be on the SAME DAY as A or B."
+
+    prompt += f"\nSCHEDULING REQUIREMENTS (MUST FOLLOW):\n"
+    prompt += f"1. MULTIPLE EXAMS PER DAY ARE ALLOWED AND ENCOURAGED: Place multiple exams on the same day, especially if they are from different academic levels (Diploma, Advanced Diploma, Bachelor), to make efficient use of the exam period.\n"
+    prompt += f"2. AVOID STUDENT CONFLICTS: {conflict_intro} Respect ALL of these constraints:\n"
+    if conflict_lines:
+        prompt += "   - " + "\n   - ".join(conflict_lines) + "\n"
+    else:
+        prompt += "   - (No direct student conflicts identified across course pairs, but still aim to separate courses logically).\n"
+    prompt += f"3. DISTRIBUTE EXAMS THROUGHOUT THE ENTIRE PERIOD: Ensure exams are scheduled from {start_date} up to {end_date}. The last exam day should be close to {end_date}.\n"
+    prompt += f"4. BALANCE DIFFICULTY: Generally, schedule harder courses (lower average scores) earlier in the period or on days with fewer other exams. Use Study Days strategically.\n"
+    prompt += f"5. ASSIGN ALL AVAILABLE DATES: Every date listed as available must appear in the final schedule. If no exam is scheduled for a particular available date, simply list the date with no course assigned after the colon.\n"
+    session_text = _format_sessions(sessions)
+    if session_text:
+        prompt += f"6. RESPECT SEATING CAPACITY: Each date has the exam sessions {session_text}. Every course sits in one session and needs one seat per enrolled student, so the courses of one date must fit into these sessions. Do not pile large courses onto the same date.\n"
+
+    if base_schedule:
+        prompt += f"\nSTARTING SCHEDULE (already conflict-free, computed locally). Keep it unless a change clearly improves difficulty balance while still respecting ALL requirements above:\n"
+        selected = set(courses)
+        for exam_date, day_courses in base_schedule.items():
+            prompt += f"- {exam_date}: {', '.join(c for c in day_courses if c in selected)}\n"
+        missing = selected.difference(c for day_courses in base_schedule.values() for c in day_courses)
+        if missing:
+            # A partial schedule (e.g. the valid part of a rejected answer): the rest still needs dates
+            prompt += f"It does not include these courses yet; schedule them too: {', '.join(c for c in courses if c in missing)}\n"
+
+    prompt += f"\nIMPORTANT FORMAT INSTRUCTIONS:\n"
+    prompt += f"Provide the final schedule ONLY as a numbered list. Each line MUST be in the format 'YYYY-MM-DD: CourseCode1' or 'YYYY-MM-DD: CourseCode1, CourseCode2' (if multiple exams on that day, comma-separated) or 'YYYY-MM-DD:' (if no exam is scheduled for that available date). List ALL available dates."
+    return prompt, encoding
+
+
+def partition_courses(graph, codes, parts):
+    """Splits codes into `parts` groups of similar size with few conflicts between them.
+
+    Each group grows from the remaining course with the most remaining
+    conflicts, repeatedly taking the course with the most students shared with
+    the group so far (greedy graph growing).
+    """
+    remaining = set(codes)
+    size = math.ceil(len(codes) / parts)
+    groups = []
+    while remaining:
+        seed = max(remaining, key=lambda c: (sum(w for o, w in graph.neighbors(c).items() if o in remaining), c))
+        group = []
+        links = defaultdict(int) # students shared with the group, per remaining course
+        course = seed
+        while True:
+            group.append(course)
+            remaining.discard(course)
+            links.pop(course, None)
+            for other, weight in graph.neighbors(course).items():
+                if other in remaining:
+                    links[other] += weight
+            if len(group) >= size or not remaining:
+                break
+            course = max(links, key=lambda c: (links[c], c)) if links else max(remaining)
+        groups.append(group)
+    return groups
+
+
+def split_problem(available_dates, course_summary, graph, token_budget, sessions=None):
+    """Splits the courses into groups whose prompts fit token_budget.
+
+    Connected components of the conflict graph are independent, so they are
+    packed into groups first. A component that is still too large is split by
+    academic level, and a level that is still too large by partition_courses();
+    conflicts between those pieces can't be expressed inside a single
+    sub-request, so their count is returned for the caller to check. Only a
+    single course whose prompt alone exceeds the budget is sent over it.
+    Returns (list of course_summary subsets, cross_group_conflicts).
+    """
+    def prompt_tokens(codes):
+        subset = {code: course_summary[code] for code in codes}
+        return estimate_tokens(build_prompt(available_dates, subset, graph, sessions=sessions)[0])
+
+    def fit(codes):
+        tokens = prompt_tokens(codes)
+        if tokens <= token_budget or len(codes) == 1:
+            return [codes]
+        parts = max(2, math.ceil(tokens / token_budget))
+        return [piece for group in partition_courses(graph, codes, parts) for piece in fit(group)]
+
+    courses = list(course_summary.keys())
+    if prompt_tokens(courses) <= token_budget:
+        return [course_summary], 0
+
+    pieces = []
+    for component in graph.connected_components(courses):
+        if prompt_tokens(component) <= token_budget:
+            pieces.append(component)
+            continue
+        by_level = defaultdict(list)
+        for code in component:
+            by_level[course_summary[code]['level']].append(code)
+        for level_courses in by_level.values():
+            pieces.extend(fit(level_courses))
+
+    # First-fit packing of pieces (largest first) into groups under the budget
+    groups = []
+    for piece in sorted(pieces, key=len, reverse=True):
+        for group in groups:
+            if prompt_tokens(group + piece) <= token_budget:
+                group.extend(piece)
+                break
+        else:
+            groups.append(list(piece))
+
+    rank = {code: i for i, code in enumerate(courses)}
+    group_of = {}
+    subsets = []
+    for index, group in enumerate(groups):
+        group.sort(key=rank.get)
+        subsets.append({code: course_summary[code] for code in group})
+        for code in group:
+            group_of[code] = index
+    cross_group = sum(1 for a in courses for b in graph.neighbors(a)
+                      if a < b and b in group_of and group_of[a] != group_of[b])
+    return subsets, cross_group
@@ -0,0 +1,133 @@
+"""Thin command-line client for the schedule service.
+
+Usage: python process/schedule_client.py <start_date> <end_date> [holidays_comma_separated] [--solver local|deepseek] [--refine] [--optimize SECONDS] [--publish] [--trace]
+
+Sends the request to a running schedule_service.py and writes the answer to
+process/schedule_result.json. Only the standard library is imported up front;
+if no service is reachable the pipeline is run in-process instead.
+"""
+import sys
+import json
+import argparse
+import urllib.request
+import urllib.error
+
+try:
+    import config
+except ImportError:
+    config = None
+
+RESULT_FILE = 'process/schedule_result.json'
+SERVICE_HOST = getattr(config, 'SCHEDULE_SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = getattr(config, 'SCHEDULE_SERVICE_PORT', 8765)
+SERVICE_TIMEOUT = getattr(config, 'SCHEDULE_SERVICE_TIMEOUT', 300) # seconds; DeepSeek calls can be slow
+USAGE = "Usage: python schedule_client.py <start_date> <end_date> [holidays_comma_separated] [--solver local|deepseek] [--refine] [--optimize SECONDS] [--publish] [--trace]"
+
+
+def build_arg_parser():
+    """Command-line arguments shared by this client and process_schedule.py."""
+    parser = argparse.ArgumentParser(description="Generate a final exam schedule.")
+    parser.add_argument('start_date')
+    parser.add_argument('end_date')
+    parser.add_argument('holidays', nargs='?', default="")
+    parser.add_argument('--solver', choices=['local', 'deepseek'], default='local',
+                        help="local: in-process conflict-free solver (default); deepseek: DeepSeek API only")
+    parser.add_argument('--refine', action='store_true',
+                        help="also ask DeepSeek to review the local schedule (advisory)")
+    parser.add_argument('--no-summary-cache', action='store_true',
+                        help="always re-run the course summary query")
+    parser.add_argument('--optimize', type=float, default=0, metavar='SECONDS',
+                        help="improve the schedule with parallel annealing chains for this many seconds")
+    parser.add_argument('--chains', type=int, default=None,
+                        help="number of annealing chains (default: one per CPU core)")
+    parser.add_argument('--publish', action='store_true',
+                        help="also replace the students' timetables (StudentExamTimetable) with this schedule")
+    parser.add_argument('--trace', action='store_true',
+                        help="add per-stage timing and memory spans to the result (see pipeline_trace.py)")
+    return parser
+
+
+def save_result(result, result_file=RESULT_FILE):
+    """Writes the result JSON where the PHP pages read it, echoing it if the file can't be written."""
+    try:
+        with open(result_file, 'w') as f:
+            json.dump(result, f, indent=4)
+        print(f"Result saved to {result_file}")
+    except IOError as e:
+        print(f"Error: Could not write result to {result_file}: {e}")
+        print("\nResult JSON:\n" + json.dumps(result))
+    except Exception as e:
+        print(f"An unexpected error occurred during file writing: {e}")
+        print("\nResult JSON:\n" + json.dumps(result))
+
+
+def request_schedule(payload, host=SERVICE_HOST, port=SERVICE_PORT, timeout=SERVICE_TIMEOUT):
+    """POSTs a schedule request to the service. Raises urllib.error.URLError if it is not running."""
+    request = urllib.request.Request(
+        f"http://{host}:{port}/schedule",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def args_to_payload(args):
+    return {
+        "start_date": args.start_date,
+        "end_date": args.end_date,
+        "holidays": args.holidays,
+        "solver": args.solver,
+        "refine": args.refine,
+        "use_summary_cache": not args.no_summary_cache,
+        "optimize": args.optimize,
+        "chains": args.chains,
+        "trace": True if args.trace else None # None: the pipeline's TRACE_PIPELINE setting
+    }
+
+
+def run_in_process(args):
+    """Runs the pipeline in this interpreter (imports MySQL and requests on demand)."""
+    import process_schedule
+    return process_schedule.run_pipeline(
+        args.start_date, args.end_date, args.holidays,
+        solver=args.solver, refine=args.refine,
+        use_summary_cache=not args.no_summary_cache,
+        optimize=args.optimize, chains=args.chains,
+        trace=args.trace or None
+    )
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        result = {"error": USAGE}
+        print(json.dumps(result))
+        save_result(result)
+        return 1
+    args = build_arg_parser().parse_args(argv)
+    payload = args_to_payload(args)
+
+    try:
+        result = request_schedule(payload)
+    except urllib.error.URLError as e:
+        if not isinstance(e.reason, ConnectionError):
+            result = {"error": f"Schedule service request failed: {e.reason}"}
+        else:
+            # No service running: fall back to the in-process pipeline
+            result = run_in_process(args)
+    except ConnectionError:
+        result = run_in_process(args)
+    except (ValueError, OSError) as e:
+        result = {"error": f"Schedule service returned an invalid response: {e}"}
+
+    if args.publish and "error" not in result:
+        import process_schedule
+        result = process_schedule.publish_schedule(result)
+    save_result(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Structured schedule output for the PHP pages.
+
+Instead of handing the pages free text to re-parse with regexes on every
+view, the pipeline writes the schedule as date -> course list with each
+course's level, enrollment, average and conflict degree already joined in.
+Per-student timetables are materialized by timetable_store.py.
+"""
+from datetime import date
+
+
+def build_schedule_output(schedule, course_summary, graph, sessions=None, demand=None, session_seats=None):
+    """Returns the structured schedule fields for the result JSON.
+
+    "exam_days" lists every schedule date in order with its course details;
+    "course_dates" maps course -> (first) date. With sessions ({date: {session:
+    [course, ...]}}) each course also gets its session and each day the seats
+    used per session. Checking the schedule is left to schedule_validator.
+    """
+    demand = demand or {}
+    session_seats = session_seats or {}
+    course_dates = {}
+    exam_days = []
+    for exam_date in sorted(schedule):
+        day_sessions = (sessions or {}).get(exam_date, {})
+        session_of = {code: name for name, codes in day_sessions.items() for code in codes}
+        courses = []
+        for code in schedule[exam_date]:
+            course_dates.setdefault(code, exam_date)
+            details = course_summary.get(code) or {}
+            courses.append({
+                "code": code,
+                "name": details.get('name'),
+                "level": details.get('level', 'Unknown'),
+                "enrollment": details.get('enrollment', graph.enrollment.get(code, 0)),
+                "average_total": details.get('average_total'),
+                "conflicts": graph.degree(code),
+                "session": session_of.get(code)
+            })
+        usage = []
+        for name, codes in day_sessions.items():
+            used = sum(demand.get(code, 0) for code in codes)
+            seats = session_seats.get(name)
+            usage.append({"session": name, "seats": seats, "used": used})
+        exam_days.append({
+            "date": exam_date,
+            "weekday": date.fromisoformat(exam_date).strftime('%A'),
+            "courses": courses,
+            "sessions": usage
+        })
+    return {
+        "exam_days": exam_days,
+        "course_dates": course_dates
+    }
+
@@ -0,0 +1,124 @@
+"""Long-running schedule service.
+
+Keeps the connection pool, course summary and conflict graph warm between
+requests so a schedule request costs one fingerprint query plus the solve,
+instead of an interpreter start, imports, connects and full data reload.
+
+Usage: python process/schedule_service.py [--host HOST] [--port PORT]
+
+Endpoints:
+    GET  /health    -> {"status": "ok", "warm": bool}
+    POST /schedule  <- {"start_date", "end_date", "holidays", "solver", "refine"}
+                    -> pipeline result JSON (same shape as schedule_result.json)
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mysql.connector import Error
+
+import process_schedule as pipeline
+import db
+import course_summary as summary_cache
+from schedule_client import SERVICE_HOST, SERVICE_PORT
+
+
+class WarmState:
+    """Caches load_scheduling_data() until the source tables' fingerprint changes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.fingerprint = None
+        self.data = None
+
+    @property
+    def is_warm(self):
+        return self.data is not None
+
+    def get(self, use_summary_cache=True):
+        with self.lock:
+            try:
+                with db.connection() as conn:
+                    cursor = conn.cursor()
+                    try:
+                        fingerprint = summary_cache.fetch_fingerprint(cursor)
+                    finally:
+                        cursor.close()
+            except Error as e:
+                return {"error": f"Database error checking for data changes: {e}"}
+
+            if self.data is not None and fingerprint == self.fingerprint:
+                return self.data
+            data = pipeline.load_scheduling_data(use_summary_cache)
+            if "error" not in data:
+                self.data = data
+                self.fingerprint = fingerprint
+            return data
+
+
+class ScheduleRequestHandler(BaseHTTPRequestHandler):
+    state = None # set by serve()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {"status": "ok", "warm": self.state.is_warm})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/schedule':
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+            start_date = params['start_date']
+            end_date = params['end_date']
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": f"Invalid schedule request: {e}"})
+            return
+
+        data = self.state.get(use_summary_cache=params.get('use_summary_cache', True))
+        result = pipeline.run_pipeline(
+            start_date, end_date, params.get('holidays', ""),
+            solver=params.get('solver', 'local'),
+            refine=params.get('refine', False),
+            data=data,
+            optimize=params.get('optimize', 0),
+            chains=params.get('chains'),
+            trace=params.get('trace')
+        )
+        self._send_json(200, result)
+
+    def log_message(self, format, *args):
+        pass # keep the service quiet; results are returned to the caller
+
+
+def serve(host=SERVICE_HOST, port=SERVICE_PORT):
+    ScheduleRequestHandler.state = WarmState()
+    server = ThreadingHTTPServer((host, port), ScheduleRequestHandler)
+    print(f"Schedule service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the schedule service.")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -0,0 +1,130 @@
+"""Schedule validation with a machine-readable violation report.
+
+Checks a {date: [course_code, ...]} schedule against the course list, the
+conflict graph, the available dates and (optionally) the session seats:
+
+- every course appears exactly once (missing_course, duplicate_course),
+- only known courses are scheduled (unknown_course),
+- every date is an available exam date (unavailable_date),
+- no two conflicting courses share a date (conflict),
+- no session holds more students than it seats (over_capacity).
+
+Each violation carries the number of students it affects. The work is one
+pass over the schedule plus one pass over the conflict graph's edges, so it is
+cheap enough to gate every result and to drive a retry/repair loop.
+
+Usage: python process/schedule_validator.py [result_json]
+"""
+import sys
+import json
+from collections import Counter
+
+from exam_slots import pack_schedule
+
+VIOLATION_TYPES = ('missing_course', 'duplicate_course', 'unknown_course', 'unavailable_date', 'conflict', 'over_capacity')
+
+
+def validate_schedule(schedule, available_dates, course_summary, graph, sessions=None, demand=None,
+                      session_seats=None, enrollments=None):
+    """Returns {"valid", "violations": [...], "summary": {type: count}, "students_with_conflicts"}.
+
+    course_summary defines the courses that must be scheduled. sessions is the
+    {date: {session: [course, ...]}} packing; if it is missing but session_seats
+    is given, each date is packed here. With enrollments (EnrollmentMatrix) the
+    number of distinct students with a same-day clash is counted exactly;
+    otherwise it is the sum of the clashing edges' weights (an upper bound).
+    """
+    available = set(available_dates)
+    enrollment = {code: details.get('enrollment') or graph.enrollment.get(code, 0)
+                  for code, details in course_summary.items()}
+    violations = []
+
+    dates_of = {}
+    for exam_date, courses in schedule.items():
+        for code in courses:
+            dates_of.setdefault(code, []).append(exam_date)
+        if exam_date not in available:
+            violations.append({"type": "unavailable_date", "date": exam_date, "courses": list(courses),
+                               "students": sum(enrollment.get(code, graph.enrollment.get(code, 0)) for code in courses)})
+
+    for code in course_summary:
+        if code not in dates_of:
+            violations.append({"type": "missing_course", "course": code, "students": enrollment[code]})
+    for code, dates in dates_of.items():
+        if len(dates) > 1:
+            violations.append({"type": "duplicate_course", "course": code, "dates": dates,
+                               "students": enrollment.get(code, graph.enrollment.get(code, 0))})
+        if code not in course_summary:
+            violations.append({"type": "unknown_course", "course": code, "dates": dates,
+                               "students": graph.enrollment.get(code, 0)})
+
+    conflict_students = 0
+    for course_a, course_b, weight in graph.edges():
+        dates_a = dates_of.get(course_a)
+        dates_b = dates_of.get(course_b)
+        if not dates_a or not dates_b:
+            continue
+        for exam_date in set(dates_a).intersection(dates_b):
+            violations.append({"type": "conflict", "courses": [course_a, course_b], "date": exam_date, "students": weight})
+            conflict_students += weight
+
+    if session_seats and any(seats is not None for seats in session_seats.values()):
+        demand = demand or {code: graph.enrollment.get(code, 0) for code in dates_of}
+        if sessions is None:
+            sessions, _ = pack_schedule(schedule, demand, session_seats)
+        for exam_date, day_sessions in sessions.items():
+            for name, courses in day_sessions.items():
+                seats = session_seats.get(name)
+                used = sum(demand.get(code, 0) for code in courses)
+                if seats is not None and used > seats:
+                    violations.append({"type": "over_capacity", "date": exam_date, "session": name,
+                                       "seats": seats, "used": used, "students": used - seats})
+
+    if enrollments is not None and conflict_students:
+        conflict_students = students_with_conflicts(schedule, enrollments)
+
+    counts = Counter(v["type"] for v in violations)
+    return {
+        "valid": not violations,
+        "violations": violations,
+        "summary": {kind: counts.get(kind, 0) for kind in VIOLATION_TYPES},
+        "students_with_conflicts": conflict_students
+    }
+
+
+def students_with_conflicts(schedule, enrollments):
+    """Distinct students with two or more exams on one date (vectorised over the cohort)."""
+    from workload_metrics import WorkloadEvaluator, course_day_vector
+    metrics = WorkloadEvaluator(enrollments).evaluate(course_day_vector(schedule, enrollments.course_codes))
+    return int((metrics["clashes"] > 0).sum())
+
+
+def main(argv=None):
+    """Validates a saved result file against the current database contents."""
+    argv = sys.argv[1:] if argv is None else argv
+    result_file = argv[0] if argv else 'process/schedule_result.json'
+    try:
+        with open(result_file) as f:
+            result = json.load(f)
+    except (IOError, ValueError) as e:
+        print(json.dumps({"error": f"Could not read {result_file}: {e}"}))
+        return 1
+    if "schedule" not in result:
+        print(json.dumps({"error": f"{result_file} has no structured schedule to validate."}))
+        return 1
+
+    import process_schedule as pipeline
+    data = pipeline.load_scheduling_data()
+    if "error" in data:
+        print(json.dumps(data))
+        return 1
+    available_dates = result.get("available_dates") or sorted(result["schedule"])
+    report = validate_schedule(result["schedule"], available_dates, data["summary"], data["graph"],
+                               sessions=result.get("sessions"), session_seats=pipeline.EXAM_SESSIONS,
+                               enrollments=data["enrollments"])
+    print(json.dumps(report, indent=4))
+    return 0 if report["valid"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
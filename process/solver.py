@@ -0,0 +1,391 @@
+import os
+import re
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+
+from exam_slots import SeatCapacity, course_demand
+
+# Soft-cost weights used when choosing between conflict-free days
+PROXIMITY_PENALTY = {1: 8, 2: 4, 3: 2} # per shared student, by distance in calendar days
+LOAD_PENALTY = 1.0 # per exam already placed on the day
+TARGET_PENALTY = 2.0 # per day away from the course's difficulty-ordered target position
+MAX_REPAIR_ITERATIONS = 5000
+PARALLEL_MIN_COURSES = 300 # below this, process start-up costs more than solving components in parallel saves
+
+
+def course_order(course_summary, graph):
+    """Courses in "harder first" order: summary order (ASC average) followed by any unknown courses."""
+    ordered = list(course_summary.keys())
+    known = set(ordered)
+    ordered += [code for code in graph.courses if code not in known]
+    return ordered
+
+
+def spread_targets(courses, num_days):
+    """Target day index per course, spreading the hardest-first order evenly over the period."""
+    spread = (num_days - 1) / max(1, len(courses) - 1)
+    return {course: i * spread for i, course in enumerate(courses)}
+
+
+def _day_cost(course, day_index, assignment, graph, day_ordinals, day_loads, target):
+    """Soft cost of placing course on day_index; same-day conflicts are handled separately."""
+    cost = LOAD_PENALTY * day_loads[day_index] + TARGET_PENALTY * abs(day_index - target)
+    ordinal = day_ordinals[day_index]
+    for other, weight in graph.neighbors(course).items():
+        other_day = assignment.get(other)
+        if other_day is not None:
+            distance = abs(day_ordinals[other_day] - ordinal)
+            cost += PROXIMITY_PENALTY.get(distance, 0) * weight
+    return cost
+
+
+def _clash_weight(course, day_index, assignment, graph):
+    """Number of students with another exam on day_index if course is placed there."""
+    return sum(weight for other, weight in graph.neighbors(course).items()
+               if assignment.get(other) == day_index)
+
+
+def _has_room(day_loads, day, max_per_day, course=None, seats=None):
+    """True if day is under max_per_day exams and (with seats) has a session that can seat course."""
+    return ((max_per_day is None or day_loads[day] < max_per_day)
+            and (seats is None or seats.fits(course, day)))
+
+
+def dsatur_assign(courses, num_days, graph, day_ordinals, targets, max_per_day=None, seats=None):
+    """Greedy DSatur colouring of courses onto day indexes.
+
+    The next course is the one whose neighbours already occupy the most distinct
+    days (ties: more conflicts, then harder first). Courses that cannot be placed
+    without a clash are put on the least-clashing day and left for repair.
+    Days already holding max_per_day exams, or without a session that can
+    seat the course (seats: SeatCapacity), are skipped while others have room.
+    """
+    rank = {course: i for i, course in enumerate(courses)}
+    assignment = {}
+    day_loads = [0] * num_days
+    neighbour_days = {course: set() for course in courses}
+    unassigned = set(courses)
+
+    while unassigned:
+        course = max(unassigned, key=lambda c: (len(neighbour_days[c]), graph.degree(c), -rank[c]))
+        unassigned.discard(course)
+        blocked = neighbour_days[course]
+        open_days = [d for d in range(num_days) if _has_room(day_loads, d, max_per_day, course, seats)] or list(range(num_days))
+        free_days = [d for d in open_days if d not in blocked]
+        if free_days:
+            day = min(free_days, key=lambda d: (_day_cost(course, d, assignment, graph, day_ordinals, day_loads, targets[course]), d))
+        else:
+            day = min(open_days, key=lambda d: (_clash_weight(course, d, assignment, graph), d))
+        assignment[course] = day
+        day_loads[day] += 1
+        if seats is not None:
+            seats.add(course, day)
+        for other in graph.neighbors(course):
+            if other in neighbour_days:
+                neighbour_days[other].add(day)
+    return assignment, day_loads
+
+
+def repair_assignment(assignment, day_loads, num_days, graph, day_ordinals, targets, max_per_day=None,
+                      max_iterations=MAX_REPAIR_ITERATIONS, seats=None):
+    """Min-conflicts local search: moves clashing courses until no two conflicting courses share a day.
+
+    Clash weights are maintained incrementally, so each move costs O(degree + days).
+    Returns the number of clashing students left (0 means the assignment is conflict-free).
+    """
+    clash = {course: _clash_weight(course, day, assignment, graph) for course, day in assignment.items()}
+    conflicted = {course for course, weight in clash.items() if weight > 0}
+    tabu = {}
+    for iteration in range(max_iterations):
+        if not conflicted:
+            return 0
+        # Deterministic choice that still rotates through the clashing courses
+        ordered = sorted(conflicted)
+        course = ordered[iteration % len(ordered)]
+        current = assignment[course]
+        neighbours = graph.neighbors(course)
+
+        day_clash = [0] * num_days
+        for other, weight in neighbours.items():
+            other_day = assignment.get(other)
+            if other_day is not None:
+                day_clash[other_day] += weight
+        candidates = [d for d in range(num_days) if d != current and tabu.get((course, d), -1) < iteration
+                      and _has_room(day_loads, d, max_per_day, course, seats)]
+        if not candidates:
+            continue
+        lowest = min(day_clash[d] for d in candidates)
+        # Only the least-clashing days need the (more expensive) soft cost
+        best = min((d for d in candidates if day_clash[d] == lowest),
+                   key=lambda d: (_day_cost(course, d, assignment, graph, day_ordinals, day_loads, targets[course]), d))
+
+        for other, weight in neighbours.items():
+            other_day = assignment.get(other)
+            if other_day == current:
+                clash[other] -= weight
+                if clash[other] == 0:
+                    conflicted.discard(other)
+            elif other_day == best:
+                clash[other] += weight
+                conflicted.add(other)
+        clash[course] = day_clash[best]
+        if clash[course]:
+            conflicted.add(course)
+        else:
+            conflicted.discard(course)
+        day_loads[current] -= 1
+        day_loads[best] += 1
+        assignment[course] = best
+        if seats is not None:
+            seats.move(course, best)
+        tabu[(course, current)] = iteration + 7 # don't move straight back
+    return sum(clash.values()) // 2
+
+
+def rebalance_days(assignment, day_loads, num_days, graph, day_ordinals, targets, max_per_day=None, seats=None):
+    """Moves courses off days holding more than max_per_day exams, or more students than their
+    sessions seat, onto clash-free days with room.
+
+    A day over seat capacity is first re-packed (first fit decreasing); only if
+    that fails are courses moved. Returns the number of exams still above the
+    limit plus the number of days still over capacity (0 when everything fits).
+    """
+    def over(day):
+        return ((max_per_day is not None and day_loads[day] > max_per_day)
+                or (seats is not None and seats.overflow(day) and seats.repack(day)))
+
+    for day in range(num_days):
+        while over(day):
+            # Move the least-connected courses first: they have the most clash-free options
+            on_day = sorted((c for c, d in assignment.items() if d == day), key=lambda c: (graph.degree(c), c))
+            for course in on_day:
+                options = [d for d in range(num_days) if d != day
+                           and (max_per_day is None or day_loads[d] < max_per_day)
+                           and (seats is None or seats.fits(course, d))
+                           and _clash_weight(course, d, assignment, graph) == 0]
+                if options:
+                    best = min(options, key=lambda d: (_day_cost(course, d, assignment, graph, day_ordinals, day_loads, targets[course]), d))
+                    assignment[course] = best
+                    day_loads[day] -= 1
+                    day_loads[best] += 1
+                    if seats is not None:
+                        seats.move(course, best)
+                    break
+            else:
+                break
+    exams_over = 0 if max_per_day is None else sum(max(0, load - max_per_day) for load in day_loads)
+    days_over = 0 if seats is None else sum(1 for day in range(num_days) if seats.overflow(day))
+    return exams_over + days_over
+
+
+def _solve_component(task):
+    """Worker: DSatur + repair for one group of independent courses; returns their assignment."""
+    courses, num_days, graph, day_ordinals, targets, max_per_day, sessions, demand = task
+    # Each group sees the full seat capacity; the merged assignment is rebalanced afterwards
+    seats = SeatCapacity(num_days, sessions, demand) if sessions else None
+    assignment, day_loads = dsatur_assign(courses, num_days, graph, day_ordinals, targets, max_per_day, seats)
+    repair_assignment(assignment, day_loads, num_days, graph, day_ordinals, targets, max_per_day, seats=seats)
+    return assignment
+
+
+def _group_components(components, num_groups):
+    """Packs components into at most num_groups groups of similar size (largest first)."""
+    groups = [[] for _ in range(min(num_groups, len(components)))]
+    for component in sorted(components, key=len, reverse=True):
+        min(groups, key=len).extend(component)
+    return [group for group in groups if group]
+
+
+def solve_schedule(available_dates, course_summary, graph, max_exams_per_day=None,
+                   min_component_weight=1, parallel_min_courses=PARALLEL_MIN_COURSES, max_workers=None,
+                   sessions=None):
+    """Builds a conflict-free exam schedule locally (no API call).
+
+    The conflict graph is split into connected components (with
+    min_component_weight > 1, edges shared by fewer students are ignored when
+    splitting). For large problems the components are solved in parallel on a
+    ProcessPoolExecutor, then merged: days above max_exams_per_day or above the
+    seats of their sessions are rebalanced and any clash across near-components
+    is repaired on the full graph.
+
+    sessions is {session_name: seats} (see exam_slots); every course's
+    enrollment must fit in one session of its date.
+
+    Returns {"schedule": {date: [course_code, ...]}, "sessions": {date: {session: [course_code, ...]}}}
+    with every available date present (empty list for study days), or
+    {"error": ...} if no conflict-free assignment fits the available dates.
+    """
+    if not available_dates:
+        return {"error": "No available dates to schedule exams on."}
+    courses = course_order(course_summary, graph)
+    if not courses:
+        return {"error": "No courses to schedule."}
+
+    num_days = len(available_dates)
+    day_ordinals = [date.fromisoformat(d).toordinal() for d in available_dates]
+    # Spread courses over the period, hardest courses aiming for the earliest days
+    targets = spread_targets(courses, num_days)
+
+    demand = course_demand(course_summary, graph)
+    seats = SeatCapacity(num_days, sessions, demand)
+    oversized = seats.oversized()
+    if oversized:
+        return {"error": f"Courses with more students than the largest session seats ({seats.largest:g}): {', '.join(oversized)}. Add seats to a session."}
+
+    components = graph.connected_components(courses, min_component_weight)
+    if len(courses) >= parallel_min_courses and len(components) > 1:
+        workers = max_workers or os.cpu_count() or 1
+        groups = _group_components(components, workers)
+        tasks = [(group, num_days, graph.subgraph(group), day_ordinals, {c: targets[c] for c in group},
+                  max_exams_per_day, sessions, {c: demand[c] for c in group}) for group in groups]
+        assignment = {}
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            for part in executor.map(_solve_component, tasks):
+                assignment.update(part)
+        day_loads = [0] * num_days
+        for course, day in assignment.items():
+            day_loads[day] += 1
+            seats.add(course, day)
+    else:
+        assignment, day_loads = dsatur_assign(courses, num_days, graph, day_ordinals, targets, max_exams_per_day, seats)
+
+    overflow = rebalance_days(assignment, day_loads, num_days, graph, day_ordinals, targets, max_exams_per_day, seats)
+    if overflow:
+        return {"error": f"Could not fit all exams within the per-day limit and session seats: {overflow} exams or days over. Extend the exam period, raise the limit or add seats."}
+    remaining = repair_assignment(assignment, day_loads, num_days, graph, day_ordinals, targets, max_exams_per_day, seats=seats)
+    if remaining:
+        return {"error": f"Could not build a conflict-free schedule: {remaining} student clashes remain with {num_days} available dates. Extend the exam period."}
+
+    rank = {course: i for i, course in enumerate(courses)}
+    schedule = {d: [] for d in available_dates}
+    for course in sorted(assignment, key=rank.get):
+        schedule[available_dates[assignment[course]]].append(course)
+    return {"schedule": schedule, "sessions": seats.sessions_by_day(available_dates)}
+
+
+def _drop_clashing(assignment, graph):
+    """Removes the most-clashing courses until the assignment is conflict-free; returns the removed ones."""
+    clash = {course: _clash_weight(course, day, assignment, graph) for course, day in assignment.items()}
+    removed = []
+    while True:
+        course = max((c for c in clash if clash[c] > 0), key=lambda c: (clash[c], c), default=None)
+        if course is None:
+            return removed
+        day = assignment.pop(course)
+        del clash[course]
+        removed.append(course)
+        for other, weight in graph.neighbors(course).items():
+            if assignment.get(other) == day:
+                clash[other] -= weight
+
+
+def repair_schedule(schedule, available_dates, course_summary, graph, max_exams_per_day=None, sessions=None):
+    """Repairs an invalid schedule (e.g. from the LLM) while keeping as much of it as possible.
+
+    Unknown courses and dates outside available_dates are dropped, a duplicated
+    course keeps its first date, and the courses involved in clashes are taken
+    out (most clashing first) until the rest is conflict-free: that is the
+    valid part. The removed and missing courses are then placed on their
+    least-clashing days, and min-conflicts repair (with the per-day limit and
+    session seats) moves only what still clashes.
+
+    Returns {"schedule", "sessions", "changes": {"moved", "placed", "dropped", "kept"}}
+    (kept = courses left on their proposed date), or {"error": ..., "kept": the
+    valid part as a schedule} if the violations can't be repaired.
+    """
+    if not available_dates:
+        return {"error": "No available dates to schedule exams on.", "kept": {}}
+    courses = course_order(course_summary, graph)
+    known = set(courses)
+    num_days = len(available_dates)
+    day_index = {d: i for i, d in enumerate(available_dates)}
+    day_ordinals = [date.fromisoformat(d).toordinal() for d in available_dates]
+    targets = spread_targets(courses, num_days)
+
+    proposed = {}
+    dropped = set()
+    for exam_date, codes in schedule.items():
+        day = day_index.get(exam_date)
+        for code in codes:
+            if code not in known:
+                dropped.add(code)
+            elif day is not None:
+                proposed.setdefault(code, day)
+    assignment = dict(proposed)
+    taken_out = _drop_clashing(assignment, graph)
+    rank = {course: i for i, course in enumerate(courses)}
+
+    def to_schedule(days):
+        result = {d: [] for d in available_dates}
+        for course in sorted(days, key=rank.get):
+            result[available_dates[days[course]]].append(course)
+        return result
+    kept = to_schedule(assignment)
+
+    seats = SeatCapacity(num_days, sessions, course_demand(course_summary, graph))
+    oversized = seats.oversized()
+    if oversized:
+        return {"error": f"Courses with more students than the largest session seats ({seats.largest:g}): {', '.join(oversized)}.", "kept": kept}
+    day_loads = [0] * num_days
+    for course, day in assignment.items():
+        day_loads[day] += 1
+        seats.add(course, day)
+
+    # Re-place the removed and missing courses, most constrained first
+    unplaced = sorted((c for c in courses if c not in assignment), key=lambda c: (-graph.degree(c), rank[c]))
+    for course in unplaced:
+        open_days = [d for d in range(num_days) if _has_room(day_loads, d, max_exams_per_day, course, seats)] or list(range(num_days))
+        day = min(open_days, key=lambda d: (_clash_weight(course, d, assignment, graph),
+                                            _day_cost(course, d, assignment, graph, day_ordinals, day_loads, targets[course]), d))
+        assignment[course] = day
+        day_loads[day] += 1
+        seats.add(course, day)
+
+    overflow = rebalance_days(assignment, day_loads, num_days, graph, day_ordinals, targets, max_exams_per_day, seats)
+    remaining = repair_assignment(assignment, day_loads, num_days, graph, day_ordinals, targets, max_exams_per_day, seats=seats)
+    if overflow or remaining:
+        return {"error": f"Could not repair the schedule: {remaining} student clashes and {overflow} exams or days over the limits remain.", "kept": kept}
+
+    return {
+        "schedule": to_schedule(assignment),
+        "sessions": seats.sessions_by_day(available_dates),
+        "changes": {
+            "moved": sorted(c for c in proposed if assignment[c] != proposed[c]),
+            "placed": sorted(c for c in assignment if c not in proposed),
+            "dropped": sorted(dropped),
+            "kept": len(proposed) - len(taken_out)
+        }
+    }
+
+
+def format_schedule_text(schedule):
+    """Renders a schedule in the numbered 'YYYY-MM-DD: A, B' format the PHP pages parse."""
+    lines = []
+    for i, (exam_date, courses) in enumerate(schedule.items(), start=1):
+        lines.append(f"{i}. {exam_date}: {', '.join(courses)}".rstrip())
+    return "\n".join(lines)
+
+
+SCHEDULE_LINE = re.compile(r'^\s*(?:\d+\.\s*)?(\d{4}-\d{2}-\d{2})\s*:\s*(.*)$')
+COURSE_CODE = re.compile(r'\b[A-Z]{2,4}\d{3}\b')
+
+
+def parse_schedule_text(text):
+    """Parses 'YYYY-MM-DD: A, B' lines (numbered or not) into {date: [course_code, ...]}.
+
+    Dates appearing on several lines are merged; surrounding prose is ignored.
+    """
+    schedule = {}
+    for line in text.splitlines():
+        add_schedule_line(schedule, line)
+    return schedule
+
+
+def add_schedule_line(schedule, line):
+    """Adds one 'YYYY-MM-DD: A, B' line to schedule (used while a response streams in); False if it isn't one."""
+    match = SCHEDULE_LINE.match(line.replace('*', ''))
+    if not match:
+        return False
+    exam_date, courses = match.groups()
+    schedule.setdefault(exam_date, []).extend(COURSE_CODE.findall(courses))
+    return True
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scheduler modules import each other as top-level modules (python process/<script>.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
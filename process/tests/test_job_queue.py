@@ -0,0 +1,149 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import job_queue
+import process_schedule
+from job_queue import JobQueue
+
+PARAMS = {"start_date": "2025-04-01", "end_date": "2025-04-30", "holidays": "", "solver": "local"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), str(tmp_path / "jobs"))
+    yield queue
+    queue.close()
+
+
+def test_submit_queues_job(queue):
+    job_id = queue.submit(PARAMS)
+    job = queue.status(job_id)
+    assert job["status"] == "queued"
+    assert job["params"] == PARAMS
+    assert job["progress"] == []
+    assert "result" not in job
+
+
+def test_claim_runs_oldest_job_once(queue):
+    first = queue.submit(PARAMS)
+    second = queue.submit(dict(PARAMS, solver="llm"))
+    assert queue.claim(1234) == (first, PARAMS)
+    job = queue.status(first)
+    assert job["status"] == "running"
+    assert job["started_at"] is not None
+    assert queue.claim(1234)[0] == second
+    assert queue.claim(1234) is None
+
+
+def test_stages_and_finish(queue):
+    job_id = queue.submit(PARAMS)
+    queue.claim(os.getpid())
+    queue.record_stage(job_id, "dates")
+    queue.record_stage(job_id, "solve")
+    assert [p["stage"] for p in queue.status(job_id)["progress"]] == ["dates", "solve"]
+    assert queue.status(job_id)["stage"] == "solve"
+    queue.finish(job_id, {"schedule": {}})
+    job = queue.status(job_id)
+    assert job["status"] == "done"
+    assert job["result"] == {"schedule": {}}
+    assert job["finished_at"] is not None
+
+
+def test_error_result_fails_job(queue):
+    job_id = queue.submit(PARAMS)
+    queue.claim(os.getpid())
+    queue.finish(job_id, {"error": "No available dates"})
+    assert queue.status(job_id)["status"] == "failed"
+
+
+def test_unknown_job(queue):
+    assert queue.status("missing") is None
+
+
+def test_orphaned_job_is_requeued(queue):
+    job_id = queue.submit(PARAMS)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    queue.claim(dead.pid)
+    queue.record_stage(job_id, "dates")
+    assert queue.requeue_orphans() == 1
+    job = queue.status(job_id)
+    assert job["status"] == "queued"
+    assert job["progress"] == []
+    assert queue.claim(os.getpid())[0] == job_id
+    assert queue.requeue_orphans() == 0
+
+
+def test_run_job_records_stages_and_result(queue, monkeypatch):
+    def run_pipeline(start, end, holidays="", progress=None, **options):
+        for stage in ("dates", "summary", "solve"):
+            progress(stage)
+        return {"schedule": {start: ["AAA101"]}}
+    monkeypatch.setattr(process_schedule, "run_pipeline", run_pipeline)
+    job_id = queue.submit(PARAMS)
+    queue.claim(os.getpid())
+    job_queue.run_job(queue, job_id, PARAMS)
+    job = queue.status(job_id)
+    assert job["status"] == "done"
+    assert [p["stage"] for p in job["progress"]] == ["dates", "summary", "solve"]
+    assert job["result"] == {"schedule": {"2025-04-01": ["AAA101"]}}
+
+
+def test_run_job_failure(queue, monkeypatch):
+    def run_pipeline(*args, **kwargs):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(process_schedule, "run_pipeline", run_pipeline)
+    job_id = queue.submit(PARAMS)
+    queue.claim(os.getpid())
+    job_queue.run_job(queue, job_id, PARAMS)
+    job = queue.status(job_id)
+    assert job["status"] == "failed"
+    assert "boom" in job["result"]["error"]
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    """Points main() at a temporary queue and result file; returns the list of published results."""
+    published = []
+    monkeypatch.setattr(job_queue, "JobQueue", lambda: JobQueue(str(tmp_path / "jobs.sqlite3"), str(tmp_path / "jobs")))
+    monkeypatch.setattr(job_queue, "RESULT_FILE", str(tmp_path / "schedule_result.json"))
+    monkeypatch.setattr(process_schedule, "publish_schedule", lambda result: published.append(result) or dict(result, published=True))
+    return published
+
+
+def test_publish_finished_job(tmp_path, cli):
+    queue = job_queue.JobQueue()
+    job_id = queue.submit(PARAMS)
+    queue.claim(os.getpid())
+    queue.finish(job_id, {"schedule": {"2025-04-01": ["AAA101"]}})
+    queue.close()
+    assert job_queue.main(["publish", job_id]) == 0
+    assert cli == [{"schedule": {"2025-04-01": ["AAA101"]}}]
+    with open(tmp_path / "schedule_result.json") as f:
+        assert json.load(f) == {"schedule": {"2025-04-01": ["AAA101"]}, "published": True}
+
+
+def test_publish_refuses_unfinished_job(tmp_path, cli, capsys):
+    queue = job_queue.JobQueue()
+    job_id = queue.submit(PARAMS)
+    queue.close()
+    assert job_queue.main(["publish", job_id]) == 1
+    assert "has not finished" in json.loads(capsys.readouterr().out)["error"]
+    assert cli == []
+    assert not (tmp_path / "schedule_result.json").exists()
+
+
+def test_publish_failed_job_saves_error_without_publishing(tmp_path, cli):
+    queue = job_queue.JobQueue()
+    job_id = queue.submit(PARAMS)
+    queue.claim(os.getpid())
+    queue.finish(job_id, {"error": "No available dates"})
+    queue.close()
+    assert job_queue.main(["publish", job_id]) == 0
+    assert cli == []
+    with open(tmp_path / "schedule_result.json") as f:
+        assert json.load(f) == {"error": "No available dates"}
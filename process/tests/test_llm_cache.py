@@ -0,0 +1,89 @@
+import pytest
+
+import llm_cache
+from llm_cache import ResponseCache, make_key
+
+URL = "https://api.deepseek.com/v1/chat/completions"
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**options):
+        cache = ResponseCache(str(tmp_path / "llm_cache.sqlite3"), **options)
+        caches.append(cache)
+        return cache
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_key_depends_on_request_content_only():
+    payload = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "schedule"}], "temperature": 0.2}
+    reordered = {"temperature": 0.2, "messages": payload["messages"], "model": "deepseek-chat"}
+    assert make_key(URL, payload) == make_key(URL, reordered)
+    assert make_key(URL, payload) != make_key(URL, dict(payload, temperature=0.3))
+    assert make_key(URL, payload) != make_key(URL + "?beta", payload)
+
+
+def test_hit_and_miss_counters(clock, make_cache):
+    cache = make_cache()
+    assert cache.get("a") is None
+    cache.put("a", {"choices": []})
+    assert cache.get("a") == {"choices": []}
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_entry_expires_after_ttl(clock, make_cache):
+    cache = make_cache(ttl=60)
+    cache.put("a", "response")
+    clock.now += 60
+    assert cache.get("a") == "response"
+    clock.now += 1
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_put_purges_expired_entries(clock, make_cache):
+    cache = make_cache(ttl=60)
+    cache.put("old", "response")
+    clock.now += 61
+    cache.put("new", "response")
+    assert cache.stats()["entries"] == 1
+    assert cache.get("new") == "response"
+
+
+def test_least_recently_used_entry_is_evicted(clock, make_cache):
+    cache = make_cache(max_entries=2)
+    cache.put("a", 1)
+    clock.now += 1
+    cache.put("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1 # "a" is now more recently used than "b"
+    clock.now += 1
+    cache.put("c", 3)
+    assert cache.stats()["entries"] == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_persist_across_instances(clock, make_cache):
+    make_cache().put("a", {"answer": 42})
+    assert make_cache().get("a") == {"answer": 42}
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+import requests
+
+import mock_deepseek
+from llm_client import DeepSeekClient
+
+PROMPT = ("Available dates for exams are: 2025-04-01, 2025-04-02.\n"
+          "COURSE DETAILS\nAAA101, BBB101, CCC101\nSCHEDULING REQUIREMENTS\n")
+
+
+@pytest.fixture
+def api_url():
+    server = mock_deepseek.serve(0)
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    server.shutdown()
+    server.server_close()
+
+
+def payload():
+    return {"model": "deepseek-chat", "messages": [{"role": "user", "content": PROMPT}], "temperature": 0.0}
+
+
+def stream_events(api_url, request):
+    response = requests.post(api_url, json=request, stream=True, timeout=10)
+    with response:
+        return [json.loads(line[5:]) for line in response.iter_lines(decode_unicode=True)
+                if line.startswith('data:') and line[5:].strip() != '[DONE]']
+
+
+def test_streamed_completion_matches_plain_one(api_url):
+    client = DeepSeekClient(api_url, "key", timeout=10)
+    lines = []
+    stats = {}
+    streamed = client.complete(payload(), stream=True, on_line=lines.append, stats=stats)
+    plain = client.complete(payload())
+    assert streamed["choices"][0]["message"]["content"] == plain["choices"][0]["message"]["content"]
+    assert "\n".join(lines) == plain["choices"][0]["message"]["content"]
+    assert stats["first_token_seconds"] is not None
+
+
+def test_streamed_completion_requests_usage(api_url):
+    client = DeepSeekClient(api_url, "key", timeout=10)
+    streamed = client.complete(payload(), stream=True)
+    assert streamed["usage"] == client.complete(payload())["usage"]
+    assert streamed["usage"]["completion_tokens"] > 0
+
+
+def test_mock_streams_usage_only_on_request(api_url):
+    events = stream_events(api_url, dict(payload(), stream=True))
+    assert not any("usage" in event for event in events)
+    events = stream_events(api_url, dict(payload(), stream=True, stream_options={"include_usage": True}))
+    assert events[-1]["choices"] == []
+    assert events[-1]["usage"]["prompt_tokens"] > 0
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from conflict_graph import ConflictGraph
+from move_evaluator import ScheduleState
+
+# A weekend between the two weeks, so calendar distance differs from day index distance
+DATES = ["2025-04-03", "2025-04-04", "2025-04-07", "2025-04-08", "2025-04-09", "2025-04-10"]
+
+
+def random_graph(seed, num_students=200, num_courses=16):
+    rng = random.Random(seed)
+    codes = [f"CRS{i:03d}" for i in range(num_courses)]
+    enrollments = {f"S{s:04d}": rng.sample(codes, rng.randint(1, 4)) for s in range(num_students)}
+    return ConflictGraph.from_enrollments(enrollments), codes
+
+
+def random_state(seed, with_targets):
+    graph, codes = random_graph(seed)
+    rng = random.Random(seed)
+    assignment = {code: rng.randrange(len(DATES)) for code in codes}
+    targets = {code: i * len(DATES) // len(codes) for i, code in enumerate(codes)} if with_targets else None
+    return ScheduleState.from_graph(graph, codes, DATES, assignment, targets)
+
+
+@pytest.mark.parametrize("with_targets", [False, True])
+def test_move_delta_matches_full_recompute(with_targets):
+    state = random_state(1, with_targets)
+    rng = random.Random(2)
+    for _ in range(300):
+        course, day = rng.randrange(len(state.course_codes)), rng.randrange(len(DATES))
+        before = state.full_cost()
+        delta = state.move_delta(course, day)
+        state.apply_move(course, day, delta)
+        assert delta == pytest.approx(state.full_cost() - before)
+        assert state.cost == pytest.approx(state.full_cost())
+
+
+@pytest.mark.parametrize("with_targets", [False, True])
+def test_swap_delta_matches_full_recompute(with_targets):
+    state = random_state(3, with_targets)
+    rng = random.Random(4)
+    swapped_neighbours = 0
+    for _ in range(300):
+        course_a = rng.randrange(len(state.course_codes))
+        # Half the swaps exchange two conflicting courses, whose shared edge keeps its distance
+        if state.neighbours[course_a] and rng.random() < 0.5:
+            course_b = rng.choice(state.neighbours[course_a])
+            swapped_neighbours += 1
+        else:
+            course_b = rng.randrange(len(state.course_codes))
+        before = state.full_cost()
+        delta = state.swap_delta(course_a, course_b)
+        state.apply_swap(course_a, course_b, delta)
+        assert delta == pytest.approx(state.full_cost() - before)
+    assert swapped_neighbours
+    assert state.cost == pytest.approx(state.full_cost())
+
+
+def test_undo_restores_assignment_and_cost():
+    state = random_state(5, True)
+    day = list(state.day)
+    cost = state.cost
+    tokens = [state.apply_move(0, (state.day[0] + 1) % len(DATES)), state.apply_swap(1, 2), state.apply_move(3, 0)]
+    for token in reversed(tokens):
+        state.undo(token)
+    assert state.day == day
+    assert state.cost == pytest.approx(cost)
+
+
+def test_clashes_counts_students_sharing_a_day():
+    graph = ConflictGraph.from_enrollments({"S1": ["AAA101", "BBB101"], "S2": ["AAA101", "BBB101"], "S3": ["BBB101", "CCC101"]})
+    schedule = {DATES[0]: ["AAA101", "BBB101"], DATES[1]: ["CCC101"]}
+    state = ScheduleState.from_schedule(graph, schedule, DATES)
+    assert state.clashes() == 2
+    state.apply_move(state.course_codes.index("AAA101"), 2)
+    assert state.clashes() == 0
+
+
+def test_from_schedule_round_trip_keeps_day_order():
+    graph, codes = random_graph(6)
+    schedule = {d: [] for d in DATES}
+    for i, code in enumerate(reversed(codes)):
+        schedule[DATES[i % len(DATES)]].append(code)
+    state = ScheduleState.from_schedule(graph, schedule, DATES)
+    assert state.to_schedule() == schedule
@@ -0,0 +1,89 @@
+from conflict_graph import ConflictGraph
+from schedule_validator import validate_schedule
+from solver import repair_schedule
+
+DATES = ["2025-04-01", "2025-04-02", "2025-04-03", "2025-04-04"]
+ENROLLMENTS = {
+    "S1": ["AAA101", "BBB101"],
+    "S2": ["AAA101", "BBB101"],
+    "S3": ["BBB101", "CCC101"],
+    "S4": ["DDD101"],
+}
+
+
+def setup():
+    graph = ConflictGraph.from_enrollments(ENROLLMENTS)
+    summary = {code: {"enrollment": graph.enrollment[code]} for code in ("AAA101", "BBB101", "CCC101", "DDD101")}
+    return graph, summary
+
+
+def placed_dates(schedule):
+    return {code: exam_date for exam_date, codes in schedule.items() for code in codes}
+
+
+def assert_valid(result, graph, summary):
+    assert "error" not in result
+    assert validate_schedule(result["schedule"], DATES, summary, graph)["valid"]
+
+
+def test_valid_schedule_is_kept_unchanged():
+    graph, summary = setup()
+    proposed = {"2025-04-01": ["AAA101", "CCC101"], "2025-04-03": ["BBB101"], "2025-04-04": ["DDD101"]}
+    result = repair_schedule(proposed, DATES, summary, graph)
+    assert_valid(result, graph, summary)
+    assert placed_dates(result["schedule"]) == placed_dates(proposed)
+    assert result["changes"] == {"moved": [], "placed": [], "dropped": [], "kept": 4}
+
+
+def test_clash_moves_one_course_and_keeps_the_rest():
+    graph, summary = setup()
+    proposed = {"2025-04-01": ["AAA101", "BBB101"], "2025-04-03": ["CCC101"], "2025-04-04": ["DDD101"]}
+    result = repair_schedule(proposed, DATES, summary, graph)
+    assert_valid(result, graph, summary)
+    dates = placed_dates(result["schedule"])
+    # BBB101 clashes with the most students, so it is the one taken out and re-placed
+    assert result["changes"]["moved"] == ["BBB101"]
+    assert result["changes"]["kept"] == 3
+    assert dates["AAA101"] == "2025-04-01"
+    assert dates["CCC101"] == "2025-04-03"
+    assert dates["DDD101"] == "2025-04-04"
+    assert dates["BBB101"] not in ("2025-04-01", "2025-04-03")
+
+
+def test_unknown_courses_are_dropped_and_missing_ones_placed():
+    graph, summary = setup()
+    proposed = {"2025-04-01": ["AAA101", "ZZZ999"], "2025-04-09": ["BBB101"], "2025-04-04": ["DDD101"]}
+    result = repair_schedule(proposed, DATES, summary, graph)
+    assert_valid(result, graph, summary)
+    assert result["changes"]["dropped"] == ["ZZZ999"]
+    # BBB101 was on an unavailable date and CCC101 was missing: both are placed
+    assert result["changes"]["placed"] == ["BBB101", "CCC101"]
+    assert result["changes"]["kept"] == 2
+    assert "ZZZ999" not in placed_dates(result["schedule"])
+
+
+def test_duplicate_course_keeps_its_first_date():
+    graph, summary = setup()
+    proposed = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101", "DDD101"], "2025-04-03": ["CCC101", "AAA101"]}
+    result = repair_schedule(proposed, DATES, summary, graph)
+    assert_valid(result, graph, summary)
+    assert placed_dates(result["schedule"])["AAA101"] == "2025-04-01"
+    assert result["changes"]["moved"] == []
+
+
+def test_unrepairable_schedule_returns_the_valid_part():
+    # Three mutually conflicting courses can't fit on two dates
+    graph = ConflictGraph.from_enrollments({"S1": ["AAA101", "BBB101", "CCC101"]})
+    summary = {code: {"enrollment": 1} for code in ("AAA101", "BBB101", "CCC101")}
+    proposed = {"2025-04-01": ["AAA101", "BBB101"], "2025-04-02": ["CCC101"]}
+    result = repair_schedule(proposed, DATES[:2], summary, graph)
+    assert "error" in result
+    assert placed_dates(result["kept"]) == {"AAA101": "2025-04-01", "CCC101": "2025-04-02"}
+
+
+def test_oversized_course_is_an_error():
+    graph, summary = setup()
+    proposed = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101"], "2025-04-03": ["CCC101", "DDD101"]}
+    result = repair_schedule(proposed, DATES, summary, graph, sessions={"Morning": 2})
+    assert "BBB101" in result["error"]
+    assert placed_dates(result["kept"]) == placed_dates(proposed)
@@ -0,0 +1,109 @@
+import pytest
+
+from conflict_graph import ConflictGraph
+from enrollment_store import EnrollmentMatrix
+from schedule_validator import VIOLATION_TYPES, validate_schedule
+
+ENROLLMENTS = {"S1": ["AAA101", "BBB101"], "S2": ["AAA101", "CCC101"], "S3": ["BBB101"]}
+DATES = ["2025-04-01", "2025-04-02", "2025-04-03"]
+
+
+@pytest.fixture
+def graph():
+    return ConflictGraph.from_enrollments(ENROLLMENTS)
+
+
+@pytest.fixture
+def summary(graph):
+    return {code: {"enrollment": graph.enrollment[code]} for code in ("AAA101", "BBB101", "CCC101")}
+
+
+def violations(report, kind):
+    return [v for v in report["violations"] if v["type"] == kind]
+
+
+def test_valid_schedule(graph, summary):
+    schedule = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101", "CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph)
+    assert report["valid"]
+    assert report["violations"] == []
+    assert report["summary"] == {kind: 0 for kind in VIOLATION_TYPES}
+    assert report["students_with_conflicts"] == 0
+
+
+def test_missing_course(graph, summary):
+    report = validate_schedule({"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101"]}, DATES, summary, graph)
+    assert not report["valid"]
+    assert violations(report, "missing_course") == [{"type": "missing_course", "course": "CCC101", "students": 1}]
+    assert report["summary"]["missing_course"] == 1
+
+
+def test_duplicate_course(graph, summary):
+    schedule = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101", "CCC101"], "2025-04-03": ["AAA101"]}
+    report = validate_schedule(schedule, DATES, summary, graph)
+    assert violations(report, "duplicate_course") == [
+        {"type": "duplicate_course", "course": "AAA101", "dates": ["2025-04-01", "2025-04-03"], "students": 2}
+    ]
+
+
+def test_unknown_course(graph, summary):
+    schedule = {"2025-04-01": ["AAA101", "ZZZ999"], "2025-04-02": ["BBB101", "CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph)
+    assert violations(report, "unknown_course") == [
+        {"type": "unknown_course", "course": "ZZZ999", "dates": ["2025-04-01"], "students": 0}
+    ]
+
+
+def test_unavailable_date(graph, summary):
+    schedule = {"2025-04-01": ["AAA101"], "2025-04-05": ["BBB101", "CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph)
+    assert violations(report, "unavailable_date") == [
+        {"type": "unavailable_date", "date": "2025-04-05", "courses": ["BBB101", "CCC101"], "students": 3}
+    ]
+
+
+def test_conflict(graph, summary):
+    schedule = {"2025-04-01": ["AAA101", "BBB101"], "2025-04-02": ["CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph)
+    conflicts = violations(report, "conflict")
+    assert len(conflicts) == 1
+    assert sorted(conflicts[0]["courses"]) == ["AAA101", "BBB101"]
+    assert conflicts[0]["date"] == "2025-04-01"
+    assert conflicts[0]["students"] == 1
+    assert report["students_with_conflicts"] == 1
+
+
+def test_conflict_students_counted_exactly_with_enrollments():
+    # One student sits all three courses: three clashing edges, but a single student
+    enrollments = {"S1": ["AAA101", "BBB101", "CCC101"]}
+    graph = ConflictGraph.from_enrollments(enrollments)
+    summary = {code: {"enrollment": 1} for code in enrollments["S1"]}
+    schedule = {"2025-04-01": ["AAA101", "BBB101", "CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph)
+    assert report["summary"]["conflict"] == 3
+    assert report["students_with_conflicts"] == 3
+    report = validate_schedule(schedule, DATES, summary, graph, enrollments=EnrollmentMatrix.from_mapping(enrollments))
+    assert report["students_with_conflicts"] == 1
+
+
+def test_over_capacity(graph, summary):
+    schedule = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101", "CCC101"]}
+    sessions = {"2025-04-01": {"Morning": ["AAA101"]}, "2025-04-02": {"Morning": ["BBB101", "CCC101"]}}
+    report = validate_schedule(schedule, DATES, summary, graph, sessions=sessions, session_seats={"Morning": 2})
+    assert violations(report, "over_capacity") == [
+        {"type": "over_capacity", "date": "2025-04-02", "session": "Morning", "seats": 2, "used": 3, "students": 1}
+    ]
+
+
+def test_over_capacity_packs_sessions_when_missing(graph, summary):
+    schedule = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101", "CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph, session_seats={"Morning": 2, "Afternoon": 1})
+    assert report["valid"]
+    report = validate_schedule(schedule, DATES, summary, graph, session_seats={"Morning": 1, "Afternoon": 1})
+    assert [v["date"] for v in violations(report, "over_capacity")] == ["2025-04-01", "2025-04-02"]
+
+
+def test_unlimited_seats_skip_capacity_check(graph, summary):
+    schedule = {"2025-04-01": ["AAA101"], "2025-04-02": ["BBB101", "CCC101"]}
+    report = validate_schedule(schedule, DATES, summary, graph, session_seats={"Morning": None, "Afternoon": None})
+    assert report["valid"]
@@ -0,0 +1,87 @@
+"""Materialized per-student exam timetables.
+
+After a schedule is produced, every student's exams are written to the
+StudentExamTimetable table, clustered on (student_id, exam_date, course_code),
+so student_schedule.php answers a lookup with one primary-key range read
+instead of querying CourseEnrollments and scanning the whole schedule.
+
+The new timetable is loaded into a staging table and swapped in with a single
+RENAME TABLE, so readers never see a half-written timetable. Writers hold a
+MySQL named lock meanwhile, so two processes publishing at once take turns
+instead of loading the same staging table.
+"""
+from mysql.connector import Error
+
+TIMETABLE_TABLE = 'StudentExamTimetable'
+INSERT_BATCH_SIZE = 5000
+LOCK_TIMEOUT = 120 # seconds to wait for another process's timetable load
+
+TIMETABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        student_id VARCHAR(10) NOT NULL,
+        exam_date DATE NOT NULL,
+        course_code VARCHAR(10) NOT NULL,
+        academic_level VARCHAR(50),
+        PRIMARY KEY (student_id, exam_date, course_code)
+    )
+"""
+
+
+def timetable_rows(course_dates, enrollments, course_levels=None):
+    """Yields (student_id, exam_date, course_code, level) in one pass over the EnrollmentMatrix rows."""
+    course_levels = course_levels or {}
+    course_codes = enrollments.course_codes
+    # Resolve each integer course code once instead of per enrollment
+    scheduled = [(course_dates[code], code, course_levels.get(code)) if code in course_dates else None
+                 for code in course_codes]
+    for student_id, row in zip(enrollments.student_ids, enrollments.rows()):
+        exams = sorted(scheduled[c] for c in row if scheduled[c] is not None)
+        for exam_date, code, level in exams:
+            yield student_id, exam_date, code, level
+
+
+def materialize_timetable(conn, rows, table=TIMETABLE_TABLE, batch_size=INSERT_BATCH_SIZE, lock_timeout=LOCK_TIMEOUT):
+    """Replaces the timetable table with rows. Returns {"rows", "students"}.
+
+    Raises mysql.connector.Error, also when another process holds the table's
+    lock for more than lock_timeout seconds; the live table is left untouched
+    if the load fails.
+    """
+    staging = table + '_next'
+    retired = table + '_old'
+    cursor = conn.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (table, lock_timeout))
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        raise Error(msg=f"Timed out waiting for another process to finish writing {table}.")
+    try:
+        cursor.execute(TIMETABLE_DDL.format(table=table))
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(TIMETABLE_DDL.format(table=staging))
+        insert = f"INSERT INTO {staging} (student_id, exam_date, course_code, academic_level) VALUES (%s, %s, %s, %s)"
+        total = 0
+        students = set()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            students.add(row[0])
+            if len(batch) >= batch_size:
+                cursor.executemany(insert, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert, batch)
+            total += len(batch)
+        conn.commit()
+
+        cursor.execute(f"DROP TABLE IF EXISTS {retired}")
+        cursor.execute(f"RENAME TABLE {table} TO {retired}, {staging} TO {table}")
+        cursor.execute(f"DROP TABLE {retired}")
+    except Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute("DO RELEASE_LOCK(%s)", (table,))
+        cursor.close()
+    return {"rows": total, "students": len(students)}
+
@@ -0,0 +1,136 @@
+"""Student workload metrics for a schedule, vectorised over the whole cohort.
+
+Same-day clashes are only part of the picture: students also suffer from
+exams on consecutive days or three exams within three days. WorkloadEvaluator
+precomputes the CSR row of every enrollment once, after which evaluate() scores
+a course -> day vector with a handful of NumPy passes (no Python loop over
+students), so it is cheap enough to call inside a local-search loop.
+
+Penalty (per student, summed over every pair of their exams):
+CLASH_PENALTY for two exams on the same day, solver.PROXIMITY_PENALTY[distance]
+for exams 1-3 calendar days apart. The same weights per conflict-graph edge
+give the identical total, which is what the delta evaluator relies on.
+"""
+from datetime import date
+
+import numpy as np
+
+from solver import PROXIMITY_PENALTY
+
+CLASH_PENALTY = 1000 # per pair of exams a student has on the same day
+UNSCHEDULED = -1
+
+
+def course_day_vector(schedule, course_codes):
+    """Calendar day ordinal of each integer course code (UNSCHEDULED if absent from schedule)."""
+    day_of = {}
+    for exam_date, courses in schedule.items():
+        ordinal = date.fromisoformat(exam_date).toordinal()
+        for code in courses:
+            day_of[code] = ordinal
+    return np.array([day_of.get(code, UNSCHEDULED) for code in course_codes], dtype=np.int64)
+
+
+class WorkloadEvaluator:
+    """Scores course -> day vectors against a fixed EnrollmentMatrix."""
+
+    def __init__(self, enrollments):
+        self.enrollments = enrollments
+        indptr, indices = enrollments.to_numpy()
+        self.num_students = enrollments.num_students
+        self.indices = indices.astype(np.int64)
+        # Student of every enrollment, in CSR order
+        self.rows = np.repeat(np.arange(self.num_students, dtype=np.int64), np.diff(indptr.astype(np.int64)))
+        max_distance = max(PROXIMITY_PENALTY)
+        self.proximity = np.zeros(max_distance + 1, dtype=np.float64)
+        for distance, weight in PROXIMITY_PENALTY.items():
+            self.proximity[distance] = weight
+        self.proximity[0] = CLASH_PENALTY
+
+    def _sorted_exams(self, course_days):
+        """(students, days) of every scheduled enrollment, sorted by student then day."""
+        days = course_days[self.indices]
+        scheduled = days != UNSCHEDULED
+        students = self.rows[scheduled]
+        days = days[scheduled]
+        order = np.lexsort((days, students))
+        return students[order], days[order]
+
+    def evaluate(self, course_days):
+        """Per-student metrics as a dict of arrays (length num_students).
+
+        exams, clashes (same-day exam pairs), back_to_back (consecutive exams a
+        day apart), three_in_three (windows of 3 exams within 3 days), min_gap
+        (smallest distance in days between consecutive exams, -1 for fewer than
+        two exams), mean_gap and penalty.
+        """
+        n = self.num_students
+        students, days = self._sorted_exams(course_days)
+        exams = np.bincount(students, minlength=n)
+
+        same = students[1:] == students[:-1]
+        gaps = (days[1:] - days[:-1])[same]
+        gap_students = students[1:][same]
+        clashes = np.bincount(gap_students, weights=gaps == 0, minlength=n).astype(np.int64)
+        back_to_back = np.bincount(gap_students, weights=gaps == 1, minlength=n).astype(np.int64)
+
+        min_gap = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(min_gap, gap_students, gaps)
+        has_gap = exams > 1
+        min_gap[~has_gap] = -1
+        gap_sums = np.bincount(gap_students, weights=gaps, minlength=n)
+        mean_gap = np.divide(gap_sums, exams - 1, out=np.zeros(n), where=has_gap)
+
+        window = (students[2:] == students[:-2]) & (days[2:] - days[:-2] <= 2)
+        three_in_three = np.bincount(students[2:][window], minlength=n)
+
+        # Every pair of a student's exams within the proximity range; the exams are
+        # sorted, so once no pair at a given lag is in range no larger lag can be
+        penalty = np.zeros(n)
+        max_distance = len(self.proximity) - 1
+        lag = 1
+        while lag < len(days):
+            same = students[lag:] == students[:-lag]
+            distance = days[lag:] - days[:-lag]
+            close = same & (distance <= max_distance)
+            if not close.any():
+                break
+            penalty += np.bincount(students[lag:][close], weights=self.proximity[distance[close]], minlength=n)
+            lag += 1
+
+        return {
+            "exams": exams,
+            "clashes": clashes,
+            "back_to_back": back_to_back,
+            "three_in_three": three_in_three,
+            "min_gap": min_gap,
+            "mean_gap": mean_gap,
+            "penalty": penalty
+        }
+
+    def penalty(self, course_days):
+        """Global penalty score only (sum of the per-student penalties)."""
+        return float(self.evaluate(course_days)["penalty"].sum())
+
+    def summary(self, course_days):
+        """Cohort totals for the result JSON."""
+        metrics = self.evaluate(course_days)
+        examined = max(1, int(np.count_nonzero(metrics["exams"])))
+        total_penalty = float(metrics["penalty"].sum())
+        return {
+            "students": int(np.count_nonzero(metrics["exams"])),
+            "clashes": int(metrics["clashes"].sum()),
+            "students_with_clashes": int(np.count_nonzero(metrics["clashes"])),
+            "back_to_back": int(metrics["back_to_back"].sum()),
+            "students_with_back_to_back": int(np.count_nonzero(metrics["back_to_back"])),
+            "three_in_three": int(metrics["three_in_three"].sum()),
+            "students_with_three_in_three": int(np.count_nonzero(metrics["three_in_three"])),
+            "penalty": total_penalty,
+            "penalty_per_student": round(total_penalty / examined, 3)
+        }
+
+
+def schedule_workload(schedule, enrollments):
+    """One-off summary of a {date: [course_code, ...]} schedule."""
+    evaluator = WorkloadEvaluator(enrollments)
+    return evaluator.summary(course_day_vector(schedule, enrollments.course_codes))
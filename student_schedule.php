@@ -6,12 +6,13 @@ $student_courses = [];
 $schedule_data = []; // Master schedule [date => [course1, course2]]
 $course_levels = []; // [course_code => level]
 $student_schedule_events = []; // Final array for JS calendar [[title=>..., start=>..., level=>...]]
+$timetable_loaded = false; // true once the events came from StudentExamTimetable
 $error_message = null;
 $schedule_string = null;
 
-// Function to safely get POST data
+// Function to get trimmed POST data (raw: escape with htmlspecialchars when echoing)
 function get_post_var($key, $default = null) {
-    return isset($_POST[$key]) ? htmlspecialchars(trim($_POST[$key])) : $default;
+    return isset($_POST[$key]) ? trim($_POST[$key]) : $default;
 }
 
 // --- 1. Load the Master Schedule from JSON --- 
@@ -19,7 +20,17 @@ $schedule_file = SCHEDULE_FILE_PATH;
 if (file_exists($schedule_file)) {
     $json_content = file_get_contents($schedule_file);
     $schedule_result = json_decode($json_content, true);
-    if (isset($schedule_result['suggestion'])) {
+    if (isset($schedule_result['exam_days'])) {
+        // Structured output: dates, courses and levels are already joined by the pipeline
+        foreach ($schedule_result['exam_days'] as $day) {
+            if (!empty($day['courses'])) {
+                $schedule_data[$day['date']] = array_column($day['courses'], 'code');
+            }
+            foreach ($day['courses'] as $course) {
+                $course_levels[$course['code']] = $course['level'];
+            }
+        }
+    } elseif (isset($schedule_result['suggestion'])) {
         $schedule_string = $schedule_result['suggestion'];
         // Extract schedule lines from the master schedule suggestion
         preg_match_all('/^\d+\.\s*(\d{4}-\d{2}-\d{2}):\s*(.*)$/im', $schedule_string, $matches, PREG_SET_ORDER);
@@ -80,7 +91,37 @@ if ($_SERVER["REQUEST_METHOD"] == "POST" && !$error_message) {
     if (empty($student_id)) {
         $error_message = "Please enter a Student ID.";
     } else {
-        // --- 3. Fetch Student's Enrolled Courses --- 
+        // --- 3. Read the Materialized Timetable (one primary-key range read) --- 
+        if (isset($schedule_result['student_timetable'])) {
+            try {
+                $conn = new mysqli(DB_HOST, DB_USER, DB_PASS, DB_NAME);
+                if ($conn->connect_error) {
+                    throw new Exception("Connection failed: " . $conn->connect_error);
+                }
+                $stmt = $conn->prepare("SELECT exam_date, course_code, academic_level FROM StudentExamTimetable WHERE student_id = ? ORDER BY exam_date, course_code");
+                $stmt->bind_param("s", $student_id);
+                $stmt->execute();
+                $result = $stmt->get_result();
+                while ($row = $result->fetch_assoc()) {
+                    $student_schedule_events[] = [
+                        'title' => $row['course_code'],
+                        'start' => $row['exam_date'],
+                        'level' => $row['academic_level'] !== null ? $row['academic_level'] : 'Unknown'
+                    ];
+                }
+                $stmt->close();
+                $conn->close();
+                $timetable_loaded = true;
+                if (empty($student_schedule_events)) {
+                    $no_events_message = "No exams found in the current schedule for the courses enrolled by student ID '" . htmlspecialchars($student_id) . "'.";
+                }
+            } catch (Exception $e) {
+                // Table not written yet: fall back to the enrollment lookup below
+            }
+        }
+    }
+    // --- 3b. Fetch Student's Enrolled Courses (no materialized timetable) --- 
+    if (!empty($student_id) && !$timetable_loaded) {
         try {
             $conn = new mysqli(DB_HOST, DB_USER, DB_PASS, DB_NAME);
             if ($conn->connect_error) {
@@ -96,7 +137,7 @@ if ($_SERVER["REQUEST_METHOD"] == "POST" && !$error_message) {
                     $student_courses[] = $row['course_code'];
                 }
             } else {
-                $error_message = "Student ID '{$student_id}' not found or has no enrollments.";
+                $error_message = "Student ID '" . htmlspecialchars($student_id) . "' not found or has no enrollments.";
             }
             $stmt->close();
             $conn->close();
@@ -108,7 +149,7 @@ if ($_SERVER["REQUEST_METHOD"] == "POST" && !$error_message) {
 }
 
 // --- 4. Prepare Student-Specific Calendar Events --- 
-if ($student_id && !empty($student_courses) && !empty($schedule_data) && !$error_message) {
+if ($student_id && !$timetable_loaded && !empty($student_courses) && !empty($schedule_data) && !$error_message) {
     foreach ($schedule_data as $date => $courses_on_day) {
         foreach ($courses_on_day as $course_code) {
             // Check if the student is enrolled in this specific course
@@ -126,7 +167,7 @@ if ($student_id && !empty($student_courses) && !empty($schedule_data) && !$error
     if (empty($student_schedule_events)) {
          // Keep $error_message null, but the calendar won't render if $student_schedule_events is empty
          // Add a message to display in the HTML later
-         $no_events_message = "No exams found in the current schedule for the courses enrolled by student ID '{$student_id}'.";
+         $no_events_message = "No exams found in the current schedule for the courses enrolled by student ID '" . htmlspecialchars($student_id) . "'.";
     }
 }
 
@@ -214,7 +255,7 @@ if ($student_id && !empty($student_courses) && !empty($schedule_data) && !$error
     <form method="POST" action="student_schedule.php">
         <div class="form-group">
             <label for="student_id">Enter Student ID:</label>
-            <input type="text" id="student_id" name="student_id" value="<?php echo $student_id ?? ''; ?>" required>
+            <input type="text" id="student_id" name="student_id" value="<?php echo htmlspecialchars($student_id ?? ''); ?>" required>
         </div>
         <button type="submit" class="button">Search Schedule</button>
     </form>
@@ -224,11 +265,11 @@ if ($student_id && !empty($student_courses) && !empty($schedule_data) && !$error
     <?php endif; ?>
 
     <?php // Display calendar only if a successful search was performed ?>
-    <?php if ($student_id && !$error_message && !empty($student_courses)): ?>
-        <h2>Exam Schedule for <?php echo $student_id; ?></h2>
+    <?php if ($student_id && !$error_message && !empty($student_schedule_events)): ?>
+        <h2>Exam Schedule for <?php echo htmlspecialchars($student_id); ?></h2>
         <div id="student-schedule-calendar" class="mb-4"></div>
-    <?php elseif ($student_id && !$error_message && empty($student_courses)): ?>
-         <p>No enrollments found for student ID '<?php echo $student_id; ?>'.</p>
+    <?php elseif ($student_id && !$error_message && !$timetable_loaded && empty($student_courses)): ?>
+         <p>No enrollments found for student ID '<?php echo htmlspecialchars($student_id); ?>'.</p>
     <?php elseif (isset($no_events_message)): // Display message if set in PHP ?>
          <p><?php echo $no_events_message; ?></p>
     <?php endif; ?>